@@ -1,18 +1,38 @@
-from flask import Flask, request, jsonify
+import click
+from flask import Blueprint, Flask, current_app, g, request
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.exceptions import NotFound
+from werkzeug.security import generate_password_hash
 import os
 import datetime
-from sqlalchemy.orm import validates
+import logging
+from functools import partial
+from itertools import chain, islice
+from sqlalchemy import event, or_
+from sqlalchemy.orm import validates, joinedload, configure_mappers, object_session
+from sqlalchemy.schema import CreateColumn
+
+from pagination import parse_page_args, list_response, MAX_PAGE_SIZE
+import sqlite_profile
+import password_pool
+import auth_tokens
+import game_import
+import schedule
+import collection_versions
+import response_cache
+import json_provider
+import compression
+import matchmaking
+import geo
+from auth_tokens import login_required
+from collection_versions import conditional
+from response_cache import cached
 
-app = Flask(__name__)
-
-# 데이터베이스 설정
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'site.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ECHO'] = False # True로 설정하면 SQL 쿼리 로그 확인 가능
-db = SQLAlchemy(app)
+db = SQLAlchemy(session_options={'class_': sqlite_profile.RoutingSession})
+api = Blueprint('api', __name__)
+# 요청 처리 함수의 로그 (Flask 앱 로거와 같은 이름)
+log = logging.getLogger(__name__)
 
 # 연관 테이블: User와 Team의 다대다 관계
 team_members = db.Table('team_members',
@@ -48,12 +68,22 @@ class User(db.Model):
         return data
 
 # 팀 모델 정의
+NEXT_TEAM_SEQ = db.text("(SELECT coalesce(max(change_seq), 0) + 1 FROM team)")
+
 class Team(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.String(500), nullable=True)
+    # 매칭 정보: Elo 레이팅(완료된 게임 결과로 갱신)과 반영한 게임 수, 지역 코드, 요일별 가능 시간대
+    rating = db.Column(db.Float, nullable=False, default=matchmaking.DEFAULT_RATING, server_default=str(matchmaking.DEFAULT_RATING))
+    rated_games = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    region = db.Column(db.String(matchmaking.MAX_REGION_LENGTH), nullable=True)
+    availability = db.Column(db.JSON, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    # 변경 순번: 팀을 추가/수정하는 문(UPDATE 문으로 바꾸는 레이팅 포함)이 그때의 최댓값 + 1로 채움
+    # SQLite는 쓰기 트랜잭션을 하나씩 실행하므로 나중에 커밋된 변경이 항상 더 큰 값을 가짐 (매칭 색인이 바뀐 팀만 다시 읽는 데 사용)
+    change_seq = db.Column(db.Integer, nullable=False, default=NEXT_TEAM_SEQ, onupdate=NEXT_TEAM_SEQ, server_default='0', index=True)
 
     # Game과의 관계는 Game 모델에서 backref로 설정됨 (home_games, away_games)
     # User와의 관계는 User 모델에서 secondary로 설정됨 (members)
@@ -61,25 +91,46 @@ class Team(db.Model):
     def __repr__(self):
         return f'<Team {self.name}>'
 
-    def to_dict(self, include_members=False, include_games=False):
+    # members: 미리 불러온 멤버 목록 (load_team_members). 없으면 팀마다 members 관계를 조회
+    # games: 미리 불러온 이 팀의 게임 목록 (id순, 코트/호스트/팀 관계 포함). 없으면 여기서 조회
+    def to_dict(self, include_members=False, include_games=False, members=None, games=None):
         data = {
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "rating": round(self.rating, 2),
+            "rated_games": self.rated_games,
+            "region": self.region,
+            "availability": self.availability or [],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
         if include_members:
              # 순환 참조 방지를 위해 user.to_dict에서 teams 정보는 빼고 직렬화
-            data['members'] = [user.to_dict(include_teams=False) for user in self.members]
+            data['members'] = [user.to_dict(include_teams=False) for user in (members if members is not None else self.members)]
         if include_games:
-            home_games = Game.query.filter_by(home_team_id=self.id).all()
-            away_games = Game.query.filter_by(away_team_id=self.id).all()
+            # 홈/어웨이 게임을 한 번의 쿼리로 불러와 나눔 (각 팀 id 인덱스를 사용하는 OR 조건)
+            if games is None:
+                query = GAME_WITH_TEAM_NAMES.select().where(team_games_filter(self.id)).order_by(Game.id)
+                games = object_session(self).scalars(query).all()
+            home_games = [game for game in games if game.home_team_id == self.id]
+            away_games = [game for game in games if game.away_team_id == self.id]
             # 순환 참조 방지: game.to_dict에서 home_team/away_team 상세 정보는 빼고 id만 포함하거나 간략화
             data['home_games'] = [game.to_dict(include_teams_as_ids=True) for game in home_games]
             data['away_games'] = [game.to_dict(include_teams_as_ids=True) for game in away_games]
         return data
 
+# 팀을 지우기 전에 남는 팀 하나의 변경 순번을 올려 최댓값이 줄지 않게 함
+# (최댓값을 가진 팀이 지워지면 다음 변경이 이미 쓴 순번을 다시 받아 매칭 색인이 그 변경을 놓칠 수 있음)
+@event.listens_for(Team, 'before_delete')
+def keep_team_seq(mapper, connection, team):
+    survivor = db.select(db.func.max(Team.id)).where(Team.id != team.id).scalar_subquery()
+    connection.execute(db.update(Team).where(Team.id == survivor).values(change_seq=NEXT_TEAM_SEQ))
+
+# 팀이 홈 또는 어웨이로 참여한 게임
+def team_games_filter(team_id):
+    return or_(Game.home_team_id == team_id, Game.away_team_id == team_id)
+
 # 코트 모델 정의
 class Court(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -87,6 +138,11 @@ class Court(db.Model):
     address = db.Column(db.String(200), nullable=False)
     description = db.Column(db.String(500), nullable=True)
     imageUrl = db.Column(db.String(200), nullable=True)
+    # 위치: 위도/경도와 지역 코드(예: 'gangnam'). grid_cell은 좌표가 속한 격자 칸 번호 (near 검색 인덱스)
+    lat = db.Column(db.Float, nullable=True)
+    lng = db.Column(db.Float, nullable=True)
+    region = db.Column(db.String(geo.MAX_REGION_LENGTH), nullable=True, index=True)
+    grid_cell = db.Column(db.Integer, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     games = db.relationship('Game', backref='court', lazy=True)
@@ -101,8 +157,11 @@ class Court(db.Model):
             "address": self.address,
             "description": self.description,
             "imageUrl": self.imageUrl,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "lat": self.lat,
+            "lng": self.lng,
+            "region": self.region,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
         if include_games:
             # 순환 참조 방지: game.to_dict에서 court 정보는 빼고 직렬화
@@ -120,6 +179,9 @@ class GameStatus:
 class Game(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date_time = db.Column(db.DateTime, nullable=False)
+    # 게임 길이 (분). 코트 예약 구간은 [date_time, date_time + duration_minutes)
+    duration_minutes = db.Column(db.Integer, nullable=False, default=schedule.DEFAULT_DURATION_MINUTES,
+                                 server_default=str(schedule.DEFAULT_DURATION_MINUTES))
     status = db.Column(db.String(50), default=GameStatus.SCHEDULED, nullable=False)
     
     court_id = db.Column(db.Integer, db.ForeignKey('court.id'), nullable=False)
@@ -127,6 +189,10 @@ class Game(db.Model):
     
     home_team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True) # Team 모델의 PK 참조
     away_team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True) # Team 모델의 PK 참조
+    # 결과 점수와 두 팀 레이팅에 반영한 홈 팀 변화량 (어웨이 팀은 반대, 반영하지 않았으면 None)
+    home_score = db.Column(db.Integer, nullable=True)
+    away_score = db.Column(db.Integer, nullable=True)
+    rating_change = db.Column(db.Float, nullable=True)
 
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -135,20 +201,37 @@ class Game(db.Model):
     away_team = db.relationship('Team', foreign_keys=[away_team_id], backref=db.backref('away_games', lazy='dynamic'))
     # court, host 관계는 각 모델에서 backref로 정의됨
 
+    # 목록 필터용 인덱스. 참조 id 인덱스는 일시를 함께 담아 "이 코트/팀의 기간별 게임" 조회도 인덱스로 처리
+    # 상태 단독 인덱스는 같은 상태 안에서 id 순서로 정렬되어 있어 id순 페이지를 정렬 없이 읽을 수 있음
+    # (court_id, date_time) 인덱스는 코트 예약 겹침 검사와 빈 시간 조회의 범위 검색에도 쓰임
+    __table_args__ = (
+        db.Index('ix_game_date_time', 'date_time'),
+        db.Index('ix_game_status', 'status'),
+        db.Index('ix_game_status_date_time', 'status', 'date_time'),
+        db.Index('ix_game_court_id_date_time', 'court_id', 'date_time'),
+        db.Index('ix_game_host_id_date_time', 'host_id', 'date_time'),
+        db.Index('ix_game_home_team_id_date_time', 'home_team_id', 'date_time'),
+        db.Index('ix_game_away_team_id_date_time', 'away_team_id', 'date_time'),
+    )
+
     def __repr__(self):
         return f'<Game {self.id} at {self.court.name if self.court else self.court_id}>'
 
     def to_dict(self, include_court=True, include_host=True, include_teams_as_ids=False, include_full_teams=False):
         data = {
             "id": self.id,
-            "date_time": self.date_time.isoformat() if self.date_time else None,
+            "date_time": self.date_time,
+            "duration_minutes": self.duration_minutes,
             "status": self.status,
             "court_id": self.court_id,
             "host_id": self.host_id,
             "home_team_id": self.home_team_id,
             "away_team_id": self.away_team_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "home_score": self.home_score,
+            "away_score": self.away_score,
+            "rating_change": self.rating_change,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
         if include_court and self.court:
             data['court'] = self.court.to_dict(include_games=False) # 순환 방지
@@ -166,334 +249,951 @@ class Game(db.Model):
 
         return data
 
-@app.route('/')
+# backref로 정의된 관계(Game.court, Game.host 등)를 로딩 옵션에서 쓸 수 있도록 매퍼 설정을 먼저 완료
+configure_mappers()
+
+# 로딩 프로필: to_dict 플래그 조합과 그 직렬화에 필요한 관계를 미리 불러오는 로더 옵션의 묶음
+# 요청 처리 함수는 프로필의 select()/get_or_404()로 조회하고 dump()로 직렬화하여, 직렬화 중 관계를 하나씩 불러오는 N+1 쿼리를 막는다.
+# 다대일 관계는 joinedload로 같은 쿼리에서 함께 불러옴
+# lazy='dynamic' 관계처럼 로더 옵션을 쓸 수 없는 데이터는 prefetch(세션, 객체 목록)가 묶음 단위로 불러와
+# {객체 id: to_dict 추가 인자}로 돌려준다.
+class LoadProfile:
+    def __init__(self, model, options=(), prefetch=None, **flags):
+        self.model = model
+        self.options = list(options)
+        self.prefetch = prefetch
+        self.flags = flags
+
+    def select(self):
+        return db.select(self.model).options(*self.options)
+
+    # refresh: 세션에 이미 있는 객체도 다시 읽음 (UPDATE 문으로 바꾼 레이팅 등. 커밋 후 객체를 만료시키지 않는 세션에서 필요)
+    def get_or_404(self, session, id, refresh=False):
+        query = self.select().where(self.model.id == id).limit(1)
+        if refresh:
+            query = query.execution_options(populate_existing=True)
+        obj = session.scalars(query).first()
+        if obj is None:
+            raise NotFound()
+        return obj
+
+    def dump(self, session, obj):
+        return next(self.dump_all(session, [obj]))
+
+    # 객체들을 차례로 직렬화. prefetch가 있으면 batch_size개씩 묶어 한 번에 불러옴
+    def dump_all(self, session, objs, batch_size=MAX_PAGE_SIZE):
+        if self.prefetch is None:
+            for obj in objs:
+                yield obj.to_dict(**self.flags)
+            return
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, batch_size))
+            if not batch:
+                return
+            extra = self.prefetch(session, batch)
+            for obj in batch:
+                yield obj.to_dict(**self.flags, **extra.get(obj.id, {}))
+
+# 여러 팀의 멤버를 team_members에 대한 한 번의 IN 쿼리로 불러와 팀 id별로 묶음
+# Team.members는 lazy='dynamic'이라 eager loading이 안 되므로 직접 불러옴 (User.teams는 그대로 사용 가능)
+def load_team_members(session, teams):
+    members = {team.id: [] for team in teams}
+    if members:
+        rows = session.execute(
+            db.select(team_members.c.team_id, User)
+            .join(User, User.id == team_members.c.user_id)
+            .where(team_members.c.team_id.in_(list(members)))
+            .order_by(team_members.c.team_id, User.id)
+        )
+        for team_id, user in rows:
+            members[team_id].append(user)
+    return members
+
+def prefetch_members(session, teams):
+    return {team_id: {"members": users} for team_id, users in load_team_members(session, teams).items()}
+
+# 게임 상세/목록: 코트, 호스트, 홈/어웨이 팀 전체 정보
+GAME_FULL = LoadProfile(
+    Game,
+    [joinedload(Game.court), joinedload(Game.host), joinedload(Game.home_team), joinedload(Game.away_team)],
+    include_court=True, include_host=True, include_full_teams=True
+)
+# 팀 상세의 게임 목록: 코트, 호스트, 팀 이름
+GAME_WITH_TEAM_NAMES = LoadProfile(
+    Game,
+    [joinedload(Game.court), joinedload(Game.host), joinedload(Game.home_team), joinedload(Game.away_team)],
+    include_teams_as_ids=True
+)
+COURT = LoadProfile(Court)
+# 팀 멤버(members)는 lazy='dynamic' 관계라 로더 옵션 대신 묶음 단위로 따로 불러옴
+TEAM_WITH_MEMBERS = LoadProfile(Team, prefetch=prefetch_members, include_members=True)
+TEAM_DETAIL = LoadProfile(Team, prefetch=prefetch_members, include_members=True, include_games=True)
+
+# 요청 처리 함수 (handle_*)
+# 라우트의 처리 내용은 이 함수들에 있고 app.py(Flask)와 app_async.py(Quart)의 라우트가 같은 함수를 호출한다.
+# 인자로 받은 동기 세션으로만 DB를 읽고 쓰며 (db.session, request, current_app을 쓰지 않음)
+# 두 서버의 라우트가 그대로 돌려줄 수 있는 (본문, 상태 코드[, 헤더]) 또는 목록 조회(Listing)를 돌려준다. 없는 객체는 NotFound (404)
+# app.py는 db.session으로 바로 호출하고(run_handler), app_async.py는 AsyncSession.run_sync로 같은 함수를 실행한다.
+# 비밀번호 해시처럼 서버마다 기다리는 방식이 다른 작업은 라우트가 하고, 그 앞뒤 처리를 나눠 둠
+
+# 목록 조회 결과: 라우트가 서버에 맞는 방식으로 query를 읽어 (스트리밍이면 응답을 보내는 동안 나눠서) profile로 직렬화
+# error는 읽다가 실패했을 때의 500 응답 메시지
+class Listing:
+    def __init__(self, profile, query, limit, after, stream, error):
+        self.profile = profile
+        self.query = page_query(query, profile.model, limit, after)
+        self.limit = limit
+        self.stream = stream
+        self.error = error
+
+    # 세션으로 쿼리를 읽어 직렬화한 dict를 차례로 내놓음. 스트리밍이면 응답을 보내기 시작할 때 실행해 500개씩 나눠 읽음
+    def items(self, session):
+        query = self.query.execution_options(yield_per=500) if self.stream else self.query
+        yield from self.profile.dump_all(session, session.scalars(query))
+
+def get_or_404(session, model, id):
+    obj = session.get(model, id)
+    if obj is None:
+        raise NotFound()
+    return obj
+
+# 요청 처리 함수를 db.session으로 실행하고 목록 조회면 list_response로 응답
+def run_handler(handler, *args):
+    result = handler(db.session, *args)
+    if not isinstance(result, Listing):
+        return result
+    try:
+        return list_response(result.items(db.session), result.limit, result.stream), 200
+    except Exception as e:
+        log.error(f"{result.error}: {e}")
+        return {"error": result.error}, 500
+
+@api.route('/')
 def hello_world():
     return 'Hello, World!'
 
-@app.route('/api/auth/signup', methods=['POST'])
-def signup():
-    data = request.get_json()
-    email = data.get('email')
-    password = data.get('password')
-    name = data.get('name')
-
-    if not email or not password or not name:
-        return jsonify({"error": "이메일, 비밀번호, 이름을 모두 입력해주세요."}), 400
-
-    if User.query.filter_by(email=email).first():
-        return jsonify({"error": "이미 사용 중인 이메일입니다."}), 400
-
-    hashed_password = generate_password_hash(password)
-    new_user = User(email=email, password_hash=hashed_password, name=name)
-    
+def get_password_pool():
+    return current_app.extensions['password_pool']
+
+# 해시 계산 대기열이 가득 차면 기다리지 않고 바로 503
+def password_pool_busy():
+    return {"error": "요청이 많아 잠시 후 다시 시도해주세요."}, 503, {'Retry-After': '1'}
+
+# 운영 지표
+def handle_metrics(extensions):
+    cache = extensions['response_cache']
+    compressor = extensions['compression']
+    return {
+        "password_pool": extensions['password_pool'].stats(),
+        "access_tokens": extensions['token_auth'].stats(),
+        "response_cache": cache.stats() if cache else None,
+        "compression": compressor.stats() if compressor else None
+    }, 200
+
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    return handle_metrics(current_app.extensions)
+
+# 회원가입 입력 검사 (오류 응답, 문제가 없으면 None)
+def handle_signup_check(session, data):
+    if not data.get('email') or not data.get('password') or not data.get('name'):
+        return {"error": "이메일, 비밀번호, 이름을 모두 입력해주세요."}, 400
+    if session.scalar(db.select(User.id).where(User.email == data['email']).limit(1)):
+        return {"error": "이미 사용 중인 이메일입니다."}, 400
+    return None
+
+# 검사를 통과하고 비밀번호 해시를 계산한 뒤 사용자 추가
+def handle_signup(session, data, password_hash):
+    new_user = User(email=data['email'], password_hash=password_hash, name=data['name'])
     try:
-        db.session.add(new_user)
-        db.session.commit()
-        user_info = {
-            "id": new_user.id,
-            "email": new_user.email,
-            "name": new_user.name
-        }
-        return jsonify(user_info), 201
+        session.add(new_user)
+        session.commit()
+        return {"id": new_user.id, "email": new_user.email, "name": new_user.name}, 201
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "회원가입 중 오류가 발생했습니다."}), 500
+        session.rollback()
+        return {"error": "회원가입 중 오류가 발생했습니다."}, 500
 
-@app.route('/api/auth/login', methods=['POST'])
+@api.route('/api/auth/signup', methods=['POST'])
+def signup():
+    data = request.get_json()
+    error = handle_signup_check(db.session, data)
+    if error:
+        return error
+    try:
+        password_hash = get_password_pool().hash(data['password'])
+    except password_pool.PoolBusy:
+        return password_pool_busy()
+    return handle_signup(db.session, data, password_hash)
+
+# 로그인 입력 검사와 사용자 조회: (오류 응답, None) 또는 (None, 사용자 또는 None)
+def handle_login_user(session, data):
+    if not data.get('email') or not data.get('password'):
+        return ({"error": "이메일과 비밀번호를 모두 입력해주세요."}, 400), None
+    return None, session.scalars(db.select(User).where(User.email == data['email']).limit(1)).first()
+
+# 비밀번호 확인 결과(ok, new_hash)로 응답
+# 오래된 방식/매개변수의 해시는 로그인 성공 시 새 해시로 교체 (실패해도 로그인은 진행)
+def handle_login(session, user, ok, new_hash, token_auth):
+    if new_hash:
+        try:
+            user.password_hash = new_hash
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            log.warning(f"Error rehashing password for user {user.id}: {e}")
+    if not ok:
+        return {"error": "이메일 또는 비밀번호가 일치하지 않습니다."}, 401
+    # 이후 요청은 Authorization: Bearer <access_token> 헤더로 인증
+    return {"id": user.id, "email": user.email, "name": user.name, **token_auth.token_response(user.id)}, 200
+
+@api.route('/api/auth/login', methods=['POST'])
 def login():
     data = request.get_json()
-    email = data.get('email')
-    password = data.get('password')
-
-    if not email or not password:
-        return jsonify({"error": "이메일과 비밀번호를 모두 입력해주세요."}), 400
-
-    user = User.query.filter_by(email=email).first()
-
-    if user and check_password_hash(user.password_hash, password):
-        user_info = {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name
-        }
-        return jsonify(user_info), 200
-    else:
-        return jsonify({"error": "이메일 또는 비밀번호가 일치하지 않습니다."}), 401
+    error, user = handle_login_user(db.session, data)
+    if error:
+        return error
+    ok, new_hash = False, None
+    if user and user.password_hash:
+        try:
+            ok, new_hash = get_password_pool().verify(user.password_hash, data['password'])
+        except password_pool.PoolBusy:
+            return password_pool_busy()
+    return handle_login(db.session, user, ok, new_hash, current_app.extensions['token_auth'])
+
+# 현재 토큰 폐기
+def handle_logout(token_auth, claims):
+    token_auth.revoke(claims)
+    return {"message": "로그아웃 되었습니다."}, 200
+
+@api.route('/api/auth/logout', methods=['POST'])
+@login_required
+def logout():
+    return handle_logout(current_app.extensions['token_auth'], g.token_claims)
+
+# 게임 목록 필터 (모두 선택): court_id, host_id, team_id(홈/어웨이 모두), status, from/to (ISO 날짜/시간, from <= date_time < to)
+# 날짜/시간 형식이 잘못되면 ValueError
+def filter_games(query, args):
+    court_id = args.get('court_id', type=int)
+    host_id = args.get('host_id', type=int)
+    team_id = args.get('team_id', type=int)
+    status = args.get('status')
+    if court_id is not None:
+        query = query.filter(Game.court_id == court_id)
+    if host_id is not None:
+        query = query.filter(Game.host_id == host_id)
+    if team_id is not None:
+        query = query.filter(team_games_filter(team_id))
+    if status is not None:
+        query = query.filter(Game.status == status)
+    if args.get('from') is not None:
+        query = query.filter(Game.date_time >= datetime.datetime.fromisoformat(args['from']))
+    if args.get('to') is not None:
+        query = query.filter(Game.date_time < datetime.datetime.fromisoformat(args['to']))
+    return query
+
+# 목록 조회 쿼리에 커서 페이지네이션 적용 (id 오름차순, after보다 큰 id부터 limit개)
+def page_query(query, model, limit, after):
+    query = query.order_by(model.id)
+    if after is not None:
+        query = query.filter(model.id > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+# 요청 본문의 위치 필드(lat, lng, region)를 코트에 반영하고 격자 칸을 다시 계산. 잘못되면 ValueError
+def set_court_location(court, data):
+    court.lat, court.lng, court.region = geo.parse_court_location(data, (court.lat, court.lng, court.region))
+    court.grid_cell = geo.cell(court.lat, court.lng)
+
+# near 검색 후보의 (id, 위도, 경도): 반경을 덮는 격자 칸 범위를 grid_cell 인덱스로 범위 검색 (실제 거리는 geo.within으로 거름)
+def near_courts_query(lat, lng, radius, region=None):
+    query = db.select(Court.id, Court.lat, Court.lng) \
+        .where(or_(*(Court.grid_cell.between(first, last) for first, last in geo.cell_ranges(lat, lng, radius))))
+    if region is not None:
+        query = query.where(Court.region == region)
+    return query.order_by(Court.id)
+
+def row_position(row):
+    return row.lat, row.lng
+
+# 좌표(격자 칸)나 지역 코드가 있는 코트가 하나라도 있는지 (각 인덱스에서 한 행만 찾음)
+LOCATED_COURT_QUERY = db.select(Court.id).where(Court.grid_cell.is_not(None)).limit(1)
+REGIONED_COURT_QUERY = db.select(Court.id).where(Court.region.is_not(None)).limit(1)
 
 # 모든 코트 정보 가져오기
-@app.route('/api/courts', methods=['GET'])
-def get_courts():
+#   region=지역 코드: 그 지역의 코트만 (region 인덱스)
+#   near=위도,경도 & radius=km (기본 5, 최대 50): 반경 안의 코트를 가까운 순으로 limit개까지 (최대 MAX_PAGE_SIZE), distance_km 포함
+#   후보는 좌표만 읽어 거리를 계산하고, 응답에 넣을 코트만 IN 쿼리 한 번으로 불러옴
+#   좌표나 지역 코드가 있는 코트가 하나도 없으면 빈 목록 대신 404
+def handle_get_courts(session, args):
+    try:
+        limit, after, stream = parse_page_args(args)
+        near = geo.parse_near(args)
+        region = geo.parse_region(args.get('region'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if near is not None and session.scalar(LOCATED_COURT_QUERY) is None:
+        return {"error": geo.NO_LOCATIONS}, 404
+    if region is not None and session.scalar(REGIONED_COURT_QUERY) is None:
+        return {"error": geo.NO_REGIONS}, 404
+    if near is None:
+        query = COURT.select()
+        if region is not None:
+            query = query.where(Court.region == region)
+        return Listing(COURT, query, limit, after, stream, "경기장 목록을 불러오는데 실패했습니다.")
     try:
-        courts = Court.query.all()
-        return jsonify([court.to_dict() for court in courts]), 200
+        found = geo.within(session.execute(near_courts_query(*near, region)), *near, row_position)[:limit or MAX_PAGE_SIZE]
+        courts = {court.id: court for court in session.scalars(COURT.select().where(Court.id.in_([row.id for _, row in found])))}
+        # 두 쿼리 사이에 삭제된 코트는 뺌
+        found = [(distance, row) for distance, row in found if row.id in courts]
+        items = COURT.dump_all(session, (courts[row.id] for _, row in found))
+        return [geo.near_dict(distance, court) for (distance, _), court in zip(found, items)], 200
     except Exception as e:
-        return jsonify({"error": "경기장 목록을 불러오는데 실패했습니다."}), 500
+        log.error(f"Error searching courts near {near}: {e}")
+        return {"error": "경기장 목록을 불러오는데 실패했습니다."}, 500
+
+@api.route('/api/courts', methods=['GET'])
+@conditional('courts')
+@cached('courts')
+def get_courts():
+    return run_handler(handle_get_courts, request.args)
 
 # 새 코트 생성
-@app.route('/api/courts', methods=['POST'])
-def create_court():
-    data = request.get_json()
+def handle_create_court(session, data):
     name = data.get('name')
     address = data.get('address')
-    description = data.get('description')
-    imageUrl = data.get('imageUrl')
-
     if not name or not address:
-        return jsonify({"error": "이름과 주소는 필수 항목입니다."}), 400
+        return {"error": "이름과 주소는 필수 항목입니다."}, 400
 
-    new_court = Court(name=name, address=address, description=description, imageUrl=imageUrl)
+    new_court = Court(name=name, address=address, description=data.get('description'), imageUrl=data.get('imageUrl'))
+    try:
+        set_court_location(new_court, data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
     try:
-        db.session.add(new_court)
-        db.session.commit()
-        return jsonify(new_court.to_dict()), 201
+        session.add(new_court)
+        session.commit()
+        return COURT.dump(session, new_court), 201
     except Exception as e:
-        db.session.rollback()
-        # print(f"Error creating court: {e}") # 디버깅용
-        return jsonify({"error": "코트 생성 중 오류가 발생했습니다."}), 500
+        session.rollback()
+        return {"error": "코트 생성 중 오류가 발생했습니다."}, 500
+
+@api.route('/api/courts', methods=['POST'])
+@login_required
+def create_court():
+    return run_handler(handle_create_court, request.get_json())
 
 # 특정 코트 정보 가져오기
-@app.route('/api/courts/<int:court_id>', methods=['GET'])
+def handle_get_court(session, court_id):
+    return COURT.dump(session, COURT.get_or_404(session, court_id)), 200
+
+@api.route('/api/courts/<int:court_id>', methods=['GET'])
+@conditional('courts')
+@cached('courts')
 def get_court(court_id):
-    court = Court.query.get_or_404(court_id)
-    return jsonify(court.to_dict()), 200
+    return run_handler(handle_get_court, court_id)
 
-# 특정 코트 정보 수정
-@app.route('/api/courts/<int:court_id>', methods=['PUT'])
-def update_court(court_id):
-    court = Court.query.get_or_404(court_id)
-    data = request.get_json()
+# 코트의 예약된 시간과 빈 시간. from/to (ISO 날짜/시간, 최대 31일) 범위의 게임을 (court_id, date_time) 인덱스로 조회
+def handle_court_availability(session, court_id, args):
+    try:
+        start, end = schedule.parse_range(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if not session.get(Court, court_id):
+        return {"error": "코트를 찾을 수 없습니다."}, 404
+    return schedule.availability(court_id, start, end, court_busy(session, court_id, start, end)), 200
+
+@api.route('/api/courts/<int:court_id>/availability', methods=['GET'])
+@conditional('courts', 'games')
+def get_court_availability(court_id):
+    return run_handler(handle_court_availability, court_id, request.args)
 
+# 특정 코트 정보 수정
+def handle_update_court(session, court_id, data):
+    court = COURT.get_or_404(session, court_id)
     court.name = data.get('name', court.name)
     court.address = data.get('address', court.address)
     court.description = data.get('description', court.description)
     court.imageUrl = data.get('imageUrl', court.imageUrl)
-    
+
     # 필수 항목이 비어있는지 확인 (업데이트 시에도)
     if not court.name or not court.address:
-        return jsonify({"error": "이름과 주소는 필수 항목입니다."}), 400
+        return {"error": "이름과 주소는 필수 항목입니다."}, 400
+    try:
+        set_court_location(court, data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
     try:
-        db.session.commit()
-        return jsonify(court.to_dict()), 200
+        session.commit()
+        return COURT.dump(session, court), 200
     except Exception as e:
-        db.session.rollback()
-        # print(f"Error updating court: {e}") # 디버깅용
-        return jsonify({"error": "코트 정보 수정 중 오류가 발생했습니다."}), 500
+        session.rollback()
+        return {"error": "코트 정보 수정 중 오류가 발생했습니다."}, 500
+
+@api.route('/api/courts/<int:court_id>', methods=['PUT'])
+@login_required
+def update_court(court_id):
+    return run_handler(handle_update_court, court_id, request.get_json())
 
 # 특정 코트 삭제
-@app.route('/api/courts/<int:court_id>', methods=['DELETE'])
-def delete_court(court_id):
-    court = Court.query.get_or_404(court_id)
+def handle_delete_court(session, court_id):
+    court = get_or_404(session, Court, court_id)
     try:
-        db.session.delete(court)
-        db.session.commit()
-        return jsonify({"message": "코트가 성공적으로 삭제되었습니다."}), 200
+        session.delete(court)
+        session.commit()
+        return {"message": "코트가 성공적으로 삭제되었습니다."}, 200
     except Exception as e:
-        db.session.rollback()
-        # print(f"Error deleting court: {e}") # 디버깅용
-        return jsonify({"error": "코트 삭제 중 오류가 발생했습니다."}), 500
+        session.rollback()
+        return {"error": "코트 삭제 중 오류가 발생했습니다."}, 500
+
+@api.route('/api/courts/<int:court_id>', methods=['DELETE'])
+@login_required
+def delete_court(court_id):
+    return run_handler(handle_delete_court, court_id)
 
 # --- 팀 API ---
-@app.route('/api/teams', methods=['POST'])
-def create_team():
-    data = request.get_json()
+def is_team_member(session, team_id, user_id):
+    query = db.select(team_members.c.user_id).where(team_members.c.team_id == team_id, team_members.c.user_id == user_id)
+    return session.scalar(query) is not None
+
+def handle_create_team(session, user_id, data):
     name = data.get('name')
     description = data.get('description')
     member_ids = data.get('member_ids', []) # 초기 멤버 ID 리스트 (선택)
+    # 팀을 만든 사용자는 항상 멤버
+    if user_id not in member_ids:
+        member_ids = [user_id] + member_ids
 
     if not name:
-        return jsonify({"error": "팀 이름은 필수 항목입니다."}), 400
-    
-    if Team.query.filter_by(name=name).first():
-        return jsonify({"error": "이미 사용 중인 팀 이름입니다."}), 400
-
-    new_team = Team(name=name, description=description)
-    
-    if member_ids:
-        for user_id in member_ids:
-            user = User.query.get(user_id)
+        return {"error": "팀 이름은 필수 항목입니다."}, 400
+    try:
+        region = matchmaking.parse_region(data.get('region'))
+        availability = matchmaking.parse_availability(data.get('availability'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    if session.scalar(db.select(Team.id).where(Team.name == name).limit(1)):
+        return {"error": "이미 사용 중인 팀 이름입니다."}, 400
+
+    new_team = Team(name=name, description=description, region=region, availability=availability)
+    # 아직 세션에 넣지 않은 팀이 멤버 조회 중에 flush되지 않도록 autoflush 없이 조회
+    with session.no_autoflush:
+        for member_id in member_ids:
+            user = session.get(User, member_id)
             if user:
                 new_team.members.append(user)
             else:
-                # 존재하지 않는 사용자 ID는 경고 또는 오류 처리 (여기서는 무시)
-                app.logger.warning(f"User ID {user_id} not found when creating team {name}")
-
+                # 존재하지 않는 사용자 ID는 무시
+                log.warning(f"User ID {member_id} not found when creating team {name}")
 
     try:
-        db.session.add(new_team)
-        db.session.commit()
-        return jsonify(new_team.to_dict(include_members=True)), 201
+        session.add(new_team)
+        session.commit()
+        return TEAM_WITH_MEMBERS.dump(session, new_team), 201
     except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error creating team: {e}")
-        return jsonify({"error": "팀 생성 중 오류 발생"}), 500
+        session.rollback()
+        log.error(f"Error creating team: {e}")
+        return {"error": "팀 생성 중 오류 발생"}, 500
 
-@app.route('/api/teams', methods=['GET'])
-def get_teams():
+@api.route('/api/teams', methods=['POST'])
+@login_required
+def create_team():
+    return run_handler(handle_create_team, g.user_id, request.get_json())
+
+# 멤버 정보를 포함하여 반환. 한 페이지의 멤버는 한 번의 쿼리로 불러옴
+def handle_get_teams(session, args):
     try:
-        teams = Team.query.all()
-        # 멤버 정보를 포함하여 반환할지 여부 결정 (여기서는 포함)
-        return jsonify([team.to_dict(include_members=True) for team in teams]), 200
-    except Exception as e:
-        app.logger.error(f"Error fetching teams: {e}")
-        return jsonify({"error": "팀 목록 조회 중 오류 발생"}), 500
+        limit, after, stream = parse_page_args(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return Listing(TEAM_WITH_MEMBERS, TEAM_WITH_MEMBERS.select(), limit, after, stream, "팀 목록 조회 중 오류 발생")
+
+@api.route('/api/teams', methods=['GET'])
+@conditional('teams', 'users')
+@cached('teams', 'users')
+def get_teams():
+    return run_handler(handle_get_teams, request.args)
+
+# 멤버 및 게임 정보 포함
+def handle_get_team(session, team_id):
+    return TEAM_DETAIL.dump(session, TEAM_DETAIL.get_or_404(session, team_id)), 200
 
-@app.route('/api/teams/<int:team_id>', methods=['GET'])
+@api.route('/api/teams/<int:team_id>', methods=['GET'])
+@conditional('teams', 'users', 'games', 'courts')
+@cached('teams', 'users', 'games', 'courts')
 def get_team(team_id):
-    team = Team.query.get_or_404(team_id)
-    # 멤버 및 게임 정보 포함 여부 결정
-    return jsonify(team.to_dict(include_members=True, include_games=True)), 200
+    return run_handler(handle_get_team, team_id)
 
-@app.route('/api/teams/<int:team_id>', methods=['PUT'])
-def update_team(team_id):
-    team = Team.query.get_or_404(team_id)
-    data = request.get_json()
+def handle_update_team(session, user_id, team_id, data):
+    team = get_or_404(session, Team, team_id)
+    if not is_team_member(session, team_id, user_id):
+        return {"error": "팀 멤버만 팀 정보를 수정할 수 있습니다."}, 403
 
     new_name = data.get('name', team.name)
     # 이름 변경 시 중복 확인 (자기 자신 제외)
-    if new_name != team.name and Team.query.filter(Team.name == new_name, Team.id != team_id).first():
-        return jsonify({"error": "이미 사용 중인 팀 이름입니다."}), 400
-        
+    if new_name != team.name and session.scalar(db.select(Team.id).where(Team.name == new_name, Team.id != team_id).limit(1)):
+        return {"error": "이미 사용 중인 팀 이름입니다."}, 400
+
     team.name = new_name
     team.description = data.get('description', team.description)
-    
+    try:
+        if 'region' in data:
+            team.region = matchmaking.parse_region(data['region'])
+        if 'availability' in data:
+            team.availability = matchmaking.parse_availability(data['availability'])
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
     # 멤버 업데이트 (선택적 기능, 여기서는 단순화)
     # data.get('member_ids') 등으로 받아서 기존 멤버와 비교 후 추가/삭제 로직 필요
 
     try:
-        db.session.commit()
-        return jsonify(team.to_dict(include_members=True)), 200
+        session.commit()
+        return TEAM_WITH_MEMBERS.dump(session, team), 200
     except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error updating team: {e}")
-        return jsonify({"error": "팀 정보 수정 중 오류 발생"}), 500
+        session.rollback()
+        log.error(f"Error updating team: {e}")
+        return {"error": "팀 정보 수정 중 오류 발생"}, 500
+
+@api.route('/api/teams/<int:team_id>', methods=['PUT'])
+@login_required
+def update_team(team_id):
+    return run_handler(handle_update_team, g.user_id, team_id, request.get_json())
+
+def handle_delete_team(session, user_id, team_id):
+    team = get_or_404(session, Team, team_id)
+    if not is_team_member(session, team_id, user_id):
+        return {"error": "팀 멤버만 팀을 삭제할 수 있습니다."}, 403
 
-@app.route('/api/teams/<int:team_id>', methods=['DELETE'])
-def delete_team(team_id):
-    team = Team.query.get_or_404(team_id)
-    
     # 연결된 게임이 있는지 확인 (삭제 정책 결정 필요: null로 만들거나, 삭제 막거나)
-    if Game.query.filter((Game.home_team_id == team_id) | (Game.away_team_id == team_id)).first():
-        return jsonify({"error": "팀이 참여한 게임이 있어 삭제할 수 없습니다. 해당 게임을 먼저 처리해주세요."}), 400
-        
+    if session.scalar(db.select(Game.id).where(team_games_filter(team_id)).limit(1)):
+        return {"error": "팀이 참여한 게임이 있어 삭제할 수 없습니다. 해당 게임을 먼저 처리해주세요."}, 400
+
     try:
         # 멤버 관계는 자동으로 처리됨 (secondary table)
-        db.session.delete(team)
-        db.session.commit()
-        return jsonify({"message": "팀이 성공적으로 삭제되었습니다."}), 200
+        session.delete(team)
+        session.commit()
+        return {"message": "팀이 성공적으로 삭제되었습니다."}, 200
     except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error deleting team: {e}")
-        return jsonify({"error": "팀 삭제 중 오류 발생"}), 500
+        session.rollback()
+        log.error(f"Error deleting team: {e}")
+        return {"error": "팀 삭제 중 오류 발생"}, 500
+
+@api.route('/api/teams/<int:team_id>', methods=['DELETE'])
+@login_required
+def delete_team(team_id):
+    return run_handler(handle_delete_team, g.user_id, team_id)
+
+# 팀 매칭 색인에 넣을 팀 값 (id, 레이팅, 지역, 가능 시간대)과 변경 순번
+TEAM_MATCH_QUERY = db.select(Team.id, Team.rating, Team.region, Team.availability, Team.change_seq)
+TEAM_COUNT_QUERY = db.select(db.func.count(), db.func.max(Team.change_seq))
+
+# 모든 팀의 색인 값과 그중 가장 큰 변경 순번 (MatchEngine.index의 load)
+def load_match_teams(session):
+    teams = session.execute(TEAM_MATCH_QUERY).all()
+    return teams, max((team.change_seq for team in teams), default=0)
+
+# 변경 순번이 since보다 큰 팀의 색인 값 (MatchEngine.index의 update, change_seq 인덱스로 범위 검색)
+# 팀 수가 색인과 다르면 삭제된 팀이 있으므로 None (추가된 팀은 색인에 없는 id라 MatchIndex.updated가 알아냄)
+# 최댓값이 since보다 작으면 모든 팀이 지워진 뒤 순번이 처음부터 다시 시작된 것이므로 None
+def changed_match_teams(session, index, since):
+    teams = session.execute(TEAM_MATCH_QUERY.where(Team.change_seq > since)).all()
+    count, last = session.execute(TEAM_COUNT_QUERY).one()
+    if count != len(index) or (last or 0) < since:
+        return None, since
+    return teams, max((team.change_seq for team in teams), default=since)
+
+# 팀의 추천 상대 (실력/지역/시간 점수순). limit: 기본 10, 최대 100
+# 색인은 key(팀 컬렉션 버전)가 바뀌었을 때 그 사이 바뀐 팀만 읽어 고치고 (팀이 추가/삭제되었으면 모든 팀을 읽어 다시 만듦),
+# 응답에 넣을 팀만 IN 쿼리 한 번으로 불러옴
+# 변경 순번이 커밋 순서를 따르는 것은 SQLite뿐이므로 다른 DB에서는 버전이 바뀔 때마다 다시 만듦
+# lock: 색인을 고치는 동안 잠금을 잡을지 (MatchEngine.index 참고)
+def handle_team_matches(session, engine, key, team_id, args, lock=True):
+    if engine is None:
+        return {"error": matchmaking.UNAVAILABLE}, 503
+    try:
+        limit = matchmaking.parse_limit(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    update = partial(changed_match_teams, session) if session.get_bind(Team).dialect.name == 'sqlite' else None
+    index = engine.index(key, partial(load_match_teams, session), lock, update)
+    matches = index.matches(team_id, limit)
+    if matches is None:
+        return {"error": "팀을 찾을 수 없습니다."}, 404
+    teams = {team.id: team for team in session.scalars(db.select(Team).where(Team.id.in_([match[0] for match in matches])))}
+    return {"team_id": team_id, "matches": [matchmaking.match_dict(match, teams[match[0]].to_dict())
+                                            for match in matches if match[0] in teams]}, 200
+
+@api.route('/api/teams/<int:team_id>/matches', methods=['GET'])
+@conditional('teams')
+@cached('teams')
+def get_team_matches(team_id):
+    # 버전을 먼저 읽고 팀을 읽으므로, 그 사이에 커밋된 변경은 다음 버전에서 다시 반영됨
+    key = current_app.extensions['collection_versions'].get(('teams',))[0]
+    return run_handler(handle_team_matches, current_app.extensions['matchmaking'], key, team_id, request.args)
 
 # --- 게임 API ---
-@app.route('/api/games', methods=['POST'])
-def create_game():
-    data = request.get_json()
+# 호스트는 로그인한 사용자 (본문의 host_id는 사용하지 않음)
+def handle_create_game(session, user_id, data):
     date_time_str = data.get('date_time')
     court_id = data.get('court_id')
-    host_id = data.get('host_id')
     home_team_id = data.get('home_team_id') # 변경: String ID 대신 Integer ID
     away_team_id = data.get('away_team_id') # 변경: String ID 대신 Integer ID
     status = data.get('status', GameStatus.SCHEDULED)
 
-    if not date_time_str or not court_id or not host_id: # home/away 팀은 선택적일 수 있음
-        return jsonify({"error": "날짜/시간, 코트 ID, 호스트 ID는 필수입니다."}), 400
+    if not date_time_str or not court_id: # home/away 팀은 선택적일 수 있음
+        return {"error": "날짜/시간, 코트 ID는 필수입니다."}, 400
 
     try:
-        date_time_obj = datetime.datetime.fromisoformat(date_time_str)
-    except ValueError:
-        return jsonify({"error": "잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요."}), 400
+        date_time_obj = schedule.parse_datetime(date_time_str)
+        duration = schedule.parse_duration(data.get('duration_minutes'))
+        home_score = matchmaking.parse_score(data.get('home_score'))
+        away_score = matchmaking.parse_score(data.get('away_score'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    if not session.get(Court, court_id): return {"error": f"코트 ID {court_id}를 찾을 수 없습니다."}, 404
+    if home_team_id and not session.get(Team, home_team_id): return {"error": f"홈 팀 ID {home_team_id}를 찾을 수 없습니다."}, 404
+    if away_team_id and not session.get(Team, away_team_id): return {"error": f"어웨이 팀 ID {away_team_id}를 찾을 수 없습니다."}, 404
+    if home_team_id and away_team_id and home_team_id == away_team_id: return {"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}, 400
 
-    if not Court.query.get(court_id): return jsonify({"error": f"코트 ID {court_id}를 찾을 수 없습니다."}), 404
-    if not User.query.get(host_id): return jsonify({"error": f"사용자 ID {host_id}를 찾을 수 없습니다."}), 404
-    if home_team_id and not Team.query.get(home_team_id): return jsonify({"error": f"홈 팀 ID {home_team_id}를 찾을 수 없습니다."}), 404
-    if away_team_id and not Team.query.get(away_team_id): return jsonify({"error": f"어웨이 팀 ID {away_team_id}를 찾을 수 없습니다."}), 404
-    if home_team_id and away_team_id and home_team_id == away_team_id: return jsonify({"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}), 400
-        
     new_game = Game(
-        date_time=date_time_obj, 
-        court_id=court_id, 
-        host_id=host_id,
-        home_team_id=home_team_id, # 변경
-        away_team_id=away_team_id, # 변경
-        status=status
+        date_time=date_time_obj,
+        court_id=court_id,
+        host_id=user_id,
+        home_team_id=home_team_id,
+        away_team_id=away_team_id,
+        status=status,
+        duration_minutes=duration,
+        home_score=home_score,
+        away_score=away_score
     )
     try:
-        db.session.add(new_game)
-        db.session.commit()
-        return jsonify(new_game.to_dict(include_court=True, include_host=True, include_full_teams=True)), 201
+        session.add(new_game)
+        # 먼저 flush해 쓰기 잠금을 잡은 뒤 겹침 검사 (같은 시간을 동시에 예약하는 요청은 이 트랜잭션이 끝난 뒤에 검사하게 됨)
+        session.flush()
+        conflicts = game_conflicts(session, new_game)
+        if conflicts:
+            session.rollback()
+            return schedule.conflict_error(conflicts), 409
+        # 완료된 게임으로 등록하면 결과를 두 팀 레이팅에 반영
+        rate_game(session, new_game)
+        session.commit()
+        # 연결된 정보를 한 번의 쿼리로 다시 불러와 직렬화
+        return GAME_FULL.dump(session, GAME_FULL.get_or_404(session, new_game.id, refresh=True)), 201
     except Exception as e:
-        db.session.rollback(); app.logger.error(f"Error creating game: {e}"); return jsonify({"error": "게임 생성 중 오류 발생"}), 500
+        session.rollback(); log.error(f"Error creating game: {e}"); return {"error": "게임 생성 중 오류 발생"}, 500
 
-@app.route('/api/games', methods=['GET'])
-def get_games():
+@api.route('/api/games', methods=['POST'])
+@login_required
+def create_game():
+    return run_handler(handle_create_game, g.user_id, request.get_json())
+
+# 게임 일괄 등록 (시즌 일정 가져오기). rows는 요청 본문에서 읽은 행 목록 (game_import.parse_request), 호스트는 로그인한 사용자
+# JSON 배열 또는 CSV(열: date_time, court_id, home_team_id, away_team_id, status, duration_minutes, home_score, away_score)
+# 참조 id는 종류마다 IN 쿼리 한 번으로 확인하고, 오류가 없을 때만 모든 행을 한 트랜잭션으로 추가
+# 추가한 뒤 같은 트랜잭션에서 코트 예약 겹침을 검사해, 기존 게임이나 다른 행과 겹치면 모두 되돌림 (409)
+# 완료된 게임의 결과는 시각 순으로 레이팅에 반영
+def handle_import_games(session, user_id, rows):
+    games, errors = game_import.validate_rows(rows, partial(existing_ids, session))
+    if errors:
+        return {"error": "잘못된 행이 있어 게임을 추가하지 않았습니다.", "errors": errors}, 400
+
+    for game in games:
+        game['host_id'] = user_id
     try:
-        games = Game.query.all()
-        return jsonify([game.to_dict(include_court=True, include_host=True, include_full_teams=True) for game in games]), 200
+        new_ids = insert_games(session, games)
+        mark_changed(session, 'games') # 일괄 추가는 flush 이벤트를 거치지 않음
+        conflicts = game_import.find_conflicts(games, new_ids, partial(court_busy, session))
+        if conflicts:
+            session.rollback()
+            return {"error": "다른 게임과 시간이 겹치는 행이 있어 게임을 추가하지 않았습니다.", "errors": conflicts}, 409
+        rate_imported(session, games, new_ids)
+        session.commit()
+        return {"created": len(games)}, 201
     except Exception as e:
-        app.logger.error(f"Error fetching games: {e}"); return jsonify({"error": "게임 목록 조회 중 오류 발생"}), 500
+        session.rollback(); log.error(f"Error importing games: {e}"); return {"error": "게임 일괄 등록 중 오류 발생"}, 500
+
+@api.route('/api/games/bulk', methods=['POST'])
+@login_required
+def import_games():
+    try:
+        rows = game_import.parse_request(request)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return run_handler(handle_import_games, g.user_id, rows)
+
+IMPORT_MODELS = {'courts': Court, 'teams': Team}
+
+# ids 중 존재하는 id 집합 (IN 쿼리 한 번)
+def existing_ids(session, collection, ids):
+    model = IMPORT_MODELS[collection]
+    return set(session.scalars(db.select(model.id).where(model.id.in_(ids))))
+
+# games(행 dict 목록)를 추가하고 추가한 게임의 id를 행 순서대로 반환 (겹침 오류를 행 번호로 알려주기 위해 사용)
+# SQLite: executemany 한 번으로 추가 (id 반환을 요청하면 행마다 INSERT가 실행됨)
+#   id를 지정하지 않은 행에 그때까지의 최대 id + 1을 부여하고, 추가한 뒤에는 커밋할 때까지 쓰기 잠금을 잡고 있으므로
+#   한 번에 추가한 행의 id는 가장 큰 id len(games)개와 같음
+# 다른 DB는 동시에 추가된 행이 끼어들 수 있으므로 INSERT가 돌려준 id를 씀
+def insert_games(session, games):
+    if session.get_bind(Game).dialect.name != 'sqlite':
+        session.bulk_insert_mappings(Game, games, return_defaults=True)
+        return [game['id'] for game in games]
+    session.bulk_insert_mappings(Game, games)
+    last_id = session.scalar(db.select(db.func.max(Game.id)))
+    return range(last_id - len(games) + 1, last_id + 1)
+
+# 코트에서 [start, end)와 겹칠 수 있는 게임의 (시작 시각, 길이, id) 조회. 겹침 검사마다 실행하므로 문은 한 번만 만들어 둠
+# 게임 길이는 최대 MAX_DURATION이므로 (court_id, date_time) 인덱스에서 start - MAX_DURATION 이후, end 이전에 시작한 게임만 범위 검색
+COURT_BUSY_QUERY = (
+    db.select(Game.date_time, Game.duration_minutes, Game.id)
+    .where(Game.court_id == db.bindparam('court_id'),
+           Game.date_time > db.bindparam('after'),
+           Game.date_time < db.bindparam('before'),
+           Game.status.not_in(schedule.FREE_STATUSES))
+    .order_by(Game.date_time, Game.id)
+)
+
+def busy_params(court_id, start, end):
+    return {"court_id": court_id, "after": start - schedule.MAX_DURATION, "before": end}
+
+# 코트에서 [start, end)와 겹치는 예약 (시작, 종료, 게임 id) 목록, 시작 시각 순
+def court_busy(session, court_id, start, end):
+    return schedule.overlapping(session.execute(COURT_BUSY_QUERY, busy_params(court_id, start, end)), start)
+
+# 게임이 차지하는 시간과 겹치는 같은 코트의 다른 예약. 게임을 flush한 뒤 호출
+def game_conflicts(session, game):
+    if game.status in schedule.FREE_STATUSES:
+        return []
+    end = schedule.game_end(game.date_time, game.duration_minutes)
+    return [interval for interval in court_busy(session, game.court_id, game.date_time, end) if interval[2] != game.id]
+
+# 레이팅 계산에 쓰는 게임 결과 (상태, 홈 팀, 어웨이 팀, 홈 점수, 어웨이 점수)
+def game_result(game):
+    return (game.status, game.home_team_id, game.away_team_id, game.home_score, game.away_score)
+
+TEAM_RATING_QUERY = db.select(Team.rating).where(Team.id == db.bindparam('team_id'))
+# 팀 레이팅에 변화량을 더함. 읽은 값을 덮어쓰지 않고 현재 값에 더하므로 다른 게임의 반영과 섞여도 잃지 않음
+RATE_TEAMS = (
+    Team.__table__.update()
+    .where(Team.__table__.c.id == db.bindparam('team_id'))
+    .values(rating=Team.__table__.c.rating + db.bindparam('delta'),
+            rated_games=Team.__table__.c.rated_games + db.bindparam('games'))
+)
+SET_RATING_CHANGE = Game.__table__.update().where(Game.__table__.c.id == db.bindparam('game_id')).values(rating_change=db.bindparam('change'))
+
+# 홈 팀 레이팅에 change, 어웨이 팀에 -change를 더하고 반영한 게임 수를 games만큼 바꿈
+# 레이팅은 UPDATE 문으로 바꾸므로 flush 이벤트를 거치지 않음
+def adjust_ratings(session, home_team_id, away_team_id, change, games):
+    session.execute(RATE_TEAMS, [{"team_id": home_team_id, "delta": change, "games": games},
+                                 {"team_id": away_team_id, "delta": -change, "games": games}])
+    mark_changed(session, 'teams')
+
+# 게임에 반영했던 레이팅 변화를 되돌림 (결과가 바뀌거나 게임을 삭제할 때). result는 반영할 때의 결과 (기본: 현재 값)
+def unrate_game(session, game, result=None):
+    if game.rating_change is not None:
+        _, home_team_id, away_team_id, _, _ = result or game_result(game)
+        adjust_ratings(session, home_team_id, away_team_id, -game.rating_change, -1)
+        game.rating_change = None
+
+# 게임 결과를 두 팀 레이팅에 반영하고 홈 팀 변화량을 게임에 기록. 이미 반영한 결과가 있으면 old_result 기준으로 먼저 되돌림
+# 게임을 flush해 쓰기 잠금을 잡은 뒤 호출하므로, 동시에 끝난 다른 게임의 반영 전 레이팅을 읽지 않음
+def rate_game(session, game, old_result=None):
+    unrate_game(session, game, old_result)
+    if matchmaking.rateable(*game_result(game)):
+        home, away = (session.scalar(TEAM_RATING_QUERY, {"team_id": team_id}) for team_id in (game.home_team_id, game.away_team_id))
+        game.rating_change = matchmaking.rating_change(home, away, game.home_score, game.away_score)
+        adjust_ratings(session, game.home_team_id, game.away_team_id, game.rating_change, 1)
+
+# 일괄 추가한 게임 중 완료된 게임의 결과를 시각 순으로 레이팅에 반영 (추가한 뒤 같은 트랜잭션에서 호출)
+# 관련 팀 레이팅은 IN 쿼리 한 번으로 읽고, 게임별 변화량과 팀별 합계는 각각 executemany 한 번으로 기록
+def rate_imported(session, games, new_ids):
+    rated = sorted(((game['date_time'], id, game) for id, game in zip(new_ids, games)
+                    if matchmaking.rateable(game['status'], game['home_team_id'], game['away_team_id'], game['home_score'], game['away_score'])),
+                   key=lambda item: item[:2])
+    if not rated:
+        return
+    team_ids = {game[field] for _, _, game in rated for field in ('home_team_id', 'away_team_id')}
+    ratings = dict(session.execute(db.select(Team.id, Team.rating).where(Team.id.in_(team_ids))).all())
+    before = dict(ratings)
+    changes = matchmaking.rate_games([game for _, _, game in rated], ratings)
+    session.execute(SET_RATING_CHANGE, [{"game_id": id, "change": change} for (_, id, _), change in zip(rated, changes)])
+    counts = {team_id: 0 for team_id in ratings}
+    for _, _, game in rated:
+        counts[game['home_team_id']] += 1
+        counts[game['away_team_id']] += 1
+    session.execute(RATE_TEAMS, [{"team_id": team_id, "delta": ratings[team_id] - before[team_id], "games": counts[team_id]}
+                                 for team_id in ratings])
+    mark_changed(session, 'teams')
+
+def handle_get_games(session, args):
+    try:
+        limit, after, stream = parse_page_args(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    try:
+        query = filter_games(GAME_FULL.select(), args)
+    except ValueError:
+        return {"error": "잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요."}, 400
+    return Listing(GAME_FULL, query, limit, after, stream, "게임 목록 조회 중 오류 발생")
+
+@api.route('/api/games', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
+def get_games():
+    return run_handler(handle_get_games, request.args)
 
-@app.route('/api/games/<int:game_id>', methods=['GET'])
+def handle_get_game(session, game_id):
+    return GAME_FULL.dump(session, GAME_FULL.get_or_404(session, game_id)), 200
+
+@api.route('/api/games/<int:game_id>', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
 def get_game(game_id):
-    game = Game.query.get_or_404(game_id)
-    return jsonify(game.to_dict(include_court=True, include_host=True, include_full_teams=True)), 200
+    return run_handler(handle_get_game, game_id)
 
-@app.route('/api/games/<int:game_id>', methods=['PUT'])
-def update_game(game_id):
-    game = Game.query.get_or_404(game_id)
-    data = request.get_json()
+def handle_update_game(session, user_id, game_id, data):
+    game = get_or_404(session, Game, game_id)
+    if game.host_id != user_id:
+        return {"error": "게임 호스트만 게임 정보를 수정할 수 있습니다."}, 403
+    old_result = game_result(game)
 
     if 'date_time' in data:
-        try: game.date_time = datetime.datetime.fromisoformat(data['date_time'])
-        except ValueError: return jsonify({"error": "잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요."}), 400
-    
+        try: game.date_time = schedule.parse_datetime(data['date_time'])
+        except ValueError as e: return {"error": str(e)}, 400
+    if 'duration_minutes' in data:
+        try: game.duration_minutes = schedule.parse_duration(data['duration_minutes'])
+        except ValueError as e: return {"error": str(e)}, 400
+    for field in ('home_score', 'away_score'):
+        if field in data:
+            try: setattr(game, field, matchmaking.parse_score(data[field]))
+            except ValueError as e: return {"error": str(e)}, 400
+
     game.status = data.get('status', game.status)
     game.court_id = data.get('court_id', game.court_id) # 코트 변경 가능하도록
-    game.host_id = data.get('host_id', game.host_id) # 호스트 변경 가능하도록
+    game.host_id = data.get('host_id', game.host_id) # 호스트가 다른 사용자에게 넘길 수 있음
 
     new_home_team_id = data.get('home_team_id', game.home_team_id)
     new_away_team_id = data.get('away_team_id', game.away_team_id)
 
     if new_home_team_id and new_away_team_id and new_home_team_id == new_away_team_id:
-        return jsonify({"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}), 400
-    
-    # ID 유효성 검사
-    if 'court_id' in data and not Court.query.get(game.court_id): return jsonify({"error": f"코트 ID {game.court_id}를 찾을 수 없습니다."}), 404
-    if 'host_id' in data and not User.query.get(game.host_id): return jsonify({"error": f"사용자 ID {game.host_id}를 찾을 수 없습니다."}), 404
-    if new_home_team_id and not Team.query.get(new_home_team_id): return jsonify({"error": f"홈 팀 ID {new_home_team_id}를 찾을 수 없습니다."}), 404
-    if new_away_team_id and not Team.query.get(new_away_team_id): return jsonify({"error": f"어웨이 팀 ID {new_away_team_id}를 찾을 수 없습니다."}), 404
+        return {"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}, 400
+
+    # ID 유효성 검사 (아직 flush하지 않도록 autoflush 없이 조회)
+    with session.no_autoflush:
+        if 'court_id' in data and not session.get(Court, game.court_id): return {"error": f"코트 ID {game.court_id}를 찾을 수 없습니다."}, 404
+        if 'host_id' in data and not session.get(User, game.host_id): return {"error": f"사용자 ID {game.host_id}를 찾을 수 없습니다."}, 404
+        if new_home_team_id and not session.get(Team, new_home_team_id): return {"error": f"홈 팀 ID {new_home_team_id}를 찾을 수 없습니다."}, 404
+        if new_away_team_id and not session.get(Team, new_away_team_id): return {"error": f"어웨이 팀 ID {new_away_team_id}를 찾을 수 없습니다."}, 404
 
     game.home_team_id = new_home_team_id
     game.away_team_id = new_away_team_id
-    
+
     try:
-        db.session.commit()
-        return jsonify(game.to_dict(include_court=True, include_host=True, include_full_teams=True)), 200
+        # 시간, 코트, 길이, 상태가 바뀌면 flush한 뒤 같은 코트의 다른 예약과 겹치는지 검사
+        if any(field in data for field in schedule.SCHEDULE_FIELDS):
+            session.flush()
+            conflicts = game_conflicts(session, game)
+            if conflicts:
+                session.rollback()
+                return schedule.conflict_error(conflicts), 409
+        # 결과(상태, 팀, 점수)가 바뀌었으면 이전 결과의 레이팅 변화를 되돌리고 새 결과로 반영
+        if game_result(game) != old_result:
+            session.flush()
+            rate_game(session, game, old_result)
+        session.commit()
+        # 연결된 정보를 한 번의 쿼리로 다시 불러와 직렬화
+        return GAME_FULL.dump(session, GAME_FULL.get_or_404(session, game_id, refresh=True)), 200
     except Exception as e:
-        db.session.rollback(); app.logger.error(f"Error updating game: {e}"); return jsonify({"error": "게임 정보 수정 중 오류 발생"}), 500
+        session.rollback(); log.error(f"Error updating game: {e}"); return {"error": "게임 정보 수정 중 오류 발생"}, 500
 
-@app.route('/api/games/<int:game_id>', methods=['DELETE'])
-def delete_game(game_id):
-    game = Game.query.get_or_404(game_id)
+@api.route('/api/games/<int:game_id>', methods=['PUT'])
+@login_required
+def update_game(game_id):
+    return run_handler(handle_update_game, g.user_id, game_id, request.get_json())
+
+def handle_delete_game(session, user_id, game_id):
+    game = get_or_404(session, Game, game_id)
+    if game.host_id != user_id:
+        return {"error": "게임 호스트만 게임을 삭제할 수 있습니다."}, 403
     try:
-        db.session.delete(game)
-        db.session.commit()
-        return jsonify({"message": "게임이 성공적으로 삭제되었습니다."}), 200
+        unrate_game(session, game)
+        session.delete(game)
+        session.commit()
+        return {"message": "게임이 성공적으로 삭제되었습니다."}, 200
     except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error deleting game: {e}")
-        return jsonify({"error": "게임 삭제 중 오류 발생"}), 500
+        session.rollback()
+        log.error(f"Error deleting game: {e}")
+        return {"error": "게임 삭제 중 오류 발생"}, 500
 
-# 애플리케이션 컨텍스트 내에서 데이터베이스 테이블 생성 및 테스트 데이터 추가
-with app.app_context():
+@api.route('/api/games/<int:game_id>', methods=['DELETE'])
+@login_required
+def delete_game(game_id):
+    return run_handler(handle_delete_game, g.user_id, game_id)
+
+# 컬렉션 버전 (조건부 GET의 ETag, 응답 캐시 키)
+# flush된 객체의 테이블을 모아 두었다가 커밋이 끝난 뒤 해당 컬렉션의 버전을 올리고 그 컬렉션에 의존하는 캐시 응답을 지움 (롤백하면 버림)
+VERSIONED_TABLES = {'user': 'users', 'court': 'courts', 'team': 'teams', 'game': 'games'}
+
+def mark_changed(session, *collections):
+    session.info.setdefault('changed_collections', set()).update(collections)
+
+@event.listens_for(sqlite_profile.RoutingSession, 'after_flush')
+def collect_changes(session, flush_context):
+    tables = {obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)}
+    mark_changed(session, *(VERSIONED_TABLES[table] for table in tables if table in VERSIONED_TABLES))
+
+@event.listens_for(sqlite_profile.RoutingSession, 'after_commit')
+def bump_versions(session):
+    changed = session.info.pop('changed_collections', None)
+    if changed:
+        publish_changes(current_app, changed)
+
+@event.listens_for(sqlite_profile.RoutingSession, 'after_rollback')
+def discard_changes(session):
+    session.info.pop('changed_collections', None)
+
+def publish_changes(app, changed):
+    app.extensions['collection_versions'].bump(changed)
+    if app.extensions['response_cache']:
+        app.extensions['response_cache'].invalidate(changed)
+
+# 버전 파일 경로. SQLite 파일 DB면 DB 파일 옆에 두어 같은 DB를 쓰는 워커들이 공유
+def versions_path(app):
+    if 'COLLECTION_VERSIONS_FILE' in app.config:
+        return app.config['COLLECTION_VERSIONS_FILE']
+    with app.app_context():
+        return versions_file(db.engine.url)
+
+def versions_file(url):
+    if url.get_backend_name() == 'sqlite' and url.database and url.database != ':memory:':
+        return url.database + '-versions'
+    return None
+
+# 테이블과 인덱스 생성 (이미 있으면 건너뜀)
+def init_db():
     db.create_all()
+    # 이미 있던 테이블에는 create_all이 나중에 추가한 컬럼(기본값으로 채움)과 인덱스를 만들지 않으므로 따로 추가
+    for model in (Court, Team, Game):
+        existing = {column['name'] for column in db.inspect(db.engine).get_columns(model.__tablename__)}
+        for column in model.__table__.columns:
+            if column.name not in existing:
+                with db.engine.begin() as connection:
+                    connection.execute(db.text(f"ALTER TABLE {model.__tablename__} ADD COLUMN {CreateColumn(column).compile(db.engine)}"))
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+# werkzeug generate_password_hash 형식 ('pbkdf2:sha256:...', 'scrypt:...')
+PASSWORD_HASH_PREFIXES = ('pbkdf2:', 'scrypt:')
+
+# 테스트 데이터 추가. 이미 있는 데이터는 건드리지 않으므로 다시 실행해도 쓰기나 해시 계산이 없음
+def seed_db():
     # 테스트 사용자 (기존과 동일하게 생성 또는 업데이트)
     user1 = User.query.filter_by(email='test@example.com').first()
     if not user1:
         user1 = User(email='test@example.com', password_hash=generate_password_hash('password123'), name='Test User')
         db.session.add(user1)
-    elif not user1.password_hash or not user1.password_hash.startswith('$pbkdf2-sha256'):
+    elif not user1.password_hash or not user1.password_hash.startswith(PASSWORD_HASH_PREFIXES):
         user1.password_hash = generate_password_hash('password123')
 
     user2 = User.query.filter_by(email='another@example.com').first()
@@ -512,6 +1212,11 @@ with app.app_context():
     if not court2:
         court2 = Court(name="점프 아레나", address="서울시 서초구 반포대로 456", description="프로 선수들이 사용하는 코트입니다.")
         db.session.add(court2)
+    # 새 코트와 위치 필드가 생기기 전에 만든 코트 모두 좌표와 지역 코드를 채움
+    for court in (court1, court2):
+        location = geo.seed_location(court.name, court.lat, court.region)
+        if location:
+            set_court_location(court, location)
     db.session.commit() # 코트 커밋
 
     # 테스트 팀 추가
@@ -562,5 +1267,61 @@ with app.app_context():
             db.session.add(game2)
         db.session.commit() # 게임 커밋
 
+@click.command('init-db')
+def init_db_command():
+    init_db()
+    click.echo("데이터베이스 테이블을 생성했습니다.")
+
+@click.command('seed')
+def seed_command():
+    init_db()
+    seed_db()
+    click.echo("테스트 데이터를 추가했습니다.")
+
+# 애플리케이션 팩토리
+# 생성 시에는 DB에 연결하지 않음 (테이블 생성과 테스트 데이터는 flask --app app init-db / seed로 한 번만 실행)
+# 운영: gunicorn 'app:create_app()'
+def create_app(config=None):
+    app = Flask(__name__)
+
+    # 데이터베이스 설정
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'site.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ECHO'] = False # True로 설정하면 SQL 쿼리 로그 확인 가능
+    # 액세스 토큰 서명 키 (app_simple.py와 같은 값을 주면 두 서버가 서로의 토큰을 검증할 수 있음)
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+    if config:
+        app.config.update(config)
+    warning = auth_tokens.ensure_secret_key(app.config)
+    if warning:
+        app.logger.warning(warning)
+    # SQLite 엔진 설정 (WAL, 풀 크기, 읽기/쓰기 연결 분리). 환경 변수로 조정 가능, sqlite_profile.DEFAULTS 참고
+    sqlite_profile.configure(app)
+    db.init_app(app)
+    sqlite_profile.install(app, db)
+
+    # 비밀번호 해시 계산용 프로세스 풀 (프로세스는 첫 로그인/회원가입 때 시작)
+    app.extensions['password_pool'] = password_pool.from_config(app.config)
+    app.extensions['token_auth'] = auth_tokens.from_config(app.config)
+    app.extensions['collection_versions'] = collection_versions.create(versions_path(app))
+    # 코트/팀 조회 응답 캐시 (기본: 프로세스 메모리 LRU + TTL, RESPONSE_CACHE=redis면 워커 간 공유, off면 사용 안 함)
+    app.extensions['response_cache'] = response_cache.from_config(app.config)
+    # 응답 JSON 직렬화 (orjson이 있으면 사용, 날짜/시간은 ISO 8601)와 응답 압축 (gzip/brotli, 작은 응답은 그대로)
+    json_provider.install(app)
+    app.extensions['compression'] = compression.from_config(app.config)
+    app.after_request(compression.compress_response)
+    # 팀 매칭 색인 (numpy가 없으면 None이고 매칭 조회는 503)
+    app.extensions['matchmaking'] = matchmaking.create()
+
+    app.register_blueprint(api)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
+    return app
+
 if __name__ == '__main__':
+    app = create_app()
+    # 개발 서버는 편의를 위해 테이블과 테스트 데이터가 없으면 만든 뒤 실행
+    with app.app_context():
+        init_db()
+        seed_db()
     app.run(debug=True) 
\ No newline at end of file
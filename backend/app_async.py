@@ -0,0 +1,303 @@
+import os
+
+from quart import Blueprint, Quart, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import sqlite_profile
+import password_pool
+import auth_tokens
+import collection_versions
+import response_cache
+import json_provider
+import compression
+import matchmaking
+from pagination import MAX_PAGE_SIZE
+from async_views import json_body, parse_import_request, login_required, conditional, cached, list_response, compress_response
+from app import (
+    basedir, Listing, password_pool_busy, collect_changes, discard_changes, publish_changes, versions_file,
+    handle_metrics, handle_signup_check, handle_signup, handle_login_user, handle_login, handle_logout,
+    handle_get_courts, handle_create_court, handle_get_court, handle_court_availability, handle_update_court, handle_delete_court,
+    handle_create_team, handle_get_teams, handle_get_team, handle_update_team, handle_delete_team, handle_team_matches,
+    handle_create_game, handle_import_games, handle_get_games, handle_get_game, handle_update_game, handle_delete_game
+)
+
+# app.py와 같은 /api/* 라우트를 async 핸들러로 제공하는 ASGI 서버
+# 모델과 라우트의 처리 내용(app.handle_*)은 app.py의 것을 그대로 쓰고, aiosqlite 드라이버의 AsyncSession.run_sync로 실행한다.
+# 느린 요청(해시 계산, DB 대기)이 스레드를 잡지 않으므로 동시 요청 수가 스레드 수에 묶이지 않음
+# 실행: uvicorn --factory app_async:create_app (backend 디렉터리에서)
+# 테이블과 테스트 데이터는 app.py와 같은 DB 파일을 쓰므로 flask --app app init-db / seed로 준비
+api = Blueprint('api_async', __name__)
+
+
+# 커밋이 끝나면 바뀐 컬렉션의 버전을 올리고 응답 캐시를 지움 (app.py의 RoutingSession과 같은 이벤트)
+# AsyncSession이 내부에서 쓰는 동기 세션이라 이벤트도 그대로 받을 수 있음
+class VersionedSession(sqlite_profile.EngineRoutingSession):
+    pass
+
+event.listen(VersionedSession, 'after_flush', collect_changes)
+event.listen(VersionedSession, 'after_rollback', discard_changes)
+
+@event.listens_for(VersionedSession, 'after_commit')
+def bump_versions(session):
+    changed = session.info.pop('changed_collections', None)
+    if changed:
+        publish_changes(session.info['app'], changed)
+
+# 요청마다 하나의 세션 (요청이 끝나면 닫음)
+def get_session():
+    if 'db_session' not in g:
+        g.db_session = current_app.extensions['async_db']()
+    return g.db_session
+
+@api.teardown_app_request
+async def close_session(exc):
+    session = g.pop('db_session', None)
+    if session is not None:
+        await session.close()
+
+# app.py의 요청 처리 함수(handle_*)를 이 요청 세션의 동기 세션으로 실행 (AsyncSession.run_sync)
+# 처리 함수 안의 쿼리도 aiosqlite로 실행되어 이벤트 루프에서 기다리므로 스레드를 잡지 않음
+# 목록 조회면 list_response로 응답. 스트리밍이면 응답을 보내는 동안 쓸 세션을 따로 열고 MAX_PAGE_SIZE개씩 읽어 직렬화
+async def run_handler(handler, *args):
+    session = get_session()
+    result = await session.run_sync(handler, *args)
+    if not isinstance(result, Listing):
+        return result
+    try:
+        if result.stream is None:
+            items = await session.run_sync(lambda sync_session: list(result.items(sync_session)))
+            return list_response(items, result.limit), 200
+        return list_response(stream_items(result), result.limit, result.stream), 200
+    except Exception as e:
+        current_app.logger.error(f"{result.error}: {e}")
+        return {"error": result.error}, 500
+
+def stream_items(listing):
+    sessions = current_app.extensions['async_db']
+
+    async def items():
+        async with sessions() as session:
+            result = await session.stream_scalars(listing.query.execution_options(yield_per=500))
+            async for batch in result.partitions(MAX_PAGE_SIZE):
+                for item in await session.run_sync(lambda sync_session: list(listing.profile.dump_all(sync_session, batch))):
+                    yield item
+
+    return items()
+
+def get_password_pool():
+    return current_app.extensions['password_pool']
+
+@api.route('/')
+async def hello_world():
+    return 'Hello, World!'
+
+# 운영 지표
+@api.route('/api/metrics', methods=['GET'])
+async def get_metrics():
+    return handle_metrics(current_app.extensions)
+
+@api.route('/api/auth/signup', methods=['POST'])
+async def signup():
+    data = await json_body()
+    session = get_session()
+    error = await session.run_sync(handle_signup_check, data)
+    if error:
+        return error
+    try:
+        password_hash = await get_password_pool().hash_async(data['password'])
+    except password_pool.PoolBusy:
+        return password_pool_busy()
+    return await session.run_sync(handle_signup, data, password_hash)
+
+@api.route('/api/auth/login', methods=['POST'])
+async def login():
+    data = await json_body()
+    session = get_session()
+    error, user = await session.run_sync(handle_login_user, data)
+    if error:
+        return error
+    ok, new_hash = False, None
+    if user and user.password_hash:
+        try:
+            ok, new_hash = await get_password_pool().verify_async(user.password_hash, data['password'])
+        except password_pool.PoolBusy:
+            return password_pool_busy()
+    return await session.run_sync(handle_login, user, ok, new_hash, current_app.extensions['token_auth'])
+
+# 현재 토큰 폐기
+@api.route('/api/auth/logout', methods=['POST'])
+@login_required
+async def logout():
+    return handle_logout(current_app.extensions['token_auth'], g.token_claims)
+
+# --- 코트 API ---
+@api.route('/api/courts', methods=['GET'])
+@conditional('courts')
+@cached('courts')
+async def get_courts():
+    return await run_handler(handle_get_courts, request.args)
+
+@api.route('/api/courts', methods=['POST'])
+@login_required
+async def create_court():
+    return await run_handler(handle_create_court, await json_body())
+
+@api.route('/api/courts/<int:court_id>', methods=['GET'])
+@conditional('courts')
+@cached('courts')
+async def get_court(court_id):
+    return await run_handler(handle_get_court, court_id)
+
+@api.route('/api/courts/<int:court_id>/availability', methods=['GET'])
+@conditional('courts', 'games')
+async def get_court_availability(court_id):
+    return await run_handler(handle_court_availability, court_id, request.args)
+
+@api.route('/api/courts/<int:court_id>', methods=['PUT'])
+@login_required
+async def update_court(court_id):
+    return await run_handler(handle_update_court, court_id, await json_body())
+
+@api.route('/api/courts/<int:court_id>', methods=['DELETE'])
+@login_required
+async def delete_court(court_id):
+    return await run_handler(handle_delete_court, court_id)
+
+# --- 팀 API ---
+@api.route('/api/teams', methods=['POST'])
+@login_required
+async def create_team():
+    return await run_handler(handle_create_team, g.user_id, await json_body())
+
+@api.route('/api/teams', methods=['GET'])
+@conditional('teams', 'users')
+@cached('teams', 'users')
+async def get_teams():
+    return await run_handler(handle_get_teams, request.args)
+
+@api.route('/api/teams/<int:team_id>', methods=['GET'])
+@conditional('teams', 'users', 'games', 'courts')
+@cached('teams', 'users', 'games', 'courts')
+async def get_team(team_id):
+    return await run_handler(handle_get_team, team_id)
+
+@api.route('/api/teams/<int:team_id>', methods=['PUT'])
+@login_required
+async def update_team(team_id):
+    return await run_handler(handle_update_team, g.user_id, team_id, await json_body())
+
+@api.route('/api/teams/<int:team_id>', methods=['DELETE'])
+@login_required
+async def delete_team(team_id):
+    return await run_handler(handle_delete_team, g.user_id, team_id)
+
+# 팀의 추천 상대. 색인을 다시 만들 때 팀 목록을 읽는 동안에는 잠금을 잡지 않음
+@api.route('/api/teams/<int:team_id>/matches', methods=['GET'])
+@conditional('teams')
+@cached('teams')
+async def get_team_matches(team_id):
+    key = current_app.extensions['collection_versions'].get(('teams',))[0]
+    return await run_handler(handle_team_matches, current_app.extensions['matchmaking'], key, team_id, request.args, False)
+
+# --- 게임 API ---
+@api.route('/api/games', methods=['POST'])
+@login_required
+async def create_game():
+    return await run_handler(handle_create_game, g.user_id, await json_body())
+
+@api.route('/api/games/bulk', methods=['POST'])
+@login_required
+async def import_games():
+    try:
+        rows = await parse_import_request()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return await run_handler(handle_import_games, g.user_id, rows)
+
+@api.route('/api/games', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
+async def get_games():
+    return await run_handler(handle_get_games, request.args)
+
+@api.route('/api/games/<int:game_id>', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
+async def get_game(game_id):
+    return await run_handler(handle_get_game, game_id)
+
+@api.route('/api/games/<int:game_id>', methods=['PUT'])
+@login_required
+async def update_game(game_id):
+    return await run_handler(handle_update_game, g.user_id, game_id, await json_body())
+
+@api.route('/api/games/<int:game_id>', methods=['DELETE'])
+@login_required
+async def delete_game(game_id):
+    return await run_handler(handle_delete_game, g.user_id, game_id)
+
+# sqlite:/// URL을 aiosqlite 드라이버 URL로 바꾸고 sqlite_profile 설정의 풀 크기를 적용해 엔진 생성
+def create_engine(config, url, reader=False):
+    options = {}
+    if url.database and url.database != ':memory:':
+        options = {
+            'pool_size': config['DB_READ_POOL_SIZE' if reader else 'DB_POOL_SIZE'],
+            'max_overflow': config['DB_READ_MAX_OVERFLOW' if reader else 'DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT']
+        }
+    engine = create_async_engine(url.set(drivername='sqlite+aiosqlite'), **options)
+    sqlite_profile.install_engine(config, engine.sync_engine, reader)
+    return engine
+
+# 애플리케이션 팩토리 (app.create_app과 같은 설정 이름과 환경 변수 사용)
+def create_app(config=None):
+    app = Quart(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'site.db'))
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+    if config:
+        app.config.update(config)
+    warning = auth_tokens.ensure_secret_key(app.config)
+    if warning:
+        app.logger.warning(warning)
+    sqlite_profile.load_config(app.config)
+
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() != 'sqlite':
+        raise ValueError("비동기 서버는 SQLite(aiosqlite)만 지원합니다.")
+    writer = create_engine(app.config, url)
+    reader = None
+    if app.config['DB_READ_ROUTING'] and url.database and url.database != ':memory:':
+        reader = create_engine(app.config, url, reader=True)
+    # 커밋 후에도 직렬화할 수 있도록 객체를 만료시키지 않음 (만료된 속성은 비동기 세션에서 불러올 수 없음)
+    app.extensions['async_db'] = async_sessionmaker(
+        writer, sync_session_class=VersionedSession, expire_on_commit=False,
+        reader=reader.sync_engine if reader else None, info={'app': app}
+    )
+
+    app.extensions['password_pool'] = password_pool.from_config(app.config)
+    app.extensions['token_auth'] = auth_tokens.from_config(app.config)
+    app.extensions['collection_versions'] = collection_versions.create(app.config.get('COLLECTION_VERSIONS_FILE', versions_file(url)))
+    app.extensions['response_cache'] = response_cache.from_config(app.config)
+    json_provider.install(app)
+    app.extensions['compression'] = compression.from_config(app.config)
+    app.after_request(compress_response)
+    app.extensions['matchmaking'] = matchmaking.create()
+
+    @app.after_serving
+    async def dispose_engines():
+        app.extensions['password_pool'].shutdown()
+        for engine in (writer, reader):
+            if engine is not None:
+                await engine.dispose()
+
+    app.register_blueprint(api)
+    return app
+
+if __name__ == '__main__':
+    # 개발 서버는 app.py와 마찬가지로 테이블과 테스트 데이터가 없으면 만든 뒤 실행
+    import app as wsgi
+    wsgi_app = wsgi.create_app()
+    with wsgi_app.app_context():
+        wsgi.init_db()
+        wsgi.seed_db()
+    create_app().run(debug=True)
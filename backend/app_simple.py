@@ -1,13 +1,47 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, g, jsonify, request, render_template
 import os
 import json
 import atexit
+import bisect
+import time
+from collections import namedtuple
+from itertools import islice
+
+from journal import Journal
+from flusher import Flusher, FlushError
+from collection import IndexedCollection, DuplicateKeyError
+from game_table import GameTable
+from store import Snapshot, Store
+from snapshot_file import read_snapshot, write_snapshot
+from view_cache import ViewCache
+from pagination import parse_page_args, list_response, MAX_PAGE_SIZE
+import auth_tokens
+import game_import
+import schedule
+import matchmaking
+import geo
+import collection_versions
+import json_provider
+import compression
+from collection_versions import conditional
+from auth_tokens import login_required
 
 # 템플릿 폴더 경로 설정
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
 static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
-app.config['SECRET_KEY'] = 'flap-basketball-secret-key'  # 세션 암호화 키 설정
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')  # 세션 암호화 및 액세스 토큰 서명 키 설정
+secret_key_warning = auth_tokens.ensure_secret_key(app.config)
+if secret_key_warning:
+    print(f"경고: {secret_key_warning}")
+# 로그인 시 발급하는 액세스 토큰 (검증에 데이터베이스를 읽지 않음)
+app.extensions['token_auth'] = auth_tokens.from_config(app.config)
+# 컬렉션별 버전 번호 (조회 응답의 ETag, 변경이 게시될 때마다 올림)
+app.extensions['collection_versions'] = collection_versions.create()
+# 응답 JSON 직렬화 (orjson이 있으면 사용)와 응답 압축 (gzip/brotli, 작은 응답은 그대로)
+json_provider.install(app)
+app.extensions['compression'] = compression.from_config(app.config)
+app.after_request(compression.compress_response)
 
 # 서버 경로 출력
 print(f"템플릿 경로: {template_dir}")
@@ -15,44 +49,84 @@ print(f"정적 파일 경로: {static_dir}")
 
 # JSON 데이터베이스 파일 경로
 DB_FILE = os.path.join(os.path.dirname(__file__), 'db.json')
+# 바이너리 스냅샷 파일 경로 (binary 형식에서 사용)
+DB_BINARY_FILE = os.path.join(os.path.dirname(__file__), 'db.snap')
+# 변경 로그 파일 경로 (journal 모드에서 사용)
+DB_LOG_FILE = os.path.join(os.path.dirname(__file__), 'db.log')
 
-# 데이터 변수 초기화
-users = []
-courts = []
-teams = []
-games = []
+# 스냅샷 형식: 'json' (db.json) 또는 'binary' (db.snap, 시작 시 로드가 빠름)
+# binary로 바꾸면 첫 시작 때 db.json을 읽어 db.snap으로 저장하며, 이후에는 db.snap을 우선 사용
+SNAPSHOT_FORMAT = os.environ.get('DB_SNAPSHOT_FORMAT', 'json')
+# binary 형식에서 각 컬렉션을 처음 접근할 때 풀지 여부 (사용하지 않는 컬렉션의 로드 비용을 뒤로 미룸)
+LAZY_LOAD = os.environ.get('DB_LAZY_LOAD', '0') == '1'
 
-# 데이터베이스 파일에서 데이터 불러오기
-def load_db():
-    global users, courts, teams, games
-    try:
-        if os.path.exists(DB_FILE):
-            with open(DB_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                users = data.get('users', [])
-                courts = data.get('courts', [])
-                teams = data.get('teams', [])
-                games = data.get('games', [])
-            print(f"데이터베이스 로드 완료: {len(users)}명의 사용자, {len(courts)}개의 코트, {len(games)}개의 게임")
-        else:
-            print("데이터베이스 파일이 없습니다. 새로 생성합니다.")
-            save_db()
-    except Exception as e:
-        print(f"데이터베이스 로드 중 오류 발생: {e}")
-        # 기본 데이터 설정
-        users = [
+# 저장 방식: 'journal' (변경분만 로그에 추가하고 주기적으로 스냅샷 압축) 또는 'snapshot' (변경마다 전체 파일 저장)
+STORAGE_MODE = os.environ.get('DB_STORAGE_MODE', 'journal')
+# 변경 로그가 이 줄 수만큼 쌓이면 스냅샷으로 압축
+COMPACT_EVERY = int(os.environ.get('DB_COMPACT_EVERY', '1000'))
+# 저장 보장 수준: 'sync' (fsync 후 응답), 'group' (모아서 주기적으로 fsync), 'async' (백그라운드 기록, fsync 없음)
+DURABILITY = os.environ.get('DB_DURABILITY', 'group')
+# group 모드에서 변경을 모으는 최대 시간(ms)과 최대 개수
+GROUP_COMMIT_MS = int(os.environ.get('DB_GROUP_COMMIT_MS', '50'))
+GROUP_COMMIT_SIZE = int(os.environ.get('DB_GROUP_COMMIT_SIZE', '100'))
+
+COLLECTIONS = ('users', 'courts', 'teams', 'games')
+# 컬렉션별 고유 인덱스 필드
+UNIQUE_FIELDS = {'users': ('email',), 'teams': ('name',)}
+# 컬렉션별 그룹 인덱스 (이름 -> 레코드의 키). 코트는 지역 코드와 좌표의 격자 칸 (near 검색)
+GROUPS = {'courts': {
+    'region': lambda court: court.get('region'),
+    'grid_cell': lambda court: geo.cell(court.get('lat'), court.get('lng'))
+}}
+
+journal = Journal(DB_LOG_FILE)
+
+# 레코드 목록으로 컬렉션 생성 (games는 컬럼형 테이블)
+def make_collection(name, records=(), next_id=None):
+    if name == 'games':
+        return GameTable(name, records, next_id)
+    return IndexedCollection(name, records, next_id, unique=UNIQUE_FIELDS.get(name, ()), groups=GROUPS.get(name))
+
+# 불러온 데이터로 스냅샷 생성
+def make_snapshot(data, next_ids=None, version=0):
+    next_ids = next_ids or {}
+    return Snapshot(version, **{name: make_collection(name, data.get(name, []), next_ids.get(name)) for name in COLLECTIONS})
+
+# 변경이 게시된 직후 호출: 뷰 캐시를 새 버전으로 맞추고, 바뀐 컬렉션의 버전을 올리고, 변경 로그 기록을 요청
+# 변경 로그는 쓰기 잠금 안에서 대기열에 넣으므로 게시 순서대로 기록됨. sync 모드의 fsync 대기는 잠금 밖에서 함
+def on_commit(snapshot, changes):
+    game_views.advance(snapshot.version, changes)
+    app.extensions['collection_versions'].bump(change[1] for change in changes)
+    seq = flusher.enqueue(journal.encode(changes) if STORAGE_MODE == 'journal' else None)
+    if flusher.mode == 'sync':
+        return flusher.waiter(seq)
+
+# 데이터 저장소. 읽기 요청은 store.snapshot 하나로 끝까지 처리하고 (잠금 없음),
+# 쓰기 요청은 with store.write() as tx: 안에서 tx.<컬렉션>을 수정한다 (한 요청의 변경이 한 번에 게시되고 기록됨)
+store = Store(make_snapshot({}), on_commit)
+
+# 스냅샷이나 변경 로그를 읽지 못함 (서버를 시작하지 않음)
+class LoadError(Exception):
+    pass
+
+# 처음 시작할 때(스냅샷과 변경 로그가 모두 없을 때)의 기본 데이터
+def seed_snapshot(version):
+    return make_snapshot({
+        "users": [
             {"id": 1, "name": "Test User", "email": "test@example.com", "password": "password123"},
             {"id": 2, "name": "Another User", "email": "another@example.com", "password": "password123"}
-        ]
-        courts = [
-            {"id": 1, "name": "플랩 스타디움", "address": "서울시 강남구 테헤란로 123", "description": "최신 시설의 농구 코트입니다."},
-            {"id": 2, "name": "점프 아레나", "address": "서울시 서초구 반포대로 456", "description": "프로 선수들이 사용하는 코트입니다."}
-        ]
-        teams = [
+        ],
+        "courts": [
+            {"id": 1, "name": "플랩 스타디움", "address": "서울시 강남구 테헤란로 123", "description": "최신 시설의 농구 코트입니다.",
+             **geo.SEED_COURT_LOCATIONS["플랩 스타디움"]},
+            {"id": 2, "name": "점프 아레나", "address": "서울시 서초구 반포대로 456", "description": "프로 선수들이 사용하는 코트입니다.",
+             **geo.SEED_COURT_LOCATIONS["점프 아레나"]}
+        ],
+        "teams": [
             {"id": 1, "name": "Alpha Team", "description": "The A team", "member_ids": [1]},
             {"id": 2, "name": "Beta Team", "description": "The B team", "member_ids": [2]}
-        ]
-        games = [
+        ],
+        "games": [
             {
                 "id": 1, 
                 "home_team_id": 1, 
@@ -63,45 +137,312 @@ def load_db():
                 "status": "SCHEDULED"
             }
         ]
+    }, version=version)
+
+# 데이터베이스 파일에서 데이터 불러오기 (스냅샷 + 변경 로그 재생)
+def load_db():
+    version = store.snapshot.version + 1
+    snapshot_files = [DB_BINARY_FILE, DB_FILE] if SNAPSHOT_FORMAT == 'binary' else [DB_FILE]
+    if not any(os.path.exists(path) for path in snapshot_files) and not (os.path.exists(DB_LOG_FILE) and os.path.getsize(DB_LOG_FILE)):
+        print("데이터베이스 파일이 없습니다. 기본 데이터로 새로 생성합니다.")
+        store.replace(seed_snapshot(version))
+        game_views.reset(version)
         save_db()
+        return
+    try:
+        started = time.perf_counter()
+        data, next_ids, reader = {}, {}, None
+        snapshot_exists = False
+        if SNAPSHOT_FORMAT == 'binary' and os.path.exists(DB_BINARY_FILE):
+            reader = read_snapshot(DB_BINARY_FILE)
+            next_ids = dict(reader.next_ids)
+            snapshot_exists = True
+        elif os.path.exists(DB_FILE):
+            with open(DB_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            next_ids = data.get('next_ids', {})
+            data = {name: data.get(name, []) for name in COLLECTIONS}
+            # 설정한 형식이 아닌 파일에서 읽었다면 아래에서 설정한 형식으로 다시 저장
+            snapshot_exists = SNAPSHOT_FORMAT != 'binary'
+        else:
+            print("스냅샷 파일이 없습니다. 변경 로그만 재생합니다.")
+        # 바이너리 스냅샷은 변경 로그가 건드린 컬렉션만 레코드로 풀어서 재생
+        replayed = journal.replay(data, next_ids, reader.records if reader else None)
+
+        collections = {}
+        for name in COLLECTIONS:
+            if reader is None or name in data or name not in reader.entries:
+                collections[name] = make_collection(name, data.get(name, []), next_ids.get(name))
+            elif LAZY_LOAD:
+                collections[name] = reader.lazy(name, UNIQUE_FIELDS.get(name, ()), report_duplicates if name in UNIQUE_FIELDS else None, GROUPS.get(name))
+            else:
+                collections[name] = reader.collection(name, UNIQUE_FIELDS.get(name, ()), GROUPS.get(name))
+        db = Snapshot(version, **collections)
+        store.replace(db)
+        game_views.reset(version)
+        counts = [len(db.collection(name)) for name in ('users', 'courts', 'games')]
+        print(f"데이터베이스 로드 완료: {counts[0]}명의 사용자, {counts[1]}개의 코트, {counts[2]}개의 게임 "
+              f"(변경 로그 {replayed}건 재생, {time.perf_counter() - started:.3f}초)")
+        check_integrity()
 
-# 데이터를 데이터베이스 파일에 저장
-def save_db():
+        if replayed or not snapshot_exists:
+            # 재생한 변경 로그를 스냅샷으로 압축
+            compact_db()
+    except Exception as e:
+        # 읽지 못한 파일을 기본 데이터로 덮어쓰면 데이터가 사라지므로 파일을 그대로 두고 시작하지 않음
+        message = (f"데이터베이스 로드 중 오류 발생 ({e}). 스냅샷({', '.join(snapshot_files)})과 변경 로그({DB_LOG_FILE})를 "
+                   f"백업에서 복구하거나 다른 곳으로 옮긴 뒤 다시 시작해주세요.")
+        print(message)
+        raise LoadError(message) from e
+
+# 고유 인덱스(사용자 이메일, 팀 이름) 중복 검사
+# 중복이 있으면 먼저 저장된 레코드가 조회/로그인에 사용되며, 나머지는 직접 정리해야 함
+# 지연 로드 중인 컬렉션은 처음 풀 때 검사함
+def check_integrity():
+    db = store.snapshot
+    problems = []
+    for name in UNIQUE_FIELDS:
+        collection = db.collection(name)
+        if isinstance(collection, IndexedCollection):
+            problems += report_duplicates(collection)
+    return problems
+
+def report_duplicates(collection):
+    problems = [(collection.name, field, value, ids) for field, value, ids in collection.check_integrity()]
+    for name, field, value, ids in problems:
+        print(f"무결성 오류: {name}.{field} 값 '{value}'이(가) 여러 레코드에 중복되어 있습니다 (id: {ids})")
+    return problems
+
+# 데이터를 데이터베이스 파일에 저장 (임시 파일에 쓰고 fsync한 뒤 교체하여 중간에 종료되어도 기존 파일 유지)
+def save_db(durable=True):
     try:
-        with open(DB_FILE, 'w', encoding='utf-8') as f:
-            json.dump({
-                'users': users,
-                'courts': courts,
-                'teams': teams,
-                'games': games
-            }, f, ensure_ascii=False, indent=2)
+        # 게시된 스냅샷은 바뀌지 않으므로 요청 처리와 동시에 복사 없이 직렬화할 수 있음
+        db = store.snapshot
+        if SNAPSHOT_FORMAT == 'binary':
+            # 아직 풀지 않은 컬렉션은 읽어 둔 구역을 그대로 씀
+            write_snapshot(DB_BINARY_FILE, [db.collection(name) for name in COLLECTIONS], durable)
+        else:
+            collections = [getattr(db, name) for name in COLLECTIONS]
+            snapshot = {c.name: c.to_list() for c in collections}
+            # 삭제된 id가 재사용되지 않도록 id 카운터도 함께 저장
+            snapshot['next_ids'] = {c.name: c.next_id for c in collections}
+            tmp_file = DB_FILE + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, DB_FILE)
         print("데이터베이스 저장 완료")
+        return True
     except Exception as e:
         print(f"데이터베이스 저장 중 오류 발생: {e}")
+        return False
+
+# 변경 로그를 스냅샷에 반영하고 로그를 비움 (스냅샷 저장에 실패하면 로그 유지)
+def compact_db(durable=True):
+    if save_db(durable):
+        journal.reset()
+
+# 저장 스레드에서 모인 변경을 한 번에 기록
+# 기록에 실패하면 예외를 내서 저장 스레드가 같은 변경을 다시 기록하게 함
+def write_batch(lines, durable):
+    if STORAGE_MODE != 'journal':
+        # snapshot 모드: 여러 변경을 한 번의 전체 저장으로 합침
+        if not save_db(durable):
+            raise OSError("데이터베이스 스냅샷을 저장하지 못했습니다.")
+        return
+    journal.write(lines, durable)
+    if journal.entries >= COMPACT_EVERY:
+        compact_db(durable)
+
+# 게임 조회 응답(코트, 팀, 비밀번호를 뺀 호스트 정보 포함) 생성
+# 뷰 캐시가 무효화 대상을 알 수 있도록 참조한 레코드 목록도 함께 반환
+def build_game_view(game_id, db):
+    game = db.games.get(game_id)
+    if game is None:
+        return None, []
+    game_data = dict(game)
+    deps = [('games', game["id"])]
+
+    # 코트 정보 추가
+    court = db.courts.get(game["court_id"])
+    deps.append(('courts', game["court_id"]))
+    if court:
+        game_data["court"] = dict(court)
+
+    # 홈팀, 어웨이팀 정보 추가
+    for field in ("home_team", "away_team"):
+        team_id = game[field + "_id"]
+        if team_id:
+            deps.append(('teams', team_id))
+            team = db.teams.get(team_id)
+            if team:
+                game_data[field] = dict(team)
+
+    # 호스트 정보 추가 (비밀번호 제외)
+    host = db.users.get(game["host_id"])
+    deps.append(('users', game["host_id"]))
+    if host:
+        game_data["host"] = {k: v for k, v in host.items() if k != 'password'}
+
+    return game_data, deps
+
+# 게임 레코드가 차지할 시간과 겹치는 같은 코트의 다른 예약 목록 (코트 구간 인덱스 사용)
+# 취소된 게임이거나 코트/시각을 해석할 수 없는 게임은 코트를 차지하지 않으므로 검사하지 않음
+def court_conflicts(games, game, exclude=None):
+    if game["status"] in schedule.FREE_STATUSES or not isinstance(game["court_id"], int):
+        return []
+    try:
+        start = schedule.parse_datetime(game["date_time"])
+    except ValueError:
+        return []
+    duration = game.get("duration_minutes")
+    end = schedule.game_end(start, duration if type(duration) is int else None)
+    return [interval for interval in games.busy(game["court_id"], start, end) if interval[2] != exclude]
+
+# 레이팅 계산에 쓰는 게임 결과 (상태, 홈 팀, 어웨이 팀, 홈 점수, 어웨이 점수)
+def game_result(game):
+    return (game.get("status"), game.get("home_team_id"), game.get("away_team_id"), game.get("home_score"), game.get("away_score"))
+
+# 팀 레이팅에 delta를 더하고 반영한 게임 수를 games만큼 바꿈 (없는 팀은 건너뜀). 레이팅이 없던 팀은 기본값에서 시작
+def adjust_rating(tx, team_id, delta, games):
+    team = tx.teams.get(team_id)
+    if team:
+        tx.teams.update(team_id, {
+            "rating": round(team.get("rating", matchmaking.DEFAULT_RATING) + delta, 2),
+            "rated_games": team.get("rated_games", 0) + games
+        })
+
+# 게임에 반영했던 레이팅 변화를 되돌림 (결과가 바뀌거나 게임을 삭제할 때)
+def unrate_game(tx, game):
+    change = game.get("rating_change")
+    if change is not None:
+        adjust_rating(tx, game["home_team_id"], -change, -1)
+        adjust_rating(tx, game["away_team_id"], change, -1)
+
+# 완료된 게임 결과를 두 팀 레이팅에 반영하고 홈 팀 변화량을 반환 (반영하지 않으면 None). 어웨이 팀은 반대로 변함
+def rate_game(tx, game):
+    if not matchmaking.rateable(*game_result(game)):
+        return None
+    home, away = tx.teams.get(game["home_team_id"]), tx.teams.get(game["away_team_id"])
+    if not home or not away:
+        return None
+    change = matchmaking.rating_change(home.get("rating", matchmaking.DEFAULT_RATING), away.get("rating", matchmaking.DEFAULT_RATING),
+                                       game["home_score"], game["away_score"])
+    adjust_rating(tx, home["id"], change, 1)
+    adjust_rating(tx, away["id"], -change, 1)
+    return change
+
+# 일괄 추가할 게임 레코드 중 완료된 게임의 결과를 시각 순으로 레이팅에 반영하고 게임별 변화량을 레코드에 기록
+# games: 정리된 행 (date_time은 datetime), records: 같은 순서의 추가할 레코드
+def rate_imported(tx, games, records):
+    order = sorted(range(len(games)), key=lambda i: games[i]['date_time'])
+    team_ids = {games[i][field] for i in order for field in ('home_team_id', 'away_team_id') if games[i][field]}
+    # 반영할 게임이 없으면 팀 컬렉션을 복사하지 않도록 기준 스냅샷에서 읽음
+    ratings = {team_id: tx.snapshot.teams.get(team_id).get("rating", matchmaking.DEFAULT_RATING) for team_id in team_ids}
+    counts = dict.fromkeys(team_ids, 0)
+    for i, change in zip(order, matchmaking.rate_games([games[i] for i in order], ratings)):
+        records[i]["rating_change"] = change
+        if change is not None:
+            counts[games[i]['home_team_id']] += 1
+            counts[games[i]['away_team_id']] += 1
+    for team_id, count in counts.items():
+        if count:
+            team = tx.teams.get(team_id)
+            tx.teams.update(team_id, {"rating": round(ratings[team_id], 2), "rated_games": team.get("rated_games", 0) + count})
+
+# 게임 삭제 (연쇄 삭제 포함). 레이팅에 반영했던 결과는 되돌림
+def remove_game(tx, game_id):
+    game = tx.games.remove(game_id)
+    if game:
+        unrate_game(tx, game)
+    return game
 
-# 서버 종료 시 데이터 저장
-atexit.register(save_db)
+# 팀 매칭 색인. 팀 컬렉션이 바뀌면 (쓰기마다 새 컬렉션 객체가 게시됨) 다음 조회 때 바뀐 팀의 값만 고치고,
+# 팀이 추가/삭제되었을 때만 다시 만듦. numpy가 없으면 None
+match_engine = matchmaking.create()
 
-# 애플리케이션 시작 시 데이터 로드
+# 매칭 색인에 넣을 팀 값 (id, 레이팅, 지역, 가능 시간대)
+def match_values(team):
+    return team["id"], team.get("rating"), team.get("region"), team.get("availability")
+
+# 색인을 만든 팀 컬렉션(old) 이후 바뀐 팀의 색인 값 (MatchEngine.index의 update). 팀이 추가/삭제되었으면 None
+def changed_teams(teams, old):
+    changed = []
+    for team_id in teams.changed_since(old):
+        team = teams.get(team_id)
+        if team is None or team_id not in old:
+            return None, teams
+        changed.append(match_values(team))
+    return changed, teams
+
+# team_id 팀의 추천 상대 응답 목록 (없는 팀이면 None). db: 읽기 스냅샷
+def find_matches(db, team_id, limit):
+    teams = db.teams
+    index = match_engine.index(teams, lambda: ([match_values(team) for team in teams], teams),
+                               update=lambda index, old: changed_teams(teams, old))
+    matches = index.matches(team_id, limit)
+    if matches is None:
+        return None
+    return [matchmaking.match_dict(match, teams.get(match[0])) for match in matches]
+
+# 게임 id -> 조회 응답 캐시. 게임이나 참조하는 코트/팀/사용자가 바뀔 때만 해당 항목을 지움
+game_views = ViewCache(build_game_view, int(os.environ.get('GAME_VIEW_CACHE_SIZE', '100000')))
+
+# 서버 종료 시 남은 변경을 기록하고 스냅샷으로 압축
+def close_db():
+    flusher.close()
+    compact_db()
+
+# 위치 필드가 생기기 전에 저장된 테스트 데이터 코트에 좌표와 지역 코드를 채움 (다른 쓰기처럼 변경 로그에 기록)
+def backfill_court_locations():
+    missing = []
+    for court in store.snapshot.courts:
+        location = geo.seed_location(court["name"], court.get("lat"), court.get("region"))
+        if location:
+            missing.append((court["id"], location))
+    if not missing:
+        return
+    with store.write() as tx:
+        for court_id, location in missing:
+            tx.courts.update(court_id, location)
+    print(f"코트 {len(missing)}개의 위치를 채웠습니다.")
+
+# 애플리케이션 시작 시 데이터 로드 후 저장 스레드 시작
 load_db()
+flusher = Flusher(write_batch, DURABILITY, GROUP_COMMIT_MS / 1000, GROUP_COMMIT_SIZE)
+atexit.register(close_db)
+backfill_court_locations()
+
+# sync 모드에서 변경을 디스크에 기록하지 못함 (변경은 게시되었고 저장 스레드가 다시 기록을 시도함)
+@app.errorhandler(FlushError)
+def flush_failed(e):
+    return jsonify({"error": str(e)}), 500
 
-# 유틸리티 함수
-def get_next_id(collection):
-    if not collection:
-        return 1
-    return max(item["id"] for item in collection) + 1
+# 요청 처리 함수 (handle_*)
+# 라우트의 처리 내용은 이 함수들에 있고 app_simple.py(Flask)와 app_simple_async.py(Quart)의 라우트가 같은 함수를 호출한다.
+# 요청 객체 대신 읽어 둔 본문/쿼리 인자와 로그인한 사용자 id를 받고, 두 서버의 라우트가 그대로 돌려줄 수 있는
+# (본문, 상태 코드) 또는 목록 조회(Listing)를 돌려준다.
+# 쓰기는 store.write(wait=False)로 하고 Committed(tx, 응답)을 돌려주어, 저장 대기(sync 모드의 fsync)는 라우트가
+# 서버에 맞는 방식으로 한다 (app_simple.py는 tx.after() 호출, app_simple_async.py는 await).
 
-def find_by_id(collection, id):
-    for item in collection:
-        if item["id"] == id:
-            return item
-    return None
+# 목록 조회 결과: 라우트가 서버의 list_response(items, limit, stream)로 응답. items는 스냅샷에서 읽는 반복자
+Listing = namedtuple('Listing', 'items limit stream')
 
-def remove_by_id(collection, id):
-    for i, item in enumerate(collection):
-        if item["id"] == id:
-            return collection.pop(i)
-    return None
+# 쓰기 결과: 게시된 트랜잭션과 저장이 끝난 뒤 보낼 응답
+Committed = namedtuple('Committed', 'tx response')
+
+# 요청 처리 함수를 실행하고 쓰기면 저장을 기다린 뒤, 목록 조회면 list_response로 응답
+def run_handler(handler, *args):
+    result = handler(*args)
+    if isinstance(result, Committed):
+        if result.tx.after is not None:
+            result.tx.after()
+        result = result.response
+    if isinstance(result, Listing):
+        return list_response(*result)
+    return result
 
 # 기본 라우트
 @app.route('/')
@@ -109,435 +450,622 @@ def hello_world():
     return render_template('index.html')
 
 # 사용자 API
-@app.route('/api/auth/login', methods=['POST'])
-def login():
-    data = request.get_json()
+def handle_login(data, token_auth):
     email = data.get('email')
     password = data.get('password')
-    
+
     if not email or not password:
-        return jsonify({"error": "이메일과 비밀번호를 모두 입력해주세요."}), 400
-    
+        return {"error": "이메일과 비밀번호를 모두 입력해주세요."}, 400
+
     # 디버그용 로그 출력
     print(f"로그인 시도: {email}")
-    
-    # 사용자 목록에서 이메일로 사용자 찾기
-    for user in users:
-        if user["email"] == email and user["password"] == password:
-            # 비밀번호를 제외한 사용자 정보 반환
-            user_info = {k: v for k, v in user.items() if k != 'password'}
-            return jsonify(user_info), 200
-    
+
+    # 이메일 인덱스로 사용자 찾기
+    user = store.snapshot.users.get_by('email', email)
+    if user and user["password"] == password:
+        # 비밀번호를 제외한 사용자 정보 반환
+        user_info = {k: v for k, v in user.items() if k != 'password'}
+        # 이후 요청은 Authorization: Bearer <access_token> 헤더로 인증
+        user_info.update(token_auth.token_response(user["id"]))
+        return user_info, 200
+
     # 일치하는 사용자가 없는 경우
-    return jsonify({"error": "이메일 또는 비밀번호가 일치하지 않습니다."}), 401
+    return {"error": "이메일 또는 비밀번호가 일치하지 않습니다."}, 401
 
-@app.route('/api/auth/signup', methods=['POST'])
-def signup():
-    data = request.get_json()
+@app.route('/api/auth/login', methods=['POST'])
+def login():
+    return run_handler(handle_login, request.get_json(), app.extensions['token_auth'])
+
+def handle_signup(data):
     email = data.get('email')
     password = data.get('password')
     name = data.get('name')
-    
+
     # 디버그용 로그 출력
     print(f"회원가입 시도: 이메일={email}, 이름={name}")
-    
+
     if not email or not password or not name:
-        return jsonify({"error": "이메일, 비밀번호, 이름을 모두 입력해주세요."}), 400
-        
-    # 이메일 중복 확인
-    if any(user["email"] == email for user in users):
+        return {"error": "이메일, 비밀번호, 이름을 모두 입력해주세요."}, 400
+
+    # 새 사용자 추가 (이메일 중복은 고유 인덱스에서 확인)
+    # 블록이 끝나면 변경사항이 게시되고 데이터베이스에 저장됨
+    try:
+        with store.write(wait=False) as tx:
+            new_user = tx.users.insert({
+                "email": email,
+                "name": name,
+                "password": password  # 실제로는 비밀번호 해싱 필요
+            })
+    except DuplicateKeyError:
         print(f"회원가입 실패: 이메일 {email} 중복")
-        return jsonify({"error": "이미 사용 중인 이메일입니다."}), 400
-    
-    # 새 사용자 추가
-    new_user = {
-        "id": get_next_id(users),
-        "email": email,
-        "name": name,
-        "password": password  # 실제로는 비밀번호 해싱 필요
-    }
-    users.append(new_user)
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
+        return {"error": "이미 사용 중인 이메일입니다."}, 400
+
     print(f"회원가입 성공: ID={new_user['id']}, 이메일={email}")
-    
+
     # 비밀번호를 제외한 사용자 정보 반환
     user_info = {k: v for k, v in new_user.items() if k != 'password'}
-    return jsonify(user_info), 201
+    return Committed(tx, (user_info, 201))
+
+@app.route('/api/auth/signup', methods=['POST'])
+def signup():
+    return run_handler(handle_signup, request.get_json())
+
+# 현재 토큰 폐기
+def handle_logout(token_auth, claims):
+    token_auth.revoke(claims)
+    return {"message": "로그아웃 되었습니다."}, 200
+
+@app.route('/api/auth/logout', methods=['POST'])
+@login_required
+def logout():
+    return run_handler(handle_logout, app.extensions['token_auth'], g.token_claims)
+
+# 운영 지표
+def handle_metrics(extensions):
+    compressor = extensions['compression']
+    return {
+        "access_tokens": extensions['token_auth'].stats(),
+        "compression": compressor.stats() if compressor else None
+    }, 200
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    return run_handler(handle_metrics, app.extensions)
+
+def handle_get_users(args):
+    try:
+        limit, after, stream = parse_page_args(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    # 비밀번호 필드 제외하고 반환
+    safe_users = ({k: v for k, v in user.items() if k != 'password'} for user in islice(store.snapshot.users.iter_from(after), limit))
+    return Listing(safe_users, limit, stream)
 
 @app.route('/api/users', methods=['GET'])
+@conditional('users')
 def get_users():
-    # 비밀번호 필드 제외하고 반환
-    safe_users = [{k: v for k, v in user.items() if k != 'password'} for user in users]
-    return jsonify(safe_users)
+    return run_handler(handle_get_users, request.args)
 
 # 코트 API
+def court_position(court):
+    return court.get("lat"), court.get("lng")
+
+# near 검색: 반경을 덮는 격자 칸의 코트만 그룹 인덱스에서 모아 실제 거리로 거름 -> [(거리, 코트)] 가까운 순
+def near_courts(courts, lat, lng, radius, region=None):
+    candidates = [court for first, last in geo.cell_ranges(lat, lng, radius) for cell in range(first, last + 1)
+                  for court in courts.find_by('grid_cell', cell) if region is None or court.get("region") == region]
+    candidates.sort(key=lambda court: court["id"])
+    return geo.within(candidates, lat, lng, radius, court_position)
+
+# region=지역 코드, near=위도,경도 & radius=km 검색은 app.py의 get_courts와 같음 (코트 컬렉션의 그룹 인덱스로 조회)
+# 좌표나 지역 코드가 있는 코트가 하나도 없으면 빈 목록 대신 404
+def handle_get_courts(args):
+    try:
+        limit, after, stream = parse_page_args(args)
+        near = geo.parse_near(args)
+        region = geo.parse_region(args.get('region'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    courts = store.snapshot.courts
+    if near is not None and not courts.has_group('grid_cell'):
+        return {"error": geo.NO_LOCATIONS}, 404
+    if region is not None and not courts.has_group('region'):
+        return {"error": geo.NO_REGIONS}, 404
+    if near is not None:
+        found = near_courts(courts, *near, region)[:limit or MAX_PAGE_SIZE]
+        return Listing((geo.near_dict(distance, court) for distance, court in found), None, None)
+    if region is not None:
+        found = (court for court in courts.find_by('region', region) if after is None or court["id"] > after)
+        return Listing(islice(found, limit), limit, stream)
+    return Listing(islice(courts.iter_from(after), limit), limit, stream)
+
 @app.route('/api/courts', methods=['GET'])
+@conditional('courts')
 def get_courts():
-    return jsonify(courts)
+    return run_handler(handle_get_courts, request.args)
+
+def handle_get_court(court_id):
+    court = store.snapshot.courts.get(court_id)
+    if not court:
+        return {"error": "코트를 찾을 수 없습니다."}, 404
+    return court, 200
 
 @app.route('/api/courts/<int:court_id>', methods=['GET'])
+@conditional('courts')
 def get_court(court_id):
-    court = find_by_id(courts, court_id)
-    if not court:
-        return jsonify({"error": "코트를 찾을 수 없습니다."}), 404
-    return jsonify(court)
+    return run_handler(handle_get_court, court_id)
 
-@app.route('/api/courts', methods=['POST'])
-def create_court():
-    data = request.get_json()
+# 코트의 예약된 시간과 빈 시간. from/to (ISO 날짜/시간, 최대 31일) 범위를 코트 구간 인덱스에서 조회
+def handle_court_availability(court_id, args):
+    try:
+        start, end = schedule.parse_range(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    db = store.snapshot
+    if not db.courts.get(court_id):
+        return {"error": "코트를 찾을 수 없습니다."}, 404
+    return schedule.availability(court_id, start, end, db.games.busy(court_id, start, end)), 200
+
+@app.route('/api/courts/<int:court_id>/availability', methods=['GET'])
+@conditional('courts', 'games')
+def get_court_availability(court_id):
+    return run_handler(handle_court_availability, court_id, request.args)
+
+def handle_create_court(data):
     name = data.get('name')
     address = data.get('address')
     description = data.get('description', '')
-    
+
     if not name or not address:
-        return jsonify({"error": "이름과 주소는 필수 항목입니다."}), 400
-    
-    new_court = {
-        "id": get_next_id(courts),
-        "name": name,
-        "address": address,
-        "description": description
-    }
-    courts.append(new_court)
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
-    return jsonify(new_court), 201
+        return {"error": "이름과 주소는 필수 항목입니다."}, 400
+    try:
+        lat, lng, region = geo.parse_court_location(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    with store.write(wait=False) as tx:
+        new_court = tx.courts.insert({
+            "name": name,
+            "address": address,
+            "description": description,
+            "lat": lat,
+            "lng": lng,
+            "region": region
+        })
+
+    return Committed(tx, (new_court, 201))
+
+@app.route('/api/courts', methods=['POST'])
+@login_required
+def create_court():
+    return run_handler(handle_create_court, request.get_json())
+
+def handle_update_court(court_id, data):
+    with store.write(wait=False) as tx:
+        court = tx.snapshot.courts.get(court_id)
+        if not court:
+            return {"error": "코트를 찾을 수 없습니다."}, 404
+
+        try:
+            lat, lng, region = geo.parse_court_location(data, (court.get("lat"), court.get("lng"), court.get("region")))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # 게시된 레코드는 읽는 중인 요청과 공유되므로 직접 고치지 않고 새 레코드로 교체
+        court = tx.courts.update(court_id, {
+            "name": data.get('name', court["name"]),
+            "address": data.get('address', court["address"]),
+            "description": data.get('description', court.get("description", '')),
+            "lat": lat,
+            "lng": lng,
+            "region": region
+        })
+
+    return Committed(tx, (court, 200))
 
 @app.route('/api/courts/<int:court_id>', methods=['PUT'])
+@login_required
 def update_court(court_id):
-    court = find_by_id(courts, court_id)
-    if not court:
-        return jsonify({"error": "코트를 찾을 수 없습니다."}), 404
-        
-    data = request.get_json()
-    court["name"] = data.get('name', court["name"])
-    court["address"] = data.get('address', court["address"])
-    court["description"] = data.get('description', court.get("description", ''))
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
-    return jsonify(court)
+    return run_handler(handle_update_court, court_id, request.get_json())
+
+def handle_delete_court(court_id):
+    # 코트와 연관된 게임은 한 번에 삭제되어 읽는 쪽에서 중간 상태가 보이지 않음
+    with store.write(wait=False) as tx:
+        if court_id not in tx.snapshot.courts:
+            return {"error": "코트를 찾을 수 없습니다."}, 404
+        tx.courts.remove(court_id)
+
+        # 연관된 게임 데이터 처리 (역참조 인덱스로 이 코트의 게임만 찾음)
+        for game_id in tx.snapshot.games.ids_referencing('court_id', court_id):
+            remove_game(tx, game_id)
+
+    return Committed(tx, ({"message": "코트가 성공적으로 삭제되었습니다."}, 200))
 
 @app.route('/api/courts/<int:court_id>', methods=['DELETE'])
+@login_required
 def delete_court(court_id):
-    court = remove_by_id(courts, court_id)
-    if not court:
-        return jsonify({"error": "코트를 찾을 수 없습니다."}), 404
-    
-    # 연관된 게임 데이터 처리 (실제로는 이런 방식 보다 더 정교한 처리 필요)
-    games_to_remove = []
-    for i, game in enumerate(games):
-        if game["court_id"] == court_id:
-            games_to_remove.append(i)
-    
-    # 뒤에서부터 삭제 (인덱스 문제 방지)
-    for i in sorted(games_to_remove, reverse=True):
-        games.pop(i)
-    
-    # 데이터베이스에 변경사항 저장    
-    save_db()
-        
-    return jsonify({"message": "코트가 성공적으로 삭제되었습니다."})
+    return run_handler(handle_delete_court, court_id)
 
 # 팀 API
+def handle_get_teams(args):
+    try:
+        limit, after, stream = parse_page_args(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return Listing(islice(store.snapshot.teams.iter_from(after), limit), limit, stream)
+
 @app.route('/api/teams', methods=['GET'])
+@conditional('teams')
 def get_teams():
-    return jsonify(teams)
+    return run_handler(handle_get_teams, request.args)
+
+def handle_get_team(team_id):
+    team = store.snapshot.teams.get(team_id)
+    if not team:
+        return {"error": "팀을 찾을 수 없습니다."}, 404
+    return team, 200
 
 @app.route('/api/teams/<int:team_id>', methods=['GET'])
+@conditional('teams')
 def get_team(team_id):
-    team = find_by_id(teams, team_id)
-    if not team:
-        return jsonify({"error": "팀을 찾을 수 없습니다."}), 404
-    return jsonify(team)
+    return run_handler(handle_get_team, team_id)
 
-@app.route('/api/teams', methods=['POST'])
-def create_team():
-    data = request.get_json()
+def handle_create_team(user_id, data):
     name = data.get('name')
     description = data.get('description', '')
     member_ids = data.get('member_ids', [])
-    
+    # 팀을 만든 사용자는 항상 멤버
+    if user_id not in member_ids:
+        member_ids = [user_id] + member_ids
+
     if not name:
-        return jsonify({"error": "팀 이름은 필수 항목입니다."}), 400
-        
-    # 팀 이름 중복 확인
-    if any(team["name"] == name for team in teams):
-        return jsonify({"error": "이미 사용 중인 팀 이름입니다."}), 400
-    
-    new_team = {
-        "id": get_next_id(teams),
-        "name": name,
-        "description": description,
-        "member_ids": member_ids
-    }
-    teams.append(new_team)
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
-    return jsonify(new_team), 201
+        return {"error": "팀 이름은 필수 항목입니다."}, 400
+    try:
+        region = matchmaking.parse_region(data.get('region'))
+        availability = matchmaking.parse_availability(data.get('availability'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    # 팀 이름 중복은 고유 인덱스에서 확인
+    try:
+        with store.write(wait=False) as tx:
+            new_team = tx.teams.insert({
+                "name": name,
+                "description": description,
+                "member_ids": member_ids,
+                "rating": matchmaking.DEFAULT_RATING,
+                "rated_games": 0,
+                "region": region,
+                "availability": availability
+            })
+    except DuplicateKeyError:
+        return {"error": "이미 사용 중인 팀 이름입니다."}, 400
+
+    return Committed(tx, (new_team, 201))
+
+@app.route('/api/teams', methods=['POST'])
+@login_required
+def create_team():
+    return run_handler(handle_create_team, g.user_id, request.get_json())
+
+def handle_update_team(user_id, team_id, data):
+    try:
+        with store.write(wait=False) as tx:
+            team = tx.snapshot.teams.get(team_id)
+            if not team:
+                return {"error": "팀을 찾을 수 없습니다."}, 404
+            if user_id not in team.get("member_ids", []):
+                return {"error": "팀 멤버만 팀 정보를 수정할 수 있습니다."}, 403
+
+            changes = {
+                "name": data.get('name', team["name"]),
+                "description": data.get('description', team.get("description", ''))
+            }
+            if 'member_ids' in data:
+                changes["member_ids"] = data["member_ids"]
+            try:
+                if 'region' in data:
+                    changes["region"] = matchmaking.parse_region(data["region"])
+                if 'availability' in data:
+                    changes["availability"] = matchmaking.parse_availability(data["availability"])
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            # 이름 변경 시 중복은 고유 인덱스에서 확인
+            team = tx.teams.update(team_id, changes)
+    except DuplicateKeyError:
+        return {"error": "이미 사용 중인 팀 이름입니다."}, 400
+
+    return Committed(tx, (team, 200))
 
 @app.route('/api/teams/<int:team_id>', methods=['PUT'])
+@login_required
 def update_team(team_id):
-    team = find_by_id(teams, team_id)
-    if not team:
-        return jsonify({"error": "팀을 찾을 수 없습니다."}), 404
-        
-    data = request.get_json()
-    new_name = data.get('name', team["name"])
-    
-    # 이름 변경 시 중복 확인
-    if new_name != team["name"] and any(t["name"] == new_name and t["id"] != team_id for t in teams):
-        return jsonify({"error": "이미 사용 중인 팀 이름입니다."}), 400
-        
-    team["name"] = new_name
-    team["description"] = data.get('description', team.get("description", ''))
-    if 'member_ids' in data:
-        team["member_ids"] = data["member_ids"]
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
-    return jsonify(team)
+    return run_handler(handle_update_team, g.user_id, team_id, request.get_json())
+
+def handle_delete_team(user_id, team_id):
+    # 팀과 연관된 게임은 한 번에 삭제되어 읽는 쪽에서 중간 상태가 보이지 않음
+    with store.write(wait=False) as tx:
+        team = tx.snapshot.teams.get(team_id)
+        if not team:
+            return {"error": "팀을 찾을 수 없습니다."}, 404
+        if user_id not in team.get("member_ids", []):
+            return {"error": "팀 멤버만 팀을 삭제할 수 있습니다."}, 403
+        tx.teams.remove(team_id)
+
+        # 연관된 게임 데이터 처리 (역참조 인덱스로 이 팀의 게임만 찾음). 상대 팀 레이팅은 되돌림
+        for game_id in tx.snapshot.games.ids_referencing('team_id', team_id):
+            remove_game(tx, game_id)
+
+    return Committed(tx, ({"message": "팀이 성공적으로 삭제되었습니다."}, 200))
 
 @app.route('/api/teams/<int:team_id>', methods=['DELETE'])
+@login_required
 def delete_team(team_id):
-    team = remove_by_id(teams, team_id)
-    if not team:
-        return jsonify({"error": "팀을 찾을 수 없습니다."}), 404
-    
-    # 연관된 게임 데이터 처리
-    games_to_remove = []
-    for i, game in enumerate(games):
-        if game["home_team_id"] == team_id or game["away_team_id"] == team_id:
-            games_to_remove.append(i)
-    
-    for i in sorted(games_to_remove, reverse=True):
-        games.pop(i)
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-        
-    return jsonify({"message": "팀이 성공적으로 삭제되었습니다."})
+    return run_handler(handle_delete_team, g.user_id, team_id)
+
+# 팀의 추천 상대 (실력/지역/시간 점수순). limit: 기본 10, 최대 100
+def handle_team_matches(team_id, args):
+    if match_engine is None:
+        return {"error": matchmaking.UNAVAILABLE}, 503
+    try:
+        limit = matchmaking.parse_limit(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    matches = find_matches(store.snapshot, team_id, limit)
+    if matches is None:
+        return {"error": "팀을 찾을 수 없습니다."}, 404
+    return {"team_id": team_id, "matches": matches}, 200
+
+@app.route('/api/teams/<int:team_id>/matches', methods=['GET'])
+@conditional('teams')
+def get_team_matches(team_id):
+    return run_handler(handle_team_matches, team_id, request.args)
 
 # 게임 API
+def handle_get_games(args):
+    try:
+        limit, after, stream = parse_page_args(args)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    # 필터 조건 (모두 선택): court_id, host_id, team_id, status, from/to (ISO 날짜/시간, from <= date_time < to)
+    filters = {
+        "court_id": args.get('court_id', type=int),
+        "host_id": args.get('host_id', type=int),
+        "team_id": args.get('team_id', type=int),
+        "status": args.get('status'),
+        "date_from": args.get('from'),
+        "date_to": args.get('to')
+    }
+    # 목록 전체(스트리밍 포함)를 하나의 스냅샷에서 읽음
+    db = store.snapshot
+    if any(value is not None for value in filters.values()):
+        try:
+            matched_ids = db.games.find_ids(**filters)
+        except ValueError:
+            return {"error": "잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요."}, 400
+        if after is not None:
+            matched_ids = matched_ids[bisect.bisect_right(matched_ids, after):]
+    else:
+        # 필터가 없으면 id 목록을 만들지 않고 차례로 읽음
+        matched_ids = db.games.iter_ids(after)
+
+    # 연결된 데이터를 포함한 뷰는 캐시에서 가져옴
+    views = (game_views.get(game_id, db) for game_id in matched_ids)
+    return Listing(islice(views, limit), limit, stream)
+
 @app.route('/api/games', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
 def get_games():
+    return run_handler(handle_get_games, request.args)
+
+def handle_get_game(game_id):
     # 연결된 데이터도 포함하여 반환
-    result = []
-    for game in games:
-        game_data = dict(game)  # 복사본 생성
-        
-        # 코트 정보 추가
-        court = find_by_id(courts, game["court_id"])
-        if court:
-            game_data["court"] = court
-            
-        # 홈팀, 어웨이팀 정보 추가
-        home_team = find_by_id(teams, game["home_team_id"])
-        away_team = find_by_id(teams, game["away_team_id"])
-        if home_team:
-            game_data["home_team"] = home_team
-        if away_team:
-            game_data["away_team"] = away_team
-            
-        # 호스트 정보 추가
-        host = find_by_id(users, game["host_id"])
-        if host:
-            # 비밀번호 제외
-            host_info = {k: v for k, v in host.items() if k != 'password'}
-            game_data["host"] = host_info
-            
-        result.append(game_data)
-    
-    return jsonify(result)
+    game_data = game_views.get(game_id, store.snapshot)
+    if not game_data:
+        return {"error": "게임을 찾을 수 없습니다."}, 404
+
+    return game_data, 200
 
 @app.route('/api/games/<int:game_id>', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
 def get_game(game_id):
-    game = find_by_id(games, game_id)
-    if not game:
-        return jsonify({"error": "게임을 찾을 수 없습니다."}), 404
-        
-    # 연결된 데이터도 포함하여 반환
-    game_data = dict(game)  # 복사본 생성
-    
-    # 코트 정보 추가
-    court = find_by_id(courts, game["court_id"])
-    if court:
-        game_data["court"] = court
-        
-    # 홈팀, 어웨이팀 정보 추가
-    home_team = find_by_id(teams, game["home_team_id"])
-    away_team = find_by_id(teams, game["away_team_id"])
-    if home_team:
-        game_data["home_team"] = home_team
-    if away_team:
-        game_data["away_team"] = away_team
-        
-    # 호스트 정보 추가
-    host = find_by_id(users, game["host_id"])
-    if host:
-        # 비밀번호 제외
-        host_info = {k: v for k, v in host.items() if k != 'password'}
-        game_data["host"] = host_info
-    
-    return jsonify(game_data)
+    return run_handler(handle_get_game, game_id)
 
-@app.route('/api/games', methods=['POST'])
-def create_game():
-    data = request.get_json()
+# 호스트는 로그인한 사용자 (본문의 host_id는 사용하지 않음)
+def handle_create_game(user_id, data):
     date_time = data.get('date_time')
     court_id = data.get('court_id')
-    host_id = data.get('host_id')
     home_team_id = data.get('home_team_id')
     away_team_id = data.get('away_team_id')
     status = data.get('status', 'SCHEDULED')
-    
-    if not date_time or not court_id or not host_id:
-        return jsonify({"error": "날짜/시간, 코트 ID, 호스트 ID는 필수입니다."}), 400
-        
-    # 참조 ID 유효성 검사
-    if not find_by_id(courts, court_id):
-        return jsonify({"error": f"코트 ID {court_id}를 찾을 수 없습니다."}), 404
-    if not find_by_id(users, host_id):
-        return jsonify({"error": f"사용자 ID {host_id}를 찾을 수 없습니다."}), 404
-    if home_team_id and not find_by_id(teams, home_team_id):
-        return jsonify({"error": f"홈 팀 ID {home_team_id}를 찾을 수 없습니다."}), 404
-    if away_team_id and not find_by_id(teams, away_team_id):
-        return jsonify({"error": f"어웨이 팀 ID {away_team_id}를 찾을 수 없습니다."}), 404
-    if home_team_id and away_team_id and home_team_id == away_team_id:
-        return jsonify({"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}), 400
-    
-    new_game = {
-        "id": get_next_id(games),
-        "date_time": date_time,
-        "court_id": court_id,
-        "host_id": host_id,
-        "home_team_id": home_team_id,
-        "away_team_id": away_team_id,
-        "status": status
-    }
-    games.append(new_game)
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
+
+    if not date_time or not court_id:
+        return {"error": "날짜/시간, 코트 ID는 필수입니다."}, 400
+    try:
+        duration = schedule.parse_duration(data.get('duration_minutes'))
+        home_score = matchmaking.parse_score(data.get('home_score'))
+        away_score = matchmaking.parse_score(data.get('away_score'))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    with store.write(wait=False) as tx:
+        db = tx.snapshot
+        # 참조 ID 유효성 검사
+        if not db.courts.get(court_id):
+            return {"error": f"코트 ID {court_id}를 찾을 수 없습니다."}, 404
+        if home_team_id and not db.teams.get(home_team_id):
+            return {"error": f"홈 팀 ID {home_team_id}를 찾을 수 없습니다."}, 404
+        if away_team_id and not db.teams.get(away_team_id):
+            return {"error": f"어웨이 팀 ID {away_team_id}를 찾을 수 없습니다."}, 404
+        if home_team_id and away_team_id and home_team_id == away_team_id:
+            return {"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}, 400
+
+        fields = {
+            "date_time": date_time,
+            "court_id": court_id,
+            "host_id": user_id,
+            "home_team_id": home_team_id,
+            "away_team_id": away_team_id,
+            "status": status,
+            "duration_minutes": duration,
+            "home_score": home_score,
+            "away_score": away_score
+        }
+        # 같은 코트의 예약과 겹치면 거부 (쓰기 잠금 안에서 검사하므로 동시 요청도 한쪽만 성공)
+        conflicts = court_conflicts(db.games, fields)
+        if conflicts:
+            return schedule.conflict_error(conflicts), 409
+        # 완료된 게임으로 등록하면 결과를 두 팀 레이팅에 반영
+        fields["rating_change"] = rate_game(tx, fields)
+        new_game = tx.games.insert(fields)
+
     # 연결된 데이터도 포함하여 반환
-    game_data = dict(new_game)
-    
-    # 코트 정보 추가
-    court = find_by_id(courts, court_id)
-    if court:
-        game_data["court"] = court
-        
-    # 홈팀, 어웨이팀 정보 추가
-    home_team = find_by_id(teams, home_team_id) if home_team_id else None
-    away_team = find_by_id(teams, away_team_id) if away_team_id else None
-    if home_team:
-        game_data["home_team"] = home_team
-    if away_team:
-        game_data["away_team"] = away_team
-        
-    # 호스트 정보 추가
-    host = find_by_id(users, host_id)
-    if host:
-        # 비밀번호 제외
-        host_info = {k: v for k, v in host.items() if k != 'password'}
-        game_data["host"] = host_info
-    
-    return jsonify(game_data), 201
+    return Committed(tx, (game_views.get(new_game["id"], tx.result), 201))
+
+@app.route('/api/games', methods=['POST'])
+@login_required
+def create_game():
+    return run_handler(handle_create_game, g.user_id, request.get_json())
+
+# 게임 일괄 등록 (시즌 일정 가져오기). rows는 요청 본문에서 읽은 행 목록 (game_import.parse_request), 호스트는 로그인한 사용자
+# JSON 배열 또는 CSV(열: date_time, court_id, home_team_id, away_team_id, status, duration_minutes, home_score, away_score)
+# 모든 행을 검증한 뒤 오류가 없을 때만 한 번의 쓰기(변경 로그 한 줄)로 추가
+# 기존 게임이나 같은 요청의 다른 행과 코트 예약이 겹치면 아무것도 추가하지 않음 (409)
+# 완료된 게임의 결과는 시각 순으로 레이팅에 반영
+def handle_import_games(user_id, rows):
+    try:
+        with store.write(wait=False) as tx:
+            db = tx.snapshot
+            games, errors = game_import.validate_rows(rows, lambda name, ids: {id for id in ids if id in getattr(db, name)})
+            if errors:
+                return {"error": "잘못된 행이 있어 게임을 추가하지 않았습니다.", "errors": errors}, 400
+            records = [{
+                "date_time": game["date_time"].isoformat(),
+                "court_id": game["court_id"],
+                "host_id": user_id,
+                "home_team_id": game["home_team_id"],
+                "away_team_id": game["away_team_id"],
+                "status": game["status"],
+                "duration_minutes": game["duration_minutes"],
+                "home_score": game["home_score"],
+                "away_score": game["away_score"]
+            } for game in games]
+            rate_imported(tx, games, records)
+            new_ids = [tx.games.insert(record)["id"] for record in records]
+            # 예외로 빠져나가면 트랜잭션이 게시되지 않음
+            conflicts = game_import.find_conflicts(games, new_ids, tx.games.busy)
+            if conflicts:
+                raise schedule.ScheduleConflict(conflicts)
+    except schedule.ScheduleConflict as e:
+        return {"error": str(e), "errors": e.errors}, 409
+
+    return Committed(tx, ({"created": len(games)}, 201))
+
+@app.route('/api/games/bulk', methods=['POST'])
+@login_required
+def import_games():
+    try:
+        rows = game_import.parse_request(request)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return run_handler(handle_import_games, g.user_id, rows)
+
+def handle_update_game(user_id, game_id, data):
+    with store.write(wait=False) as tx:
+        db = tx.snapshot
+        game = db.games.get(game_id)
+        if not game:
+            return {"error": "게임을 찾을 수 없습니다."}, 404
+        if game["host_id"] != user_id:
+            return {"error": "게임 호스트만 게임 정보를 수정할 수 있습니다."}, 403
+
+        # game은 복사본이므로 아래에서 값을 바꾸고 검증이 모두 끝난 뒤 한 번에 반영
+        old_game = dict(game)
+        # 필드 업데이트
+        if 'date_time' in data:
+            game["date_time"] = data["date_time"]
+        if 'status' in data:
+            game["status"] = data["status"]
+        if 'duration_minutes' in data:
+            try:
+                game["duration_minutes"] = schedule.parse_duration(data["duration_minutes"])
+            except ValueError as e:
+                return {"error": str(e)}, 400
+        for field in ('home_score', 'away_score'):
+            if field in data:
+                try:
+                    game[field] = matchmaking.parse_score(data[field])
+                except ValueError as e:
+                    return {"error": str(e)}, 400
+
+        # court_id 변경 시 유효성 검사
+        if 'court_id' in data:
+            court_id = data["court_id"]
+            if not db.courts.get(court_id):
+                return {"error": f"코트 ID {court_id}를 찾을 수 없습니다."}, 404
+            game["court_id"] = court_id
+
+        # host_id 변경 시 유효성 검사 (호스트가 다른 사용자에게 넘길 수 있음)
+        if 'host_id' in data:
+            host_id = data["host_id"]
+            if not db.users.get(host_id):
+                return {"error": f"사용자 ID {host_id}를 찾을 수 없습니다."}, 404
+            game["host_id"] = host_id
+
+        # 팀 ID 변경 시 유효성 검사
+        new_home_team_id = data.get('home_team_id', game["home_team_id"])
+        new_away_team_id = data.get('away_team_id', game["away_team_id"])
+
+        if new_home_team_id != game["home_team_id"]:
+            if not db.teams.get(new_home_team_id):
+                return {"error": f"홈 팀 ID {new_home_team_id}를 찾을 수 없습니다."}, 404
+
+        if new_away_team_id != game["away_team_id"]:
+            if not db.teams.get(new_away_team_id):
+                return {"error": f"어웨이 팀 ID {new_away_team_id}를 찾을 수 없습니다."}, 404
+
+        if new_home_team_id and new_away_team_id and new_home_team_id == new_away_team_id:
+            return {"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}, 400
+
+        game["home_team_id"] = new_home_team_id
+        game["away_team_id"] = new_away_team_id
+
+        # 시간, 코트, 길이, 상태가 바뀌면 같은 코트의 다른 예약과 겹치는지 검사
+        if any(field in data for field in schedule.SCHEDULE_FIELDS):
+            conflicts = court_conflicts(db.games, game, exclude=game_id)
+            if conflicts:
+                return schedule.conflict_error(conflicts), 409
+        # 결과(상태, 팀, 점수)가 바뀌었으면 이전 결과의 레이팅 변화를 되돌리고 새 결과로 반영
+        if game_result(game) != game_result(old_game):
+            unrate_game(tx, old_game)
+            game["rating_change"] = rate_game(tx, game)
+        tx.games.update(game_id, game)
+
+    # 연결된 데이터도 포함하여 반환
+    return Committed(tx, (game_views.get(game_id, tx.result), 200))
 
 @app.route('/api/games/<int:game_id>', methods=['PUT'])
+@login_required
 def update_game(game_id):
-    game = find_by_id(games, game_id)
-    if not game:
-        return jsonify({"error": "게임을 찾을 수 없습니다."}), 404
-        
-    data = request.get_json()
-    
-    # 필드 업데이트
-    if 'date_time' in data:
-        game["date_time"] = data["date_time"]
-    if 'status' in data:
-        game["status"] = data["status"]
-    
-    # court_id 변경 시 유효성 검사
-    if 'court_id' in data:
-        court_id = data["court_id"]
-        if not find_by_id(courts, court_id):
-            return jsonify({"error": f"코트 ID {court_id}를 찾을 수 없습니다."}), 404
-        game["court_id"] = court_id
-    
-    # host_id 변경 시 유효성 검사
-    if 'host_id' in data:
-        host_id = data["host_id"]
-        if not find_by_id(users, host_id):
-            return jsonify({"error": f"사용자 ID {host_id}를 찾을 수 없습니다."}), 404
-        game["host_id"] = host_id
-    
-    # 팀 ID 변경 시 유효성 검사
-    new_home_team_id = data.get('home_team_id', game["home_team_id"])
-    new_away_team_id = data.get('away_team_id', game["away_team_id"])
-    
-    if new_home_team_id != game["home_team_id"]:
-        if not find_by_id(teams, new_home_team_id):
-            return jsonify({"error": f"홈 팀 ID {new_home_team_id}를 찾을 수 없습니다."}), 404
-    
-    if new_away_team_id != game["away_team_id"]:
-        if not find_by_id(teams, new_away_team_id):
-            return jsonify({"error": f"어웨이 팀 ID {new_away_team_id}를 찾을 수 없습니다."}), 404
-    
-    if new_home_team_id and new_away_team_id and new_home_team_id == new_away_team_id:
-        return jsonify({"error": "홈 팀과 어웨이 팀은 같을 수 없습니다."}), 400
-        
-    game["home_team_id"] = new_home_team_id
-    game["away_team_id"] = new_away_team_id
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-    
-    # 연결된 데이터도 포함하여 반환
-    game_data = dict(game)
-    
-    # 코트 정보 추가
-    court = find_by_id(courts, game["court_id"])
-    if court:
-        game_data["court"] = court
-        
-    # 홈팀, 어웨이팀 정보 추가
-    home_team = find_by_id(teams, game["home_team_id"])
-    away_team = find_by_id(teams, game["away_team_id"])
-    if home_team:
-        game_data["home_team"] = home_team
-    if away_team:
-        game_data["away_team"] = away_team
-        
-    # 호스트 정보 추가
-    host = find_by_id(users, game["host_id"])
-    if host:
-        # 비밀번호 제외
-        host_info = {k: v for k, v in host.items() if k != 'password'}
-        game_data["host"] = host_info
-    
-    return jsonify(game_data)
+    return run_handler(handle_update_game, g.user_id, game_id, request.get_json())
+
+def handle_delete_game(user_id, game_id):
+    with store.write(wait=False) as tx:
+        game = tx.snapshot.games.get(game_id)
+        if not game:
+            return {"error": "게임을 찾을 수 없습니다."}, 404
+        if game["host_id"] != user_id:
+            return {"error": "게임 호스트만 게임을 삭제할 수 있습니다."}, 403
+        remove_game(tx, game_id)
+
+    return Committed(tx, ({"message": "게임이 성공적으로 삭제되었습니다."}, 200))
 
 @app.route('/api/games/<int:game_id>', methods=['DELETE'])
+@login_required
 def delete_game(game_id):
-    game = remove_by_id(games, game_id)
-    if not game:
-        return jsonify({"error": "게임을 찾을 수 없습니다."}), 404
-    
-    # 데이터베이스에 변경사항 저장
-    save_db()
-        
-    return jsonify({"message": "게임이 성공적으로 삭제되었습니다."})
+    return run_handler(handle_delete_game, g.user_id, game_id)
 
 if __name__ == '__main__':
     app.run(debug=True, host='127.0.0.1', port=5000) 
\ No newline at end of file
@@ -0,0 +1,181 @@
+from quart import Quart, g, jsonify, render_template, request
+
+import app_simple
+from app_simple import (
+    Committed, Listing, template_dir, static_dir,
+    handle_login, handle_signup, handle_logout, handle_metrics, handle_get_users,
+    handle_get_courts, handle_get_court, handle_court_availability, handle_create_court, handle_update_court, handle_delete_court,
+    handle_get_teams, handle_get_team, handle_create_team, handle_update_team, handle_delete_team, handle_team_matches,
+    handle_get_games, handle_get_game, handle_create_game, handle_import_games, handle_update_game, handle_delete_game
+)
+from flusher import FlushError
+from async_views import json_body, parse_import_request, login_required, conditional, list_response, compress_response
+import json_provider
+
+# app_simple.py의 ASGI 버전 (같은 /api/* 라우트를 async 뷰로 제공)
+# 저장소, 뷰 캐시, 저장 스레드, 토큰, 컬렉션 버전과 라우트의 처리 내용(app_simple.handle_*)은 app_simple 모듈의 것을 그대로 사용한다.
+# 읽기는 잠금 없는 스냅샷이라 그대로 두고, sync 저장 모드에서 fsync를 기다릴 때만 이벤트 루프를 막지 않도록
+# 처리 함수가 store.write(wait=False)로 쓴 트랜잭션을 await saved(tx)로 기다린다.
+# 실행: uvicorn app_simple_async:app --port 5000 (backend 디렉터리에서)
+app = Quart(__name__, template_folder=template_dir, static_folder=static_dir)
+app.config['SECRET_KEY'] = app_simple.app.config['SECRET_KEY']
+app.extensions['token_auth'] = app_simple.app.extensions['token_auth']
+app.extensions['collection_versions'] = app_simple.app.extensions['collection_versions']
+app.extensions['compression'] = app_simple.app.extensions['compression']
+json_provider.install(app)
+app.after_request(compress_response)
+
+
+# 쓰기가 저장될 때까지 대기 (sync 모드에서만 기다림, group/async 모드는 바로 반환)
+async def saved(tx):
+    if tx.after is not None:
+        await tx.after
+
+
+# 요청 처리 함수를 실행하고 쓰기면 저장을 기다린 뒤, 목록 조회면 list_response로 응답 (app_simple.run_handler와 같음)
+async def run_handler(handler, *args):
+    result = handler(*args)
+    if isinstance(result, Committed):
+        await saved(result.tx)
+        result = result.response
+    if isinstance(result, Listing):
+        return list_response(*result)
+    return result
+
+
+# sync 모드에서 변경을 디스크에 기록하지 못함 (app_simple.flush_failed와 같음)
+@app.errorhandler(FlushError)
+async def flush_failed(e):
+    return jsonify({"error": str(e)}), 500
+
+
+# 기본 라우트
+@app.route('/')
+async def hello_world():
+    return await render_template('index.html')
+
+# 사용자 API
+@app.route('/api/auth/login', methods=['POST'])
+async def login():
+    return await run_handler(handle_login, await json_body(), app.extensions['token_auth'])
+
+@app.route('/api/auth/signup', methods=['POST'])
+async def signup():
+    return await run_handler(handle_signup, await json_body())
+
+# 현재 토큰 폐기
+@app.route('/api/auth/logout', methods=['POST'])
+@login_required
+async def logout():
+    return await run_handler(handle_logout, app.extensions['token_auth'], g.token_claims)
+
+# 운영 지표
+@app.route('/api/metrics', methods=['GET'])
+async def get_metrics():
+    return await run_handler(handle_metrics, app.extensions)
+
+@app.route('/api/users', methods=['GET'])
+@conditional('users')
+async def get_users():
+    return await run_handler(handle_get_users, request.args)
+
+# 코트 API
+@app.route('/api/courts', methods=['GET'])
+@conditional('courts')
+async def get_courts():
+    return await run_handler(handle_get_courts, request.args)
+
+@app.route('/api/courts/<int:court_id>', methods=['GET'])
+@conditional('courts')
+async def get_court(court_id):
+    return await run_handler(handle_get_court, court_id)
+
+@app.route('/api/courts/<int:court_id>/availability', methods=['GET'])
+@conditional('courts', 'games')
+async def get_court_availability(court_id):
+    return await run_handler(handle_court_availability, court_id, request.args)
+
+@app.route('/api/courts', methods=['POST'])
+@login_required
+async def create_court():
+    return await run_handler(handle_create_court, await json_body())
+
+@app.route('/api/courts/<int:court_id>', methods=['PUT'])
+@login_required
+async def update_court(court_id):
+    return await run_handler(handle_update_court, court_id, await json_body())
+
+@app.route('/api/courts/<int:court_id>', methods=['DELETE'])
+@login_required
+async def delete_court(court_id):
+    return await run_handler(handle_delete_court, court_id)
+
+# 팀 API
+@app.route('/api/teams', methods=['GET'])
+@conditional('teams')
+async def get_teams():
+    return await run_handler(handle_get_teams, request.args)
+
+@app.route('/api/teams/<int:team_id>', methods=['GET'])
+@conditional('teams')
+async def get_team(team_id):
+    return await run_handler(handle_get_team, team_id)
+
+@app.route('/api/teams', methods=['POST'])
+@login_required
+async def create_team():
+    return await run_handler(handle_create_team, g.user_id, await json_body())
+
+@app.route('/api/teams/<int:team_id>', methods=['PUT'])
+@login_required
+async def update_team(team_id):
+    return await run_handler(handle_update_team, g.user_id, team_id, await json_body())
+
+@app.route('/api/teams/<int:team_id>', methods=['DELETE'])
+@login_required
+async def delete_team(team_id):
+    return await run_handler(handle_delete_team, g.user_id, team_id)
+
+@app.route('/api/teams/<int:team_id>/matches', methods=['GET'])
+@conditional('teams')
+async def get_team_matches(team_id):
+    return await run_handler(handle_team_matches, team_id, request.args)
+
+# 게임 API
+@app.route('/api/games', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
+async def get_games():
+    return await run_handler(handle_get_games, request.args)
+
+@app.route('/api/games/<int:game_id>', methods=['GET'])
+@conditional('games', 'courts', 'users', 'teams')
+async def get_game(game_id):
+    return await run_handler(handle_get_game, game_id)
+
+@app.route('/api/games', methods=['POST'])
+@login_required
+async def create_game():
+    return await run_handler(handle_create_game, g.user_id, await json_body())
+
+# 게임 일괄 등록 (app_simple.import_games와 같은 형식)
+@app.route('/api/games/bulk', methods=['POST'])
+@login_required
+async def import_games():
+    try:
+        rows = await parse_import_request()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return await run_handler(handle_import_games, g.user_id, rows)
+
+@app.route('/api/games/<int:game_id>', methods=['PUT'])
+@login_required
+async def update_game(game_id):
+    return await run_handler(handle_update_game, g.user_id, game_id, await json_body())
+
+@app.route('/api/games/<int:game_id>', methods=['DELETE'])
+@login_required
+async def delete_game(game_id):
+    return await run_handler(handle_delete_game, g.user_id, game_id)
+
+if __name__ == '__main__':
+    app.run(debug=True, host='127.0.0.1', port=5000)
@@ -0,0 +1,131 @@
+from functools import wraps
+
+from quart import Response, abort, current_app, g, jsonify, request
+from quart.wrappers.response import DataBody
+
+import collection_versions
+import compression
+import game_import
+import response_cache
+from auth_tokens import TokenError
+
+# ASGI 서버(app_async.py, app_simple_async.py)에서 쓰는 Quart용 라우트 도우미
+# 각각 auth_tokens.login_required, collection_versions.conditional, response_cache.cached,
+# pagination.list_response, game_import.parse_request, compression.compress_response와 같은 동작을 하며 뷰 함수는 async def여야 함
+
+
+# 요청 본문 JSON (Flask의 request.get_json()처럼 JSON이 아니면 415, 잘못된 JSON이면 400)
+async def json_body():
+    if not request.is_json:
+        abort(415, "Did not attempt to load JSON data because the request Content-Type was not 'application/json'.")
+    return await request.get_json()
+
+
+# 시즌 일정 가져오기 요청 본문 -> 행 dict 목록 (형식이 잘못되면 ValueError)
+async def parse_import_request():
+    if request.is_json:
+        return game_import.parse_body('json', await request.get_json(silent=True))
+    files = await request.files
+    if 'file' in files:
+        return game_import.parse_body('csv', files['file'].read())
+    if request.mimetype == 'text/csv':
+        return game_import.parse_body('csv', await request.get_data())
+    return game_import.parse_body(None, None)
+
+
+def login_required(view):
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        try:
+            g.token_claims = current_app.extensions['token_auth'].authenticate(request.headers.get('Authorization'))
+        except TokenError as e:
+            return jsonify({"error": str(e)}), 401
+        g.user_id = g.token_claims["sub"]
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+def conditional(*names):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            etag, modified = collection_versions.current_etag(current_app.extensions['collection_versions'], names)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = await current_app.make_response(await view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            return collection_versions.set_validators(response, etag, modified)
+        return wrapper
+    return decorator
+
+
+def cached(*collections):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None or 'stream' in request.args:
+                return await view(*args, **kwargs)
+            key = response_cache.cache_key(request, current_app.extensions['collection_versions'], collections)
+            value = cache.get(key)
+            if value is not None:
+                status, headers, body = value
+                return Response(body, status, headers)
+            response = await current_app.make_response(await view(*args, **kwargs))
+            # Quart 응답은 is_streamed가 없으므로 본문 종류로 스트리밍 여부를 확인
+            if response.status_code == 200 and isinstance(response.response, DataBody):
+                cache.set(key, (200, response_cache.cached_headers(response), await response.get_data()), collections)
+            return response
+        return wrapper
+    return decorator
+
+
+# after_request 훅 (app.after_request(compress_response))
+async def compress_response(response):
+    compressor = current_app.extensions.get('compression')
+    if compressor is None:
+        return response
+    encoding = compressor.negotiate(request.accept_encodings, response, not isinstance(response.response, DataBody))
+    if encoding is not None:
+        data = compressor.compress(await response.get_data(), encoding, compression.memo_key(request, response))
+        if data is not None:
+            response.set_data(data)
+            response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# items: dict를 차례로 내놓는 이터레이터 또는 비동기 이터레이터 (스트리밍일 때만) — 이미 limit만큼 잘려 있어야 함
+def list_response(items, limit=None, stream=None):
+    if stream is None:
+        result = list(items)
+        response = jsonify(result)
+        if limit is not None and len(result) == limit:
+            response.headers['X-Next-Cursor'] = str(result[-1]["id"])
+        return response
+
+    dumps = current_app.json.dumps
+    if not hasattr(items, '__aiter__'):
+        items = _aiter(items)
+
+    async def generate_json():
+        yield '['
+        first = True
+        async for item in items:
+            yield ('' if first else ',') + dumps(item)
+            first = False
+        yield ']\n'
+
+    async def generate_ndjson():
+        async for item in items:
+            yield dumps(item) + '\n'
+
+    if stream == 'ndjson':
+        return Response(generate_ndjson(), mimetype='application/x-ndjson')
+    return Response(generate_json(), mimetype='application/json')
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
@@ -0,0 +1,134 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, g, jsonify, request
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+
+# 토큰이 없거나 서명이 틀렸거나 만료/폐기된 경우 (401로 응답)
+class TokenError(Exception):
+    pass
+
+
+# 서명된 만료 시간 있는 액세스 토큰
+# 토큰 = SECRET_KEY로 서명한 {"sub": 사용자 ID, "jti": 토큰 ID, "exp": 만료 시각}. 검증에 DB 조회가 필요 없음.
+# 한 번 검증한 토큰은 LRU에 풀어 둔 클레임을 재사용하여 서명 검사도 건너뜀.
+# 폐기(로그아웃)는 jti -> 만료 시각 deny-list로 처리하며, 만료된 항목은 지울 수 있으므로 목록이 계속 커지지 않음
+class TokenAuth:
+    def __init__(self, secret_key, max_age=3600, cache_size=4096):
+        self._serializer = URLSafeTimedSerializer(secret_key, salt='access-token')
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # 토큰 -> 클레임
+        self._denied = {}            # jti -> 만료 시각
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def issue(self, user_id):
+        claims = {"sub": user_id, "jti": secrets.token_urlsafe(9), "exp": int(time.time()) + self.max_age}
+        return self._serializer.dumps(claims)
+
+    # 클레임 반환. 유효하지 않으면 TokenError
+    def verify(self, token):
+        with self._lock:
+            claims = self._cache.get(token)
+            if claims is not None:
+                self._cache.move_to_end(token)
+                self._hits += 1
+        if claims is None:
+            try:
+                claims = self._serializer.loads(token, max_age=self.max_age)
+            except SignatureExpired:
+                raise TokenError("토큰이 만료되었습니다. 다시 로그인해주세요.")
+            except BadSignature:
+                raise TokenError("유효하지 않은 토큰입니다.")
+            with self._lock:
+                self._misses += 1
+                self._cache[token] = claims
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        if claims["exp"] <= time.time():
+            with self._lock:
+                self._cache.pop(token, None)
+            raise TokenError("토큰이 만료되었습니다. 다시 로그인해주세요.")
+        if claims["jti"] in self._denied:
+            raise TokenError("로그아웃된 토큰입니다. 다시 로그인해주세요.")
+        return claims
+
+    # Authorization 헤더 값("Bearer <토큰>") -> 클레임. 헤더가 없거나 형식이 다르면 TokenError
+    def authenticate(self, authorization):
+        scheme, _, token = (authorization or '').partition(' ')
+        if scheme.lower() != 'bearer' or not token.strip():
+            raise TokenError("로그인이 필요합니다.")
+        return self.verify(token.strip())
+
+    # 로그인 응답에 붙일 토큰 정보
+    def token_response(self, user_id):
+        return {"access_token": self.issue(user_id), "token_type": 'Bearer', "expires_in": self.max_age}
+
+    def revoke(self, claims):
+        now = time.time()
+        with self._lock:
+            self._denied[claims["jti"]] = claims["exp"]
+            # 이미 만료된 토큰은 서명 검사에서 거부되므로 목록에서 제거
+            for jti in [jti for jti, exp in self._denied.items() if exp <= now]:
+                del self._denied[jti]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "cache_size": self.cache_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "revoked": len(self._denied)
+            }
+
+
+# SECRET_KEY가 설정되지 않았을 때 쓰는 임의의 키 (프로세스마다 다름)
+_PROCESS_SECRET_KEY = secrets.token_hex(32)
+
+
+# config에 SECRET_KEY가 없으면 프로세스별 임의의 키를 넣고 경고 메시지를 반환 (있으면 None)
+# 코드에 적힌 기본 키는 누구나 알 수 있어 토큰을 위조할 수 있으므로 쓰지 않는다.
+def ensure_secret_key(config):
+    if config.get('SECRET_KEY'):
+        return None
+    config['SECRET_KEY'] = _PROCESS_SECRET_KEY
+    return ("SECRET_KEY가 설정되지 않아 임의의 키를 사용합니다. 서버를 다시 시작하면 발급한 토큰과 세션이 모두 무효가 되고 "
+            "다른 프로세스와 토큰을 공유할 수 없으므로 운영 환경에서는 SECRET_KEY 환경 변수를 설정해야 합니다.")
+
+
+# 설정으로 생성. ACCESS_TOKEN_MAX_AGE (초), ACCESS_TOKEN_CACHE_SIZE는 app.config에 없으면 같은 이름의 환경 변수 사용
+def from_config(config):
+    def get(key, default):
+        return config.get(key, os.environ.get(key, default))
+    return TokenAuth(
+        config['SECRET_KEY'],
+        max_age=int(get('ACCESS_TOKEN_MAX_AGE', 3600)),
+        cache_size=int(get('ACCESS_TOKEN_CACHE_SIZE', 4096))
+    )
+
+
+# 로그인 응답에 붙일 토큰 정보
+def token_response(user_id):
+    return current_app.extensions['token_auth'].token_response(user_id)
+
+
+# Authorization: Bearer <토큰> 헤더가 있어야 하는 라우트
+# 검증되면 g.user_id(요청한 사용자 ID)와 g.token_claims를 설정
+def login_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            g.token_claims = current_app.extensions['token_auth'].authenticate(request.headers.get('Authorization'))
+        except TokenError as e:
+            return jsonify({"error": str(e)}), 401
+        g.user_id = g.token_claims["sub"]
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,182 @@
+# WSGI(app.py, gunicorn gthread 또는 werkzeug 스레드 서버) vs ASGI(app_async.py, uvicorn) 부하 테스트
+# 같은 임시 SQLite DB(코트/팀 N개)를 두 서버에 차례로 띄우고, 연결을 유지하는 클라이언트 C개가 정해진 시간 동안
+# 조회(코트 목록, 게임 목록, 팀 상세)와 로그인(프로세스 풀 비밀번호 검증)을 섞어 보내
+# 초당 요청 수와 p50/p99 지연 시간, 오류 수를 비교한다. 응답 캐시는 꺼서(RESPONSE_CACHE=off) DB 조회 비용을 측정한다.
+# 실행: python backend/benchmarks/bench_asgi.py [초] [동시 연결 수] [코트/팀 수]
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND)
+
+LOGIN = json.dumps({"email": "test@example.com", "password": "password123"}).encode()
+
+# 시나리오 이름 -> [(비율, 메서드, 경로, 본문)]
+READS = [
+    (45, 'GET', '/api/courts?limit=50', None),
+    (30, 'GET', '/api/games?limit=20', None),
+    (15, 'GET', '/api/teams/1', None),
+]
+SCENARIOS = [
+    ("조회만", READS),
+    ("조회 90% + 로그인 10%", READS + [(10, 'POST', '/api/auth/login', LOGIN)]),
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def setup(directory, count):
+    from app import create_app, init_db, seed_db, db, Court, Team
+
+    url = 'sqlite:///' + os.path.join(directory, 'asgi.db')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': url})
+    with app.app_context():
+        init_db()
+        seed_db()
+        db.session.add_all([Court(name=f"court {i}", address="서울") for i in range(count)])
+        db.session.add_all([Team(name=f"load team {i}") for i in range(count)])
+        db.session.commit()
+        for engine in db.engines.values():
+            engine.dispose()
+    app.extensions['password_pool'].shutdown()
+    return url
+
+
+def servers(port):
+    address = f'127.0.0.1:{port}'
+    if shutil.which('gunicorn'):
+        wsgi = ("WSGI (gunicorn gthread 1x8)", ['gunicorn', '-b', address, '-w', '1', '-k', 'gthread', '--threads', '8', 'app:create_app()'])
+    else:
+        wsgi = ("WSGI (werkzeug 스레드 서버)", [sys.executable, '-c',
+                f"from app import create_app; create_app().run(host='127.0.0.1', port={port}, threaded=True)"])
+    asgi = ("ASGI (uvicorn, app_async)", ['uvicorn', '--factory', 'app_async:create_app', '--host', '127.0.0.1',
+                                          '--port', str(port), '--log-level', 'warning', '--no-access-log'])
+    return [wsgi, asgi]
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다 (포트 {port})")
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('connection', '').lower() == 'close'
+
+
+# 연결 하나: 끝날 때까지 요청을 하나씩 보내고 (keep-alive) 지연 시간을 기록
+async def client(port, mix, deadline, latencies, errors, rng):
+    weights = [weight for weight, *_ in mix]
+    reader = writer = None
+    while time.monotonic() < deadline:
+        _, method, path, body = rng.choices(mix, weights)[0]
+        request = f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        if body is not None:
+            request += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        request = request.encode() + b'\r\n' + (body or b'')
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            status, close = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError):
+            errors.append('connection')
+            writer = None
+            continue
+        if status >= 400:
+            # 프로세스 풀 대기열이 가득 차서 바로 거절한 503 등은 처리량과 지연 시간에 넣지 않음
+            errors.append(status)
+        else:
+            latencies.append(time.perf_counter() - start)
+        if close:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, mix, seconds, connections):
+    latencies, errors = [], []
+    deadline = time.monotonic() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, mix, deadline, latencies, errors, random.Random(i)) for i in range(connections)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    directory = tempfile.mkdtemp()
+    url = setup(directory, count)
+    env = dict(os.environ, DATABASE_URL=url, RESPONSE_CACHE='off', PASSWORD_POOL_WORKERS='1')
+
+    print(f"코트/팀 {count}개, 동시 연결 {connections}개, {seconds:.0f}초씩 (처리량과 지연 시간은 성공한 응답만 셈)")
+    port = free_port()
+    results = []
+    for name, command in servers(port):
+        log = open(os.path.join(directory, 'server.log'), 'a')
+        process = subprocess.Popen(command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=log)
+        try:
+            wait_ready(port)
+            for scenario, mix in SCENARIOS:
+                asyncio.run(load(port, mix, 1, connections))  # 준비 운동 (연결 풀, 프로세스 풀 시작)
+                results.append((scenario, name, asyncio.run(load(port, mix, seconds, connections))))
+        finally:
+            process.terminate()
+            process.wait()
+            log.close()
+
+    for scenario, _ in SCENARIOS:
+        print(f"  {scenario}")
+        for label, name, (latencies, errors, elapsed) in results:
+            if label != scenario:
+                continue
+            print(f"    {name:<30} {len(latencies) / elapsed:8.1f} req/s  "
+                  f"p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  "
+                  f"실패 {len(errors)}" + (f" {dict(Counter(errors))}" if errors else ''))
+    shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# IndexedCollection 조회/추가/삭제 마이크로 벤치마크와 Store.write 쓰기 트랜잭션 벤치마크
+# 실행: python backend/benchmarks/bench_collection.py [최대 크기]
+# 컬렉션 크기가 1M까지 커져도 연산당 비용이 일정한지 확인한다.
+# 쓰기 트랜잭션은 요청 하나와 같은 경로(트랜잭션 복사본 만들기 -> 수정 -> 새 스냅샷 게시)로
+# 회원가입(users, email 고유 인덱스)과 게임 생성/수정(games, GameTable)을 한 번씩 실행한다.
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from collection import IndexedCollection
+from game_table import GameTable
+from store import Snapshot, Store
+
+OPS = 10000
+# 쓰기 트랜잭션 벤치마크의 트랜잭션 수
+WRITES = 2000
+
+
+def build(size):
+    return IndexedCollection('games', ({"id": i, "court_id": i % 50, "status": "SCHEDULED"} for i in range(1, size + 1)))
+
+
+def bench(size):
+    collection = build(size)
+    ids = [random.randint(1, size) for _ in range(OPS)]
+
+    lookup = timeit.timeit(lambda: [collection.get(i) for i in ids], number=1) / OPS
+    insert = timeit.timeit(lambda: [collection.insert({"court_id": 1, "status": "SCHEDULED"}) for _ in range(OPS)], number=1) / OPS
+    delete = timeit.timeit(lambda: [collection.remove(i) for i in ids], number=1) / OPS
+    return lookup, insert, delete
+
+
+def build_store(size):
+    users = IndexedCollection('users', ({"id": i, "email": f"user{i}@example.com", "name": f"user {i}", "password": "x"}
+                                        for i in range(1, size + 1)), unique=('email',))
+    games = GameTable('games', ({"id": i, "date_time": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:00:00",
+                                 "court_id": i % 50 + 1, "host_id": i % 1000 + 1, "status": "SCHEDULED"}
+                                for i in range(1, size + 1)))
+    return Store(Snapshot(1, users=users, courts=IndexedCollection('courts'), teams=IndexedCollection('teams'), games=games))
+
+
+def bench_store(size):
+    store = build_store(size)
+    ids = [random.randint(1, size) for _ in range(WRITES)]
+
+    def signup(i):
+        with store.write() as tx:
+            if tx.snapshot.users.get_by('email', f"new{i}@example.com") is None:
+                tx.users.insert({"email": f"new{i}@example.com", "name": "new", "password": "x"})
+
+    def create_game(i):
+        with store.write() as tx:
+            tx.games.insert({"date_time": "2025-01-01T10:00:00", "court_id": i % 50 + 1, "host_id": 1, "status": "SCHEDULED"})
+
+    def update_game(i):
+        with store.write() as tx:
+            tx.games.update(ids[i], {"status": "CANCELLED"})
+
+    return [timeit.timeit(lambda: [write(i) for i in range(WRITES)], number=1) / WRITES
+            for write in (signup, create_game, update_game)]
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"{'size':>10} {'get (ns)':>10} {'insert (ns)':>12} {'remove (ns)':>12}")
+    size = 1000
+    while size <= max_size:
+        lookup, insert, delete = bench(size)
+        print(f"{size:>10} {lookup * 1e9:>10.0f} {insert * 1e9:>12.0f} {delete * 1e9:>12.0f}")
+        size *= 10
+
+    print()
+    print("Store.write 트랜잭션 1회")
+    print(f"{'size':>10} {'signup (µs)':>12} {'game insert (µs)':>17} {'game update (µs)':>17}")
+    size = 1000
+    while size <= max_size:
+        signup, create_game, update_game = bench_store(size)
+        print(f"{size:>10} {signup * 1e6:>12.1f} {create_game * 1e6:>17.1f} {update_game * 1e6:>17.1f}")
+        size *= 10
+
+
+if __name__ == '__main__':
+    main()
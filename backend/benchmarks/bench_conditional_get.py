@@ -0,0 +1,56 @@
+# 조건부 GET 벤치마크 (app.py): 전체 응답(200) vs If-None-Match 일치(304)
+# 임시 SQLite 파일에 게임 N개를 만든 뒤 목록/상세 라우트마다 두 경우의 평균 응답 시간과 SQL 문 수를 비교한다.
+# 실행: python backend/benchmarks/bench_conditional_get.py [게임 수] [반복 횟수]
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'conditional.db')
+
+from sqlalchemy import event
+
+from app import create_app, init_db, seed_db, db, Game
+
+PATHS = ['/api/games', '/api/games?limit=100', '/api/games/1', '/api/courts', '/api/teams', '/api/teams/1']
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = create_app()
+    statements = []
+    with app.app_context():
+        init_db()
+        seed_db()
+        start = datetime.datetime(2025, 1, 1)
+        db.session.execute(Game.__table__.insert(), [{
+            "date_time": start + datetime.timedelta(hours=i), "status": 'SCHEDULED',
+            "court_id": i % 2 + 1, "host_id": i % 2 + 1, "home_team_id": 1, "away_team_id": 2
+        } for i in range(count)])
+        db.session.commit()
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    print(f"게임 {count}개, {repeat}회 평균")
+    for path in PATHS:
+        etag = client.get(path).headers['ETag']
+        results = []
+        for headers in ({}, {'If-None-Match': etag}):
+            statements.clear()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                response = client.get(path, headers=headers)
+                response.get_data()
+            results.append(((time.perf_counter() - start) / repeat * 1000, len(statements) // repeat, response.status_code))
+        (full_ms, full_sql, full_status), (cached_ms, cached_sql, cached_status) = results
+        print(f"  {path:<24} {full_status} {full_ms:8.2f} ms (SQL {full_sql})  ->  {cached_status} {cached_ms:6.2f} ms (SQL {cached_sql})")
+
+
+if __name__ == '__main__':
+    main()
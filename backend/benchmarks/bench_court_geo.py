@@ -0,0 +1,147 @@
+# 코트 위치 검색 벤치마크 (near=위도,경도&radius=km, region=지역 코드)
+# 코트 N개(30%는 서울 25개 구, 나머지는 전국)를 만든 뒤
+#   1) JSON 저장소 (IndexedCollection 그룹 인덱스): 격자 칸 색인 vs 모든 코트 거리 계산, 지역 색인 vs 전체 검사
+#      그리고 그룹 인덱스가 있을 때 쓰기 트랜잭션(복사본 만들고 코트 하나 수정) 비용
+#   2) SQLite (grid_cell, region 인덱스): 라우트 전체 시간과 모든 코트를 읽어 거리 계산하는 방식
+# 을 비교하고 결과가 같은지 확인한다.
+# 실행: python backend/benchmarks/bench_court_geo.py [코트 수] [조회 횟수]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'court_geo.db')
+
+import geo
+from collection import IndexedCollection
+from app import create_app, init_db, db, Court
+
+# app_simple.GROUPS와 같은 그룹 인덱스 (app_simple은 불러올 때 db.json을 읽으므로 가져오지 않음)
+GROUPS = {'courts': {
+    'region': lambda court: court.get('region'),
+    'grid_cell': lambda court: geo.cell(court.get('lat'), court.get('lng'))
+}}
+SEOUL = (37.45, 37.70, 126.80, 127.20)
+KOREA = (34.50, 38.50, 126.00, 129.50)
+SEOUL_REGIONS = ['gangnam', 'songpa', 'seocho', 'mapo', 'jongno', 'yongsan', 'seongdong', 'gwanak', 'nowon', 'eunpyeong',
+                 'gangseo', 'yangcheon', 'guro', 'geumcheon', 'yeongdeungpo', 'dongjak', 'gwangjin', 'dongdaemun',
+                 'jungnang', 'seongbuk', 'gangbuk', 'dobong', 'seodaemun', 'jung', 'gangdong']
+RADII = (1, 5, 20)
+LIMIT = 20
+
+
+def make_courts(count):
+    rng = random.Random(1)
+    for i in range(count):
+        if rng.random() < 0.3:
+            south, north, west, east = SEOUL
+            region = rng.choice(SEOUL_REGIONS)
+        else:
+            south, north, west, east = KOREA
+            region = f"area-{rng.randrange(200)}" if rng.random() < 0.9 else None
+        yield {"id": i + 1, "name": f"court {i + 1}", "address": "주소", "description": "",
+               "lat": round(rng.uniform(south, north), 6), "lng": round(rng.uniform(west, east), 6), "region": region}
+
+
+# 검색할 임의 지점 (절반은 서울)
+def make_points(count):
+    rng = random.Random(2)
+    return [(rng.uniform(*SEOUL[:2]), rng.uniform(*SEOUL[2:])) if i % 2 else (rng.uniform(*KOREA[:2]), rng.uniform(*KOREA[2:]))
+            for i in range(count)]
+
+
+def position(court):
+    return court["lat"], court["lng"]
+
+
+def timed(function, args):
+    start = time.perf_counter()
+    results = [function(*arg) for arg in args]
+    return (time.perf_counter() - start) / len(args) * 1000, results
+
+
+def ids(found):
+    return [court["id"] for _, court in found]
+
+
+def bench_collection(records, queries):
+    start = time.perf_counter()
+    courts = IndexedCollection('courts', records, groups=GROUPS['courts'])
+    print(f"JSON 저장소 코트 {len(courts):,}개 (그룹 인덱스 만들기 {(time.perf_counter() - start) * 1000:.0f} ms)")
+    points = make_points(queries)
+
+    def near(lat, lng, radius):
+        candidates = [court for first, last in geo.cell_ranges(lat, lng, radius) for cell in range(first, last + 1)
+                      for court in courts.find_by('grid_cell', cell)]
+        candidates.sort(key=lambda court: court["id"])
+        return ids(geo.within(candidates, lat, lng, radius, position))
+
+    for radius in RADII:
+        index_ms, expected = timed(near, [(lat, lng, radius) for lat, lng in points])
+        scan_ms, actual = timed(lambda lat, lng: ids(geo.within(courts, lat, lng, radius, position)), points[:20])
+        assert expected[:20] == actual
+        found = sum(len(result) for result in expected) / len(expected)
+        print(f"  near radius={radius:>2}km (평균 {found:7.1f}개): 격자 색인 {index_ms:7.2f} ms, 전체 거리 계산 {scan_ms:7.1f} ms"
+              f" ({scan_ms / index_ms:,.0f}배)")
+
+    regions = SEOUL_REGIONS[:10]
+    index_ms, expected = timed(lambda region: [court["id"] for court in courts.find_by('region', region)], [(r,) for r in regions])
+    scan_ms, actual = timed(lambda region: [court["id"] for court in courts if court["region"] == region], [(r,) for r in regions])
+    assert expected == actual
+    print(f"  region (평균 {sum(map(len, expected)) / len(expected):.0f}개): 지역 색인 {index_ms:7.2f} ms, 전체 검사 {scan_ms:7.2f} ms")
+
+    # 쓰기 트랜잭션: 복사본에서 코트 하나를 옮김 (페이지 목록만 복사하고 바뀐 페이지와 칸/지역의 레코드 dict만 복사)
+    plain = IndexedCollection('courts', records)
+    for name, collection in (('그룹 인덱스 없음', plain), ('그룹 인덱스 있음', courts)):
+        start = time.perf_counter()
+        for i in range(100):
+            copy = collection.clone([])
+            copy.update(i * 7 + 1, {"lat": 37.5, "lng": 127.0, "region": 'gangnam'})
+        print(f"  복사본 만들고 코트 위치 변경 1회 ({name}): {(time.perf_counter() - start) * 10:6.2f} ms")
+
+
+def bench_sqlite(records, queries):
+    app = create_app({'RESPONSE_CACHE': 'off'})
+    with app.app_context():
+        init_db()
+        db.session.bulk_insert_mappings(Court, [{**court, "grid_cell": geo.cell(court["lat"], court["lng"])} for court in records])
+        db.session.commit()
+        points = make_points(queries)
+        client = app.test_client()
+
+        def route(lat, lng, radius, limit=LIMIT):
+            response = client.get(f'/api/courts?near={lat},{lng}&radius={radius}&limit={limit}')
+            assert response.status_code == 200
+            return [court["id"] for court in response.get_json()]
+
+        def scan(lat, lng, radius):
+            rows = db.session.execute(db.select(Court.id, Court.lat, Court.lng).order_by(Court.id)).all()
+            return [row.id for _, row in geo.within(rows, lat, lng, radius, lambda row: (row.lat, row.lng))][:LIMIT]
+
+        print(f"SQLite 코트 {len(records):,}개 (응답 캐시 끔, limit={LIMIT})")
+        for radius in RADII:
+            route_ms, expected = timed(route, [(lat, lng, radius) for lat, lng in points])
+            scan_ms, actual = timed(scan, [(lat, lng, radius) for lat, lng in points[:10]])
+            assert expected[:10] == actual
+            print(f"  near radius={radius:>2}km 라우트 {route_ms:7.2f} ms, 모든 코트 읽어 거리 계산 {scan_ms:7.1f} ms"
+                  f" ({scan_ms / route_ms:,.0f}배)")
+
+        regions = [(region,) for region in SEOUL_REGIONS[:10]]
+        route_ms, _ = timed(lambda region: client.get(f'/api/courts?region={region}&limit={LIMIT}'), regions)
+        print(f"  region 라우트 {route_ms:7.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    records = list(make_courts(count))
+    bench_collection(records, queries)
+    bench_sqlite(records, queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# 코트 예약 겹침 검사 / 빈 시간 조회 벤치마크
+# 코트마다 겹치지 않는 일정(게임 길이 60~150분)을 만든 뒤 임의 시간대의 겹침 검사를
+#   1) GameTable 코트 구간 인덱스 (이진 탐색) vs 코트의 모든 게임을 읽어 검사
+#   2) SQLite (court_id, date_time) 인덱스 범위 검색 (app.court_busy) vs 코트의 모든 게임을 읽어 검사
+# 로 비교하고, 결과가 같은지 확인한다. 일주일 빈 시간 조회와 구간 인덱스의 메모리도 출력
+# 실행: python backend/benchmarks/bench_court_schedule.py [JSON 저장소 게임 수] [SQLite 게임 수]
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'schedule.db')
+
+import schedule
+from game_table import GameTable
+from app import create_app, init_db, db, Court, User, Game, court_busy
+
+COURTS = 500
+START = datetime.datetime(2024, 1, 1)
+CHECKS = 2000
+
+
+# 코트마다 3시간 간격으로 시작하는 게임 (길이 60~150분이므로 같은 코트에서 겹치지 않음)
+def make_games(count):
+    rng = random.Random(1)
+    for i in range(count):
+        yield {
+            "id": i + 1,
+            "date_time": (START + datetime.timedelta(hours=3 * (i // COURTS))).isoformat(),
+            "court_id": i % COURTS + 1,
+            "host_id": 1,
+            "status": 'CANCELLED' if i % 10 == 0 else 'SCHEDULED',
+            "duration_minutes": rng.randint(60, 150)
+        }
+
+
+# 겹침 검사할 임의 (코트, 시작, 끝)
+def make_slots(count, span_hours):
+    rng = random.Random(2)
+    return [(rng.randint(1, COURTS), START + datetime.timedelta(minutes=rng.randrange(span_hours * 60)),
+             datetime.timedelta(minutes=rng.choice((60, 90, 120)))) for _ in range(CHECKS)]
+
+
+# 인덱스 없이 코트의 모든 게임을 검사 (같은 결과)
+def scan_conflicts(games, start, end):
+    busy = []
+    for begin, duration, id in games:
+        finish = schedule.game_end(begin, duration)
+        if begin < end and finish > start:
+            busy.append((begin, finish, id))
+    return busy
+
+
+def timed(function, slots):
+    start = time.perf_counter()
+    results = [function(court_id, begin, begin + length) for court_id, begin, length in slots]
+    return (time.perf_counter() - start) / len(slots) * 10 ** 6, results
+
+
+def bench_table(count):
+    tracemalloc.start()
+    table = GameTable('games', make_games(count))
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    index_bytes = sum(sys.getsizeof(column) for columns in table._intervals.values() for column in columns)
+    print(f"JSON 저장소 (GameTable) 게임 {count:,}개, 코트 {COURTS}개")
+    print(f"  구간 인덱스 메모리 {index_bytes / 2 ** 20:.1f} MiB (테이블 전체 {total / 2 ** 20:.1f} MiB)")
+
+    slots = make_slots(CHECKS, 3 * count // COURTS)
+    index_us, expected = timed(table.busy, slots)
+
+    def scan(court_id, start, end):
+        games = [(datetime.datetime.fromisoformat(game["date_time"]), game["duration_minutes"], game["id"])
+                 for game in table.find(court_id=court_id) if game["status"] not in schedule.FREE_STATUSES]
+        return scan_conflicts(games, start, end)
+    scan_us, actual = timed(scan, slots[:100])
+    assert expected[:100] == actual
+    print(f"  겹침 검사 1회: 구간 인덱스 {index_us:8.1f} µs, 코트 전체 검사 {scan_us / 1000:8.1f} ms ({scan_us / index_us:,.0f}배)")
+
+    week = datetime.timedelta(days=7)
+    start = time.perf_counter()
+    for court_id, begin, _ in slots[:200]:
+        schedule.availability(court_id, begin, begin + week, table.busy(court_id, begin, begin + week))
+    print(f"  일주일 빈 시간 조회 1회: {(time.perf_counter() - start) / 200 * 10 ** 6:8.1f} µs")
+
+    # 쓰기 트랜잭션: 복사본에서 게임 하나를 옮김 (구간 배열은 옮긴 코트 것만 복사)
+    start = time.perf_counter()
+    for i in range(200):
+        copy = table.clone([])
+        copy.update(i * 7 + 2, {"date_time": (START + datetime.timedelta(days=3000)).isoformat()})
+    print(f"  복사본 만들고 게임 시간 변경 1회: {(time.perf_counter() - start) / 200 * 1000:8.2f} ms")
+
+
+def bench_sqlite(count):
+    app = create_app()
+    with app.app_context():
+        init_db()
+        db.session.add(User(email='bench@example.com', password_hash='x', name='bench'))
+        db.session.add_all([Court(name=f"court {i}", address="서울") for i in range(COURTS)])
+        db.session.commit()
+        db.session.bulk_insert_mappings(Game, [
+            {**game, "date_time": datetime.datetime.fromisoformat(game["date_time"])} for game in make_games(count)])
+        db.session.commit()
+
+        slots = make_slots(CHECKS, 3 * count // COURTS)
+        index_us, expected = timed(lambda court_id, start, end: court_busy(db.session, court_id, start, end), slots)
+
+        def scan(court_id, start, end):
+            games = db.session.execute(db.select(Game.date_time, Game.duration_minutes, Game.id)
+                                       .where(Game.court_id == court_id, Game.status.not_in(schedule.FREE_STATUSES))
+                                       .order_by(Game.date_time, Game.id))
+            return scan_conflicts(games, start, end)
+        scan_us, actual = timed(scan, slots[:200])
+        assert expected[:200] == actual
+        print(f"SQLite 게임 {count:,}개")
+        print(f"  겹침 검사 1회: 인덱스 범위 검색 {index_us:8.1f} µs, 코트 전체 검사 {scan_us / 1000:8.2f} ms ({scan_us / index_us:,.0f}배)")
+
+
+def main():
+    bench_table(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
+    bench_sqlite(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+
+
+if __name__ == '__main__':
+    main()
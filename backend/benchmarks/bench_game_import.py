@@ -0,0 +1,99 @@
+# 시즌 일정 가져오기 벤치마크 (app.py): POST /api/games/bulk vs POST /api/games 반복
+# 임시 SQLite 파일에 코트/팀을 만든 뒤 게임 N개를 JSON 배열, CSV로 한 번에 등록하는 시간과 실행된 SQL 문 수를 재고,
+# 한 건씩 등록하는 시간(일부만 재서 N개로 환산)과 비교한다. 잘못된 행이 하나라도 있으면 아무것도 추가되지 않는지도 확인
+# 같은 코트의 예약은 겹칠 수 없으므로 등록 방식마다 다른 기간의 일정을 만든다
+# 실행: python backend/benchmarks/bench_game_import.py [게임 수]
+import csv
+import datetime
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'import.db')
+
+from sqlalchemy import event
+
+from app import create_app, init_db, seed_db, db, Court, Team, Game
+
+COURTS = 50
+TEAMS = 300
+SINGLE_SAMPLE = 300
+
+
+# 코트마다 COURTS시간 간격 (기본 게임 길이 2시간보다 김). offset번째 기간의 일정 (시드 게임과 겹치지 않도록 과거 날짜)
+def make_season(count, offset=0):
+    start = datetime.datetime(2001, 3, 1, 9) + datetime.timedelta(hours=count * offset)
+    return [{
+        "date_time": (start + datetime.timedelta(hours=i)).isoformat(),
+        "court_id": i % COURTS + 1,
+        "home_team_id": i % TEAMS + 1,
+        "away_team_id": (i + 1) % TEAMS + 1
+    } for i in range(count)]
+
+
+def to_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=['date_time', 'court_id', 'home_team_id', 'away_team_id', 'status'])
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode('utf-8')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = create_app()
+    statements = []
+    with app.app_context():
+        init_db()
+        seed_db()
+        db.session.add_all([Court(name=f"court {i}", address="서울") for i in range(COURTS)])
+        db.session.add_all([Team(name=f"import team {i}") for i in range(TEAMS)])
+        db.session.commit()
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={"email": "test@example.com", "password": "password123"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    season = make_season(count)
+    csv_season = make_season(count, 1)
+
+    def game_count():
+        with app.app_context():
+            return Game.query.count()
+
+    # 잘못된 행이 있으면 행별 오류만 반환하고 아무것도 추가하지 않아야 함
+    before = game_count()
+    bad = season[:10] + [{"date_time": "내일", "court_id": 10 ** 6, "home_team_id": 1, "away_team_id": 1}]
+    response = client.post('/api/games/bulk', json=bad, headers=headers)
+    assert response.status_code == 400 and response.get_json()["errors"][0]["row"] == 11, response.get_json()
+    assert game_count() == before
+    print(f"  잘못된 행 거부: {response.get_json()['errors']}")
+
+    print(f"게임 {count}개")
+    for label, kwargs in [
+        ("일괄 등록 (JSON)", {"json": season}),
+        ("일괄 등록 (CSV)", {"data": {"file": (io.BytesIO(to_csv(csv_season)), 'season.csv')}, "content_type": 'multipart/form-data'}),
+    ]:
+        statements.clear()
+        start = time.perf_counter()
+        response = client.post('/api/games/bulk', headers=headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 201 and response.get_json()["created"] == count, response.get_json()
+        print(f"  {label:<18} {elapsed * 1000:8.1f} ms  SQL 문 {len(statements)}개")
+
+    statements.clear()
+    start = time.perf_counter()
+    for game in make_season(SINGLE_SAMPLE, 2 * count // SINGLE_SAMPLE + 1):
+        assert client.post('/api/games', json=game, headers=headers).status_code == 201
+    elapsed = time.perf_counter() - start
+    print(f"  {'한 건씩 (환산)':<18} {elapsed / SINGLE_SAMPLE * count * 1000:8.1f} ms  SQL 문 약 {len(statements) * count // SINGLE_SAMPLE}개 ({SINGLE_SAMPLE}건 측정)")
+
+
+if __name__ == '__main__':
+    main()
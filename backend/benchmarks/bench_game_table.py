@@ -0,0 +1,64 @@
+# GameTable(컬럼형) vs dict 목록 메모리/필터 벤치마크
+# 실행: python backend/benchmarks/bench_game_table.py [게임 수]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import game_table
+from game_table import GameTable, from_timestamp
+
+START = 1704067200 * 10 ** 6  # 2024-01-01T00:00:00
+
+
+def make_games(count):
+    for i in range(1, count + 1):
+        yield {
+            "id": i,
+            "date_time": from_timestamp(START + (i % 100000) * 3600 * 10 ** 6),
+            "court_id": i % 500 + 1,
+            "host_id": i % 20000 + 1,
+            "home_team_id": i % 3000 + 1,
+            "away_team_id": (i + 7) % 3000 + 1,
+            "status": game_table.STATUSES[i % 4]
+        }
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    records, dict_bytes = measure(lambda: list(make_games(count)))
+    table, table_bytes = measure(lambda: GameTable('games', make_games(count)))
+    print(f"게임 {count}개")
+    print(f"  dict 목록 : {dict_bytes / count:7.1f} bytes/게임")
+    print(f"  GameTable : {table_bytes / count:7.1f} bytes/게임")
+
+    def dict_filter():
+        return [g for g in records if g["court_id"] == 42 and g["status"] == 'SCHEDULED' and '2024-03-01' <= g["date_time"] < '2024-04-01']
+
+    def table_filter():
+        return table.find(court_id=42, status='SCHEDULED', date_from='2024-03-01', date_to='2024-04-01')
+
+    assert [g["id"] for g in dict_filter()] == [g["id"] for g in table_filter()]
+    print(f"  필터 (court + status + 기간) dict: {timed(dict_filter):.1f} ms, GameTable: {timed(table_filter):.1f} ms"
+          f" ({'numpy' if game_table.numpy is not None else '순수 파이썬'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# JSON 직렬화(표준 json vs orjson)와 응답 압축(gzip/brotli) 벤치마크 (app.py)
+# 임시 SQLite 파일에 게임 N개를 만든 뒤 코트/팀/호스트 정보를 포함한 게임 목록 한 페이지(최대 1000개)에 대해
+#   1) app.json.response 직렬화 시간 (datetime을 그대로 넘김)
+#   2) 압축 방식별 크기와 압축 시간
+#   3) 라우트 전체 응답 시간 (JSON_ENCODER, 압축 조합별)
+# 을 비교하고 /api/metrics의 압축 통계를 출력한다.
+# 실행: python backend/benchmarks/bench_json_compression.py [게임 수] [반복 횟수]
+import datetime
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'json_compression.db')
+
+from app import create_app, init_db, seed_db, db, Game, GAME_FULL, MAX_PAGE_SIZE
+import compression
+import json_provider
+
+PATH = f'/api/games?limit={MAX_PAGE_SIZE}'
+
+
+def setup(count):
+    app = create_app()
+    with app.app_context():
+        init_db()
+        seed_db()
+        start = datetime.datetime(2025, 1, 1, 18, 0)
+        db.session.add_all([
+            Game(date_time=start + datetime.timedelta(hours=i), court_id=1 + i % 2, host_id=1 + i % 2,
+                 home_team_id=1, away_team_id=2)
+            for i in range(count)
+        ])
+        db.session.commit()
+    return app
+
+
+def timed(function, repeat):
+    function()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    app = setup(count)
+    with app.app_context():
+        items = list(GAME_FULL.dump_all(db.session, db.session.scalars(GAME_FULL.select().order_by(Game.id).limit(MAX_PAGE_SIZE))))
+        print(f"게임 {len(items)}개 한 페이지 (코트/팀/호스트 포함), {repeat}회 평균")
+
+        print("  직렬화")
+        providers = [('json', json_provider.StdlibJSONProvider(app))]
+        if json_provider.orjson is not None:
+            providers.append(('orjson', json_provider.OrjsonJSONProvider(app)))
+        for name, provider in providers:
+            ms, response = timed(lambda: provider.response(items), repeat)
+            body = response.get_data()
+            print(f"    {name:<8} {ms:8.2f} ms  {len(body):>9,} 바이트")
+
+    print("  압축")
+    encodings = ['gzip'] + (['br'] if compression.brotli is not None else [])
+    for encoding in encodings:
+        compressor = compression.Compressor([encoding], memo_size=0)
+        ms, data = timed(lambda: compressor.compress(body, encoding), repeat)
+        print(f"    {encoding:<8} {ms:8.2f} ms  {len(data):>9,} 바이트 ({len(data) / len(body):.1%}, {len(body) - len(data):,} 바이트 절약)")
+    ms, data = timed(lambda: gzip.compress(body, 1, mtime=0), repeat)
+    print(f"    {'gzip -1':<8} {ms:8.2f} ms  {len(data):>9,} 바이트 ({len(data) / len(body):.1%})")
+
+    print(f"  라우트 전체 ({PATH})")
+    accept = {'Accept-Encoding': ', '.join(encodings)}
+    for encoder in [name for name, _ in providers]:
+        for compress in ('off', 'on'):
+            route_app = create_app({'JSON_ENCODER': encoder, 'COMPRESS': compress})
+            if route_app.extensions['compression'] is not None:
+                # 같은 본문을 반복해서 받으므로 압축 결과 재사용을 끄고 매번 압축하는 비용을 잼
+                route_app.extensions['compression'].memo_size = 0
+            client = route_app.test_client()
+            ms, response = timed(lambda: client.get(PATH, headers=accept), repeat)
+            assert response.status_code == 200
+            print(f"    JSON_ENCODER={encoder:<7} COMPRESS={compress:<4} {ms:8.2f} ms  {len(response.data):>9,} 바이트"
+                  f"  {response.headers.get('Content-Encoding', '')}")
+    print(f"  통계: {client.get('/api/metrics').get_json()['compression']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# 팀 매칭 벤치마크
+#   1) 팀 N개(레이팅/지역/가능 시간대 임의)로 매칭 색인을 만드는 시간과 색인 메모리
+#   2) 추천 상대 조회 1회 (NumPy로 모든 팀 점수 계산 + 상위 limit개 정렬) 평균/최대 시간
+#   3) 팀마다 점수를 하나씩 계산하는 순수 파이썬 방식과 시간, 결과 비교 (앞쪽 일부 팀)
+#   4) app.py 라우트 전체 (/api/teams/<id>/matches, SQLite, 응답 캐시 끔): 첫 요청(색인 생성)과 이후 요청
+#   5) 팀 레이팅이 바뀐 뒤의 첫 요청 (바뀐 팀만 읽어 색인을 고침)과 팀이 추가된 뒤의 첫 요청 (색인을 다시 만듦)
+# 실행: python backend/benchmarks/bench_matchmaking.py [팀 수] [조회 횟수]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'matchmaking.db')
+
+import matchmaking
+from app import create_app, init_db, db, Team, adjust_ratings
+
+if matchmaking.numpy is None:
+    sys.exit(matchmaking.UNAVAILABLE)
+
+REGIONS = ['gangnam', 'songpa', 'seocho', 'mapo', 'jongno', 'yongsan', 'seongdong', 'gwanak']
+LIMIT = 10
+# 순수 파이썬 방식과 비교할 조회 수
+SCAN_CHECKS = 5
+# 팀을 바꾼 뒤 첫 요청을 재는 횟수
+CHANGES = 20
+
+
+# 팀 (id, 레이팅, 지역, 가능 시간대). 일부는 지역/가능 시간대 없음
+def make_teams(count):
+    rng = random.Random(1)
+    for i in range(count):
+        availability = []
+        for day in rng.sample(range(7), rng.randint(0, 3)):
+            start = rng.randint(6, 21)
+            availability.append({"day": day, "start": f"{start:02d}:{rng.choice((0, 30)):02d}",
+                                 "end": f"{min(start + rng.randint(1, 3), 24):02d}:00"})
+        yield (i + 1, round(rng.gauss(matchmaking.DEFAULT_RATING, 150), 2),
+               rng.choice(REGIONS) if rng.random() < 0.9 else None,
+               matchmaking.parse_availability(availability))
+
+
+# 색인 없이 팀마다 점수를 계산 (같은 결과)
+def scan_matches(teams, team_id, limit):
+    team = next(team for team in teams if team[0] == team_id)
+    hours = lambda mask: bin(int.from_bytes(mask, 'little')).count('1')
+    mine = matchmaking.availability_mask(team[3])
+    results = []
+    for other in teams:
+        if other[0] == team_id:
+            continue
+        skill = 1 - 2 * abs(matchmaking.expected_score(other[1], team[1]) - 0.5)
+        region = matchmaking.NEUTRAL if not team[2] or not other[2] else 1.0 if team[2] == other[2] else 0.0
+        theirs = matchmaking.availability_mask(other[3])
+        time_score = matchmaking.NEUTRAL
+        if hours(mine) and hours(theirs):
+            overlap = hours(bytes(a & b for a, b in zip(mine, theirs)))
+            time_score = overlap / min(hours(mine), hours(theirs))
+        weights = matchmaking.WEIGHTS
+        score = weights["skill"] * skill + weights["region"] * region + weights["time"] * time_score
+        results.append((-score, other[0], skill, region, time_score))
+    results.sort()
+    return [(id, round(-score, 4), round(skill, 4), round(region, 4), round(time_score, 4))
+            for score, id, skill, region, time_score in results[:limit]]
+
+
+def bench_index(teams, queries):
+    start = time.perf_counter()
+    index = matchmaking.MatchIndex(teams)
+    build_ms = (time.perf_counter() - start) * 1000
+    index_bytes = sum(array.nbytes for array in (index.ids, index.ratings, index.regions, index.masks, index.hours))
+    print(f"팀 {len(teams):,}개")
+    print(f"  색인 생성 {build_ms:8.1f} ms, 색인 메모리 {index_bytes / 2 ** 20:.1f} MiB")
+
+    rng = random.Random(2)
+    team_ids = [rng.randint(1, len(teams)) for _ in range(queries)]
+    index.matches(team_ids[0], LIMIT)
+    times = []
+    for team_id in team_ids:
+        start = time.perf_counter()
+        index.matches(team_id, LIMIT)
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"  추천 조회 1회 (limit {LIMIT}): 평균 {sum(times) / len(times):6.2f} ms, 최대 {max(times):6.2f} ms")
+
+    start = time.perf_counter()
+    for team_id in team_ids[:CHANGES]:
+        team = teams[team_id - 1]
+        index.updated([(team_id, team[1] + 10, team[2], team[3])])
+    update_ms = (time.perf_counter() - start) * 1000 / CHANGES
+    print(f"  팀 1개 값 고치기 (MatchIndex.updated) {update_ms:8.2f} ms")
+
+    start = time.perf_counter()
+    for team_id in team_ids[:SCAN_CHECKS]:
+        assert scan_matches(teams, team_id, LIMIT) == index.matches(team_id, LIMIT)
+    scan_ms = (time.perf_counter() - start) * 1000 / SCAN_CHECKS
+    print(f"  팀마다 계산 (순수 파이썬) 1회: {scan_ms:8.1f} ms ({scan_ms / (sum(times) / len(times)):,.0f}배)")
+
+
+def bench_route(teams, queries):
+    app = create_app({'RESPONSE_CACHE': 'off'})
+    with app.app_context():
+        init_db()
+        db.session.bulk_insert_mappings(Team, [
+            {"id": id, "name": f"team {id}", "rating": rating, "region": region, "availability": availability}
+            for id, rating, region, availability in teams])
+        db.session.commit()
+    client = app.test_client()
+    rng = random.Random(3)
+
+    start = time.perf_counter()
+    response = client.get(f'/api/teams/1/matches?limit={LIMIT}')
+    first_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code == 200 and len(response.get_json()['matches']) == LIMIT
+
+    times = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        response = client.get(f'/api/teams/{rng.randint(1, len(teams))}/matches?limit={LIMIT}')
+        times.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    times.sort()
+    print("라우트 전체 (SQLite, 응답 캐시 끔)")
+    print(f"  첫 요청 (팀 읽기 + 색인 생성) {first_ms:8.1f} ms")
+    print(f"  이후 요청: 평균 {sum(times) / len(times):6.2f} ms, p95 {times[int(len(times) * 0.95)]:6.2f} ms,"
+          f" 색인 생성 {app.extensions['matchmaking'].builds}회")
+
+    # 레이팅이 바뀔 때마다 팀 컬렉션 버전이 올라가므로 다음 요청이 색인을 고침
+    engine = app.extensions['matchmaking']
+    updates, builds = engine.updates, engine.builds
+    changed, added = [], []
+    for i in range(CHANGES):
+        with app.app_context():
+            adjust_ratings(db.session, rng.randint(1, len(teams)), rng.randint(1, len(teams)), 8.0, 1)
+            db.session.commit()
+        app.extensions['collection_versions'].bump(['teams'])
+        start = time.perf_counter()
+        response = client.get(f'/api/teams/{rng.randint(1, len(teams))}/matches?limit={LIMIT}')
+        changed.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    assert engine.updates - updates == CHANGES and engine.builds == builds
+    for i in range(3):
+        with app.app_context():
+            db.session.add(Team(name=f"added {i}"))
+            db.session.commit()
+        app.extensions['collection_versions'].bump(['teams'])
+        start = time.perf_counter()
+        response = client.get(f'/api/teams/{rng.randint(1, len(teams))}/matches?limit={LIMIT}')
+        added.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    print(f"  팀 2개 레이팅 변경 후 첫 요청 (바뀐 팀만 읽어 고침): 평균 {sum(changed) / len(changed):6.2f} ms,"
+          f" 최대 {max(changed):6.2f} ms")
+    print(f"  팀 추가 후 첫 요청 (색인 다시 생성): 평균 {sum(added) / len(added):8.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    teams = list(make_teams(count))
+    bench_index(teams, queries)
+    bench_route(teams, queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# 로그인 폭주 중 다른 API 지연 시간 벤치마크 (app.py, 비밀번호 해시 계산 위치별)
+# 설정마다 새 프로세스에서 로그인 스레드가 계속 로그인하는 동안 다른 스레드가 코트 상세를 조회하여
+# 조회 p50/p99 지연 시간과 로그인 처리량, 503(대기열 가득 참) 수를 비교한다.
+# 실행: python backend/benchmarks/bench_password_pool.py [초] [로그인 스레드 수]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# (설명, 환경 변수)
+PROFILES = [
+    ("요청 스레드에서 계산 (기존)", {'PASSWORD_POOL_WORKERS': '0'}),
+    ("프로세스 풀 (작업 2개, 대기 64개)", {'PASSWORD_POOL_WORKERS': '2', 'PASSWORD_POOL_MAX_PENDING': '64'}),
+    ("프로세스 풀 (작업 2개, 대기 4개)", {'PASSWORD_POOL_WORKERS': '2', 'PASSWORD_POOL_MAX_PENDING': '4'}),
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run(seconds, logins):
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from app import create_app, init_db, seed_db
+
+    app = create_app()
+    with app.app_context():
+        init_db()
+        seed_db()
+    # 풀 프로세스 시작 시간은 빼고 잼
+    app.test_client().post('/api/auth/login', json={"email": "test@example.com", "password": "password123"})
+
+    stop = threading.Event()
+    probe_times, codes = [], []
+    lock = threading.Lock()
+
+    def login():
+        client = app.test_client()
+        while not stop.is_set():
+            status = client.post('/api/auth/login', json={"email": "test@example.com", "password": "password123"}).status_code
+            with lock:
+                codes.append(status)
+
+    def probe():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/courts/1').get_data()
+            probe_times.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login) for _ in range(logins)] + [threading.Thread(target=probe)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        "probes": len(probe_times),
+        "p50": percentile(probe_times, 0.5),
+        "p99": percentile(probe_times, 0.99),
+        "ok": codes.count(200),
+        "busy": codes.count(503),
+        "metrics": app.test_client().get('/api/metrics').get_json()["password_pool"]
+    }))
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"{seconds:g}초, 로그인 스레드 {logins}개")
+    for label, overrides in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directory, 'bench.db'), **overrides)
+            output = subprocess.run(
+                [sys.executable, __file__, '--run', str(seconds), str(logins)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+        verify = result["metrics"]["operations"].get("verify", {})
+        print(f"  {label}")
+        print(f"      코트 조회  p50 {result['p50']:7.2f} ms  p99 {result['p99']:7.2f} ms  ({result['probes']}회)")
+        print(f"      로그인 {result['ok'] / seconds:6.1f} 건/s  503 {result['busy']}건  "
+              f"해시 평균 {verify.get('hash_ms_avg', 0):.1f} ms  대기 최대 {verify.get('wait_ms_max', 0):.1f} ms")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run(float(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
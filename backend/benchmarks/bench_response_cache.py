@@ -0,0 +1,98 @@
+# 응답 캐시 벤치마크 (app.py): 코트/팀 조회 라우트의 캐시 없음(RESPONSE_CACHE=off) vs 프로세스 메모리 캐시
+# 임시 SQLite 파일에 코트/팀 N개를 만든 뒤 라우트마다 평균 응답 시간과 SQL 문 수를 비교하고,
+# 생성/수정/삭제를 커밋하면 바뀐 컬렉션에 의존하는 응답만 캐시에서 지워지는지 확인한 뒤 /api/metrics의 캐시 통계를 출력한다.
+# 실행: python backend/benchmarks/bench_response_cache.py [코트/팀 수] [반복 횟수]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'response_cache.db')
+
+from sqlalchemy import event
+
+from app import create_app, init_db, seed_db, db, Court, Team
+
+PATHS = ['/api/courts', '/api/courts?limit=50', '/api/courts/1', '/api/teams', '/api/teams?limit=50', '/api/teams/1']
+
+
+def setup(count):
+    app = create_app()
+    with app.app_context():
+        init_db()
+        seed_db()
+        db.session.add_all([Court(name=f"court {i}", address="서울") for i in range(count)])
+        db.session.add_all([Team(name=f"cache team {i}") for i in range(count)])
+        db.session.commit()
+    return app
+
+
+def measure(app, repeat):
+    statements = []
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+    client = app.test_client()
+    results = {}
+    for path in PATHS:
+        client.get(path)
+        statements.clear()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get(path)
+            assert response.status_code == 200
+        results[path] = ((time.perf_counter() - start) / repeat * 1000, len(statements) // repeat)
+    return results
+
+
+def check_invalidation(app):
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={"email": "test@example.com", "password": "password123"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    cache = app.extensions['response_cache']
+
+    for path in PATHS:
+        client.get(path)
+    entries = cache.stats()["entries"]
+
+    # 코트 수정: 코트 응답과 (코트 정보를 담는) 팀 상세만 지워지고 팀 목록은 남아야 함
+    response = client.put('/api/courts/1', json={"name": "바뀐 코트"}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    assert cache.stats()["entries"] == entries - 4, cache.stats()
+    assert client.get('/api/courts/1').get_json()["name"] == "바뀐 코트"
+    assert any(court["name"] == "바뀐 코트" for court in client.get('/api/courts').get_json())
+
+    # 팀 생성: 새 팀이 목록에 바로 보여야 함
+    created = client.post('/api/teams', json={"name": "새 팀"}, headers=headers).get_json()
+    assert any(team["id"] == created["id"] for team in client.get('/api/teams').get_json())
+
+    # 커밋하지 않은 요청은 캐시를 지우지 않음
+    before = cache.stats()["invalidations"]
+    assert client.put(f"/api/teams/{created['id']}", json={"name": "cache team 0"}, headers=headers).status_code == 400
+    assert cache.stats()["invalidations"] == before
+    print("  커밋한 컬렉션에 의존하는 응답만 무효화됨")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    cached_app = setup(count)
+    off_app = create_app({"RESPONSE_CACHE": 'off'})
+    off = measure(off_app, repeat)
+    on = measure(cached_app, repeat)
+
+    print(f"코트/팀 {count}개, {repeat}회 평균")
+    for path in PATHS:
+        (off_ms, off_sql), (on_ms, on_sql) = off[path], on[path]
+        print(f"  {path:<22} 캐시 없음 {off_ms:8.2f} ms (SQL {off_sql})  ->  캐시 {on_ms:6.2f} ms (SQL {on_sql})")
+
+    check_invalidation(cached_app)
+    print(f"  통계: {cached_app.test_client().get('/api/metrics').get_json()['response_cache']}")
+
+
+if __name__ == '__main__':
+    main()
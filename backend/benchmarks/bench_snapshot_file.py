@@ -0,0 +1,79 @@
+# db.json vs 바이너리 스냅샷(db.snap) 시작 시 로드 시간 벤치마크
+# 실행: python backend/benchmarks/bench_snapshot_file.py [게임 수]
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_game_table import make_games
+from collection import IndexedCollection
+from game_table import GameTable
+from snapshot_file import collections_from_json, read_snapshot, write_snapshot
+
+UNIQUE_FIELDS = {'users': ('email',), 'teams': ('name',)}
+
+
+def make_data(count):
+    return {
+        "users": [{"id": i, "name": f"user {i}", "email": f"user{i}@example.com", "password": "password123"} for i in range(1, count // 10 + 1)],
+        "courts": [{"id": i, "name": f"코트 {i}", "address": "서울시 강남구 테헤란로 123", "description": "최신 시설의 농구 코트입니다."} for i in range(1, 501)],
+        "teams": [{"id": i, "name": f"team {i}", "description": "", "member_ids": [i, i + 1]} for i in range(1, 3001)],
+        "games": list(make_games(count))
+    }
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    next_ids = data.get('next_ids', {})
+    return {
+        name: GameTable(name, data[name], next_ids.get(name)) if name == 'games'
+        else IndexedCollection(name, data[name], next_ids.get(name), unique=UNIQUE_FIELDS.get(name, ()))
+        for name in ('users', 'courts', 'teams', 'games')
+    }
+
+
+def load_binary(path):
+    reader = read_snapshot(path)
+    return {name: reader.collection(name, UNIQUE_FIELDS.get(name, ())) for name in reader.entries}
+
+
+def load_lazy(path):
+    reader = read_snapshot(path)
+    return {name: reader.lazy(name, UNIQUE_FIELDS.get(name, ())) for name in reader.entries}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    data = make_data(count)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'db.json')
+        snap_path = os.path.join(directory, 'db.snap')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_snapshot(snap_path, collections_from_json(data), durable=False)
+
+        print(f"게임 {count}개, 사용자 {len(data['users'])}명")
+        print(f"  파일 크기  db.json: {os.path.getsize(json_path) / 2 ** 20:6.1f} MB, db.snap: {os.path.getsize(snap_path) / 2 ** 20:6.1f} MB")
+        from_json, json_ms = timed(lambda: load_json(json_path))
+        from_binary, binary_ms = timed(lambda: load_binary(snap_path))
+        lazy, lazy_ms = timed(lambda: load_lazy(snap_path))
+        _, first_access_ms = timed(lambda: lazy['games'].get())
+        assert from_json['games'].to_list() == from_binary['games'].to_list()
+        assert from_json['users'].to_list() == from_binary['users'].to_list()
+        print(f"  로드       db.json: {json_ms:8.1f} ms")
+        print(f"             db.snap: {binary_ms:8.1f} ms")
+        print(f"             db.snap 지연 로드: {lazy_ms:8.1f} ms (games 첫 접근 {first_access_ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# 쓰기 부하 중 읽기 지연 시간 벤치마크 (app.py, SQLite 엔진 설정별)
+# 설정마다 임시 DB를 새 프로세스에서 만들고, 쓰기 스레드가 코트를 계속 추가/수정하는 동안
+# 읽기 스레드가 게임 목록과 코트 상세를 조회하여 읽기 p50/p99 지연 시간, 쓰기 처리량, 오류 수를 비교한다.
+# 실행: python backend/benchmarks/bench_sqlite_concurrency.py [초] [읽기 스레드 수] [쓰기 스레드 수]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# (설명, 환경 변수)
+PROFILES = [
+    ("기존 (DELETE 저널, FULL, 읽기 분리 없음)", {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': '0',
+        'DB_READ_ROUTING': '0'
+    }),
+    ("WAL + NORMAL (읽기 분리 없음)", {'DB_READ_ROUTING': '0'}),
+    ("WAL + NORMAL + 읽기 전용 풀", {}),
+]
+
+READ_PATHS = ['/api/games?limit=20', '/api/courts/1', '/api/teams/1']
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run(seconds, readers, writers):
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from app import create_app, init_db, seed_db
+
+    app = create_app()
+    with app.app_context():
+        init_db()
+        seed_db()
+
+    token = app.test_client().post('/api/auth/login', json={"email": "test@example.com", "password": "password123"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    stop = threading.Event()
+    read_times, write_count, errors = [], [0], [0]
+    lock = threading.Lock()
+
+    def reader(index):
+        client = app.test_client()
+        times = []
+        i = index
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.get(READ_PATHS[i % len(READ_PATHS)])
+            response.get_data()
+            times.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                with lock:
+                    errors[0] += 1
+            i += 1
+        with lock:
+            read_times.extend(times)
+
+    def writer(index):
+        client = app.test_client()
+        i = 0
+        while not stop.is_set():
+            response = client.post('/api/courts', json={"name": f"bench {index}-{i}", "address": "서울"}, headers=headers)
+            ok = response.status_code == 201
+            if ok:
+                response = client.put(f"/api/courts/{response.get_json()['id']}", json={"description": f"수정 {i}"}, headers=headers)
+                ok = response.status_code == 200
+            with lock:
+                if ok:
+                    write_count[0] += 1
+                else:
+                    errors[0] += 1
+            i += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        "reads": len(read_times),
+        "p50": percentile(read_times, 0.5),
+        "p99": percentile(read_times, 0.99),
+        "max": max(read_times, default=0.0),
+        "writes": write_count[0],
+        "errors": errors[0]
+    }))
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    writers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    print(f"{seconds:g}초, 읽기 스레드 {readers}개, 쓰기 스레드 {writers}개")
+    for label, overrides in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directory, 'bench.db'), **overrides)
+            output = subprocess.run(
+                [sys.executable, __file__, '--run', str(seconds), str(readers), str(writers)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {label}")
+        print(f"      읽기 {result['reads'] / seconds:7.0f} req/s  p50 {result['p50']:6.2f} ms  p99 {result['p99']:7.2f} ms  최대 {result['max']:7.1f} ms")
+        print(f"      쓰기 {result['writes'] / seconds:7.0f} 건/s  오류 {result['errors']}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run(float(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        main()
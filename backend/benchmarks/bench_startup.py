@@ -0,0 +1,87 @@
+# app.py 워커 시작 시간 벤치마크
+# 시드된 임시 DB에 대해 새 프로세스마다 import + create_app() 시간과 첫 요청까지의 시간을 재고,
+# 그 사이에 실행된 SQL 문 중 쓰기 문 수와 비밀번호 해시 계산 횟수를 센다.
+# 비교용 '이전 방식'은 import 시 테이블 생성 + 시드 확인 + 시드 사용자 재해시를 하던 동작을 재현한 것.
+# 워커 시작에서 쓰기나 해시 계산이 있으면 종료 코드 1
+# 실행: python backend/benchmarks/bench_startup.py [반복 횟수]
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (설명, 모드)
+MODES = [
+    ("이전 방식 (import 시 init_db + seed_db + 재해시)", 'legacy'),
+    ("앱 팩토리 (create_app)", 'factory'),
+]
+
+
+def boot(mode):
+    start = time.perf_counter()
+    sys.path.insert(0, BACKEND)
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    import app as app_module
+
+    writes, hashes = [], []
+    event.listen(Engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statement.lstrip().upper().startswith(('SELECT', 'PRAGMA')) or writes.append(statement))
+    generate_password_hash = app_module.generate_password_hash
+    def counting_hash(*args, **kwargs):
+        hashes.append(1)
+        return generate_password_hash(*args, **kwargs)
+    app_module.generate_password_hash = counting_hash
+
+    app = app_module.create_app()
+    if mode == 'legacy':
+        with app.app_context():
+            app_module.init_db()
+            app_module.seed_db()
+            # 이전 시드 확인('$pbkdf2-sha256' 접두사)은 werkzeug 형식과 맞지 않아 매번 재해시했음
+            user = app_module.User.query.filter_by(email='test@example.com').first()
+            user.password_hash = app_module.generate_password_hash('password123')
+            app_module.db.session.commit()
+    booted = time.perf_counter()
+    response = app.test_client().get('/api/courts')
+    response.get_data()
+    first = time.perf_counter()
+    print(json.dumps({
+        "boot": (booted - start) * 1000,
+        "first": (first - start) * 1000,
+        "writes": len(writes),
+        "hashes": len(hashes),
+        "status": response.status_code
+    }))
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directory, 'startup.db'))
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'seed'], cwd=BACKEND, env=env, check=True, capture_output=True)
+        print(f"프로세스 {repeat}번 시작 (중앙값)")
+        for label, mode in MODES:
+            results = [json.loads(subprocess.run(
+                [sys.executable, __file__, '--boot', mode], env=env, capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+            writes = max(result["writes"] for result in results)
+            hashes = max(result["hashes"] for result in results)
+            print(f"  {label}")
+            print(f"      시작 {statistics.median(r['boot'] for r in results):7.1f} ms  첫 요청까지 {statistics.median(r['first'] for r in results):7.1f} ms"
+                  f"  쓰기 문 {writes}개  해시 {hashes}번  상태 {results[0]['status']}")
+            if mode == 'factory':
+                failed |= writes > 0 or hashes > 0
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--boot':
+        boot(sys.argv[2])
+    else:
+        main()
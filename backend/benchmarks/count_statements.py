@@ -0,0 +1,83 @@
+# app.py 라우트별 SQL 문 실행 횟수 검사 (N+1 쿼리 회귀 확인)
+# 임시 SQLite 파일에 게임 1,000개(게임마다 다른 코트/호스트/팀)를 만든 뒤 각 라우트가 실행하는 문 수를 센다.
+# 예상 값과 다르면 종료 코드 1
+# 실행: python backend/benchmarks/count_statements.py [게임 수]
+import datetime
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'count.db')
+
+from sqlalchemy import event
+
+from app import create_app, init_db, db, User, Court, Team, Game, team_members
+
+# (설명, 경로, 예상 문 수)
+EXPECTED = [
+    ("게임 목록", '/api/games', 1),
+    ("게임 목록 (페이지)", '/api/games?limit=100', 1),
+    ("게임 목록 (스트리밍)", '/api/games?stream=ndjson', 1),
+    ("게임 상세", '/api/games/1', 1),
+    ("팀 목록 (페이지)", '/api/teams?limit=1000', 2),
+    ("팀 목록 (스트리밍)", '/api/teams?stream=json&limit=1000', 2),
+    ("팀 상세", '/api/teams/1', 3),
+    ("코트 목록", '/api/courts', 1),
+]
+
+
+def populate(count):
+    start = datetime.datetime(2024, 1, 1)
+    users = [User(email=f"bench{i}@example.com", password_hash='x', name=f"user {i}") for i in range(count)]
+    courts = [Court(name=f"court {i}", address="서울") for i in range(count)]
+    teams = [Team(name=f"bench team {i}") for i in range(count + 1)]
+    db.session.add_all(users + courts + teams)
+    db.session.flush()
+    db.session.add_all(Game(
+        date_time=start + datetime.timedelta(hours=i),
+        court_id=courts[i].id,
+        host_id=users[i].id,
+        home_team_id=teams[i].id,
+        away_team_id=teams[i + 1].id
+    ) for i in range(count))
+    # 팀마다 멤버 두 명
+    db.session.execute(team_members.insert(), [
+        {"team_id": team.id, "user_id": users[(i + j) % count].id} for i, team in enumerate(teams) for j in range(2)
+    ])
+    db.session.commit()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    statements = []
+    app = create_app()
+    with app.app_context():
+        init_db()
+        populate(count)
+        # 읽기 쿼리는 읽기 전용 풀(sqlite_profile.READER)로 가므로 모든 엔진에서 셈
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    failed = False
+    for label, path, expected in EXPECTED:
+        statements.clear()
+        response = client.get(path)
+        response.get_data()
+        actual = len(statements)
+        ok = response.status_code == 200 and actual == expected
+        failed |= not ok
+        print(f"  {'OK ' if ok else '실패'} {label:<20} {path:<28} 문 {actual}개 (예상 {expected}, 상태 {response.status_code})")
+        if not ok:
+            for statement in statements[:5]:
+                print("      " + " ".join(statement.split())[:160])
+    print(f"게임 {count}개 기준")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
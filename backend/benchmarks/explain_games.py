@@ -0,0 +1,82 @@
+# GET /api/games 필터별 EXPLAIN QUERY PLAN 검사
+# 임시 SQLite 파일에 게임을 만들고 ANALYZE한 뒤, 각 필터 쿼리가 game 테이블을 전체 스캔하지 않고
+# 인덱스로 찾는지 확인한다. 인덱스를 쓰지 않는 필터가 있으면 종료 코드 1
+# 실행: python backend/benchmarks/explain_games.py [게임 수]
+import datetime
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'explain.db')
+
+from sqlalchemy import or_, text
+from werkzeug.datastructures import MultiDict
+
+from app import create_app, init_db, db, filter_games, GAME_FULL, GAME_WITH_TEAM_NAMES, Game, GameStatus
+
+STATUSES = [GameStatus.SCHEDULED, GameStatus.IN_PROGRESS, GameStatus.COMPLETED, GameStatus.CANCELLED]
+
+# (설명, 필터)
+FILTERS = [
+    ("코트", {'court_id': '1'}),
+    ("호스트", {'host_id': '1'}),
+    ("팀 (홈/어웨이)", {'team_id': '1'}),
+    ("상태", {'status': GameStatus.IN_PROGRESS}),
+    ("기간", {'from': '2024-03-01', 'to': '2024-03-08'}),
+    ("상태 + 기간 (이번 주 예정 게임)", {'status': GameStatus.SCHEDULED, 'from': '2024-03-01', 'to': '2024-03-08'}),
+    ("코트 + 기간", {'court_id': '1', 'from': '2024-03-01', 'to': '2024-03-08'}),
+    ("팀 + 기간", {'team_id': '1', 'from': '2024-03-01', 'to': '2024-03-08'}),
+]
+
+
+def populate(count):
+    start = datetime.datetime(2024, 1, 1)
+    db.session.execute(Game.__table__.insert(), [{
+        "date_time": start + datetime.timedelta(hours=i),
+        "status": STATUSES[i % 4],
+        "court_id": i % 50 + 1,
+        "host_id": i % 500 + 1,
+        "home_team_id": i % 300 + 1,
+        "away_team_id": (i + 7) % 300 + 1
+    } for i in range(count)])
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+
+
+def plan(query):
+    sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return [row[3] for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+
+
+def uses_index(steps):
+    game_steps = [step for step in steps if step.startswith(('SCAN game', 'SEARCH game'))]
+    return bool(game_steps) and all('INDEX' in step and step.startswith('SEARCH') for step in game_steps)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    failed = False
+    app = create_app()
+    with app.app_context():
+        init_db()
+        populate(count)
+        queries = [(label, filter_games(GAME_FULL.select(), MultiDict(args)).order_by(Game.id).limit(100)) for label, args in FILTERS]
+        queries.append(("팀 상세의 게임 목록", GAME_WITH_TEAM_NAMES.select().where(or_(Game.home_team_id == 1, Game.away_team_id == 1)).order_by(Game.id)))
+        for label, query in queries:
+            steps = plan(query)
+            ok = uses_index(steps)
+            failed |= not ok
+            print(f"  {'OK ' if ok else '실패'} {label}")
+            for step in steps:
+                if 'game' in step.split(' USING')[0].split():
+                    print(f"      {step}")
+    print(f"게임 {count}개 기준")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+# 동기 서버와 비동기 서버의 응답 비교 (app.py vs app_async.py, app_simple.py vs app_simple_async.py)
+# 같은 초기 데이터에 같은 요청 순서(조회, 생성/수정/삭제, 오류 요청, 스트리밍, 일괄 등록, 로그인/로그아웃)를 보내고
+# 상태 코드, Content-Type, X-Next-Cursor, 본문이 모두 같은지 확인한다 (시각과 토큰 값은 비교하지 않음).
+# SQLite 서버는 시드 데이터를 넣은 임시 DB 파일을 복사해 하나씩 쓰고,
+# JSON 저장소 서버는 불러올 때 모듈 옆의 db.json을 읽고 쓰므로 backend의 모듈과 db.json을 임시 디렉터리에 복사해 그곳에서 실행한다.
+# 두 JSON 저장소 서버는 저장소를 공유하므로 동기 서버를 실행한 뒤 db.json을 처음 상태로 되돌려 다시 불러온다.
+# 다른 응답이 있으면 종료 코드 1
+# 실행: python backend/benchmarks/parity_async.py
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (메서드, 경로, 본문). 경로와 본문의 {court}, {team}, {game}은 마지막으로 생성된 레코드의 id
+# LOGIN은 테스트 사용자로 로그인해 이후 요청에 토큰을 붙이고, CSV/RAW는 본문을 그대로 보냄
+STEPS = [
+    ('GET', '/api/courts', None), ('GET', '/api/courts/1', None), ('GET', '/api/courts/999', None),
+    ('GET', '/api/teams', None), ('GET', '/api/teams/1', None), ('GET', '/api/games', None), ('GET', '/api/games/1', None),
+    ('GET', '/api/games?team_id=1&limit=1', None), ('GET', '/api/games?from=bad', None), ('GET', '/api/courts?limit=x', None),
+    ('GET', '/api/courts?stream=ndjson', None), ('GET', '/api/teams?stream=json', None), ('GET', '/api/games?stream=json', None),
+    ('POST', '/api/courts', {"name": "n", "address": "a"}),
+    ('LOGIN', None, None),
+    ('POST', '/api/courts', {"name": "n"}), ('POST', '/api/courts', {"name": "Bad", "address": "x", "lat": 37.5}),
+    ('POST', '/api/courts', {"name": "Songpa Hall", "address": "서울시 송파구", "lat": 37.5145, "lng": 127.1059, "region": "Songpa"}),
+    ('PUT', '/api/courts/{court}', {"description": "d"}), ('GET', '/api/courts/{court}', None), ('PUT', '/api/courts/999', {"name": "x"}),
+    ('GET', '/api/courts?region=songpa', None), ('GET', '/api/courts?near=37.51,127.1&radius=2', None), ('GET', '/api/courts?near=x', None),
+    ('POST', '/api/teams', {"name": "Alpha Team"}), ('POST', '/api/teams', {"name": "Parity", "region": "songpa",
+                                                                            "availability": [{"day": 5, "start": "18:00", "end": "21:00"}]}),
+    ('GET', '/api/teams/{team}', None), ('PUT', '/api/teams/2', {"name": "x"}), ('PUT', '/api/teams/{team}', {"name": "Beta Team"}),
+    ('PUT', '/api/teams/{team}', {"name": "Parity 2", "availability": [{"day": 7, "start": "10:00", "end": "11:00"}]}),
+    ('PUT', '/api/teams/{team}', {"description": "d"}), ('GET', '/api/teams/1/matches?limit=5', None), ('GET', '/api/teams/999/matches', None),
+    ('POST', '/api/games', {"date_time": "2030-01-01T10:00:00", "court_id": "{court}", "home_team_id": 1, "away_team_id": "{team}"}),
+    ('POST', '/api/games', {"date_time": "2030-01-01T10:30:00", "court_id": "{court}"}), ('POST', '/api/games', {"court_id": "{court}"}),
+    ('POST', '/api/games', {"date_time": "2030-01-01T12:00:00", "court_id": 999}),
+    ('POST', '/api/games', {"date_time": "2030-01-01T12:00:00", "court_id": "{court}", "duration_minutes": "x"}),
+    ('PUT', '/api/games/{game}', {"status": "COMPLETED", "home_score": 80, "away_score": 70}), ('GET', '/api/games/{game}', None),
+    ('GET', '/api/teams/{team}', None), ('PUT', '/api/games/{game}', {"court_id": 999}), ('PUT', '/api/games/{game}', {"home_score": "x"}),
+    ('GET', '/api/courts/{court}/availability?from=2030-01-01&to=2030-01-02', None), ('GET', '/api/courts/{court}/availability?from=2030-01-01', None),
+    ('POST', '/api/games/bulk', [{"date_time": "2030-02-01T10:00:00", "court_id": "{court}", "home_team_id": 1, "away_team_id": "{team}",
+                                  "status": "COMPLETED", "home_score": 50, "away_score": 51},
+                                 {"date_time": "2030-02-01T12:00:00", "court_id": "{court}"}]),
+    ('POST', '/api/games/bulk', [{"date_time": "x", "court_id": 999}]),
+    ('POST', '/api/games/bulk', [{"date_time": "2030-02-01T10:30:00", "court_id": "{court}"}]),
+    ('CSV', '/api/games/bulk', 'date_time,court_id\n2030-03-01T10:00:00,{court}\n'), ('RAW', '/api/games/bulk', 'x'),
+    ('GET', '/api/games?court_id={court}', None), ('GET', '/api/teams', None),
+    ('DELETE', '/api/games/{game}', None), ('DELETE', '/api/games/{game}', None), ('DELETE', '/api/teams/{team}', None),
+    ('DELETE', '/api/courts/{court}', None), ('GET', '/api/games', None), ('GET', '/api/teams', None),
+    ('RAW', '/api/courts', 'notjson'),
+    ('POST', '/api/auth/signup', {"email": "parity@example.com", "password": "pw", "name": "P"}),
+    ('POST', '/api/auth/signup', {"email": "parity@example.com", "password": "pw", "name": "P"}), ('POST', '/api/auth/signup', {"email": "x"}),
+    ('POST', '/api/auth/login', {"email": "parity@example.com", "password": "bad"}), ('POST', '/api/auth/login', {"email": "x"}),
+    ('POST', '/api/auth/logout', None), ('POST', '/api/courts', {"name": "n", "address": "a"}),
+]
+CREATED = {'/api/courts': 'court', '/api/teams': 'team', '/api/games': 'game'}
+# 요청마다 달라지는 값
+VOLATILE = ('created_at', 'updated_at', 'access_token')
+
+
+def fill(value, ids):
+    if isinstance(value, str):
+        match = re.fullmatch(r'\{(\w+)\}', value)
+        return ids[match.group(1)] if match else value.format(**ids)
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    return value
+
+
+def strip(value):
+    if isinstance(value, dict):
+        return {key: strip(item) for key, item in value.items() if key not in VOLATILE}
+    if isinstance(value, list):
+        return [strip(item) for item in value]
+    return value
+
+
+def normalize(data):
+    try:
+        return strip(json.loads(data))
+    except ValueError:
+        pass
+    try:
+        return strip([json.loads(line) for line in data.decode().splitlines() if line])
+    except ValueError:
+        return data
+
+
+# 요청 순서를 보내며 응답 요약 목록을 만드는 코루틴. send(메서드, 경로, 옵션) -> (상태, 헤더, 본문 bytes)
+async def run_steps(send):
+    headers, ids, results = {}, {"court": 0, "team": 0, "game": 0}, []
+    for method, path, body in STEPS:
+        if method == 'LOGIN':
+            status, _, data = await send('POST', '/api/auth/login', {"json": {"email": "test@example.com", "password": "password123"}})
+            headers = {"Authorization": 'Bearer ' + json.loads(data)["access_token"]}
+            results.append((method, status, normalize(data)))
+            continue
+        path = fill(path, ids)
+        if method == 'CSV':
+            options = {"data": fill(body, ids).encode(), "headers": {**headers, "Content-Type": 'text/csv'}}
+        elif method == 'RAW':
+            options = {"data": body.encode(), "headers": {**headers, "Content-Type": 'text/plain'}}
+        else:
+            options = {"headers": headers, **({"json": fill(body, ids)} if body is not None else {})}
+        status, response_headers, data = await send('POST' if method in ('CSV', 'RAW') else method, path, options)
+        if method == 'POST' and status == 201 and path in CREATED:
+            ids[CREATED[path]] = json.loads(data)["id"]
+        results.append((method, path, status, response_headers.get('Content-Type'), response_headers.get('X-Next-Cursor'),
+                        normalize(data)))
+    return results
+
+
+def run_flask(app):
+    client = app.test_client()
+
+    async def send(method, path, options):
+        response = client.open(path, method=method, **options)
+        return response.status_code, response.headers, response.data
+
+    return asyncio.run(run_steps(send))
+
+
+async def run_quart(app):
+    client = app.test_client()
+
+    async def send(method, path, options):
+        response = await client.open(path, method=method, **options)
+        return response.status_code, response.headers, await response.get_data()
+
+    async with app.test_app():
+        return await run_steps(send)
+
+
+def compare(name, expected, actual):
+    differences = 0
+    for sync_result, async_result in zip(expected, actual):
+        if sync_result != async_result:
+            differences += 1
+            print(f"  다름\n    동기   {str(sync_result)[:500]}\n    비동기 {str(async_result)[:500]}")
+    print(f"{name}: 요청 {len(expected)}개, 다른 응답 {differences}개")
+    return differences + abs(len(expected) - len(actual))
+
+
+def sqlite_pair(directory):
+    import app as wsgi
+    import app_async
+
+    urls = ['sqlite:///' + os.path.join(directory, name) for name in ('sync.db', 'async.db')]
+    sync_app = wsgi.create_app({'SQLALCHEMY_DATABASE_URI': urls[0]})
+    with sync_app.app_context():
+        wsgi.init_db()
+        wsgi.seed_db()
+        for engine in wsgi.db.engines.values():
+            engine.dispose()
+    shutil.copy(os.path.join(directory, 'sync.db'), os.path.join(directory, 'async.db'))
+    try:
+        expected = run_flask(sync_app)
+    finally:
+        sync_app.extensions['password_pool'].shutdown()
+    actual = asyncio.run(run_quart(app_async.create_app({'SQLALCHEMY_DATABASE_URI': urls[1]})))
+    return compare("app.py / app_async.py", expected, actual)
+
+
+def json_store_pair(directory):
+    original = os.path.join(directory, 'db.json.orig')
+    shutil.copy(os.path.join(directory, 'db.json'), original)
+    # 저장소 모듈의 로드/저장 메시지는 출력하지 않음
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app_simple
+        import app_simple_async
+        expected = run_flask(app_simple.app)
+        app_simple.flusher.flush()
+        shutil.copy(original, app_simple.DB_FILE)
+        app_simple.journal.reset()
+        app_simple.load_db()
+        actual = asyncio.run(run_quart(app_simple_async.app))
+    return compare("app_simple.py / app_simple_async.py", expected, actual)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    for path in glob.glob(os.path.join(BACKEND, '*.py')) + [os.path.join(BACKEND, 'db.json')]:
+        shutil.copy(path, directory)
+    sys.path.insert(0, directory)
+    os.environ.setdefault('PASSWORD_POOL_WORKERS', '1')
+    os.environ.setdefault('SECRET_KEY', 'parity-check')
+    differences = sqlite_pair(directory) + json_store_pair(directory)
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# 스냅샷 저장소 동시성 스트레스 테스트
+# 쓰기 스레드가 팀+게임 생성, 팀 삭제(게임 연쇄 삭제)를 반복하는 동안 읽기 스레드가 스냅샷을 검사한다.
+# 한 스냅샷 안에서 존재하지 않는 팀/코트를 참조하는 게임이나 반쯤 적용된 연쇄 삭제가 보이면 실패 (종료 코드 1).
+# 실행: python backend/benchmarks/stress_snapshots.py [초] [쓰기 스레드 수] [읽기 스레드 수]
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from collection import IndexedCollection
+from game_table import GameTable
+from store import Snapshot, Store
+from view_cache import ViewCache
+
+COURTS = 20
+
+
+def make_store():
+    users = IndexedCollection('users', [{"id": 1, "name": "host", "email": "host@example.com"}], unique=('email',))
+    courts = IndexedCollection('courts', [{"id": i, "name": f"court {i}"} for i in range(1, COURTS + 1)])
+    return Store(Snapshot(0, users=users, courts=courts, teams=IndexedCollection('teams', unique=('name',)), games=GameTable('games')))
+
+
+def build_view(game_id, db):
+    game = db.games.get(game_id)
+    if game is None:
+        return None, []
+    view = dict(game)
+    deps = [('games', game_id)]
+    for field in ("home_team", "away_team"):
+        team_id = game[field + "_id"]
+        deps.append(('teams', team_id))
+        view[field] = db.teams.get(team_id)
+    return view, deps
+
+
+def writer(store, seed, deadline, counts):
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        with store.write() as tx:
+            db = tx.snapshot
+            if len(db.teams) > 50 and rng.random() < 0.5:
+                # 팀 삭제: 팀과 그 팀의 게임이 한 번에 사라져야 함
+                team_id = rng.choice([team["id"] for team in db.teams])
+                tx.teams.remove(team_id)
+                for game_id in db.games.ids_referencing('team_id', team_id):
+                    tx.games.remove(game_id)
+                counts['deletes'] += 1
+            else:
+                team = tx.teams.insert({"name": f"team {seed}-{tx.teams.next_id}", "member_ids": [1]})
+                opponents = [other["id"] for other in db.teams]
+                for _ in range(min(5, len(opponents))):
+                    tx.games.insert({
+                        "date_time": "2024-08-15T18:00:00",
+                        "court_id": rng.randint(1, COURTS),
+                        "host_id": 1,
+                        "home_team_id": team["id"],
+                        "away_team_id": rng.choice(opponents),
+                        "status": "SCHEDULED"
+                    })
+                counts['creates'] += 1
+
+
+def check(db):
+    problems = []
+    team_games = 0
+    for game in db.games:
+        for field in ("home_team_id", "away_team_id"):
+            if db.teams.get(game[field]) is None:
+                problems.append(f"v{db.version}: 게임 {game['id']}의 {field} {game[field]} 없음")
+        if db.courts.get(game["court_id"]) is None:
+            problems.append(f"v{db.version}: 게임 {game['id']}의 코트 {game['court_id']} 없음")
+    for team in db.teams:
+        team_games += len(db.games.ids_referencing('team_id', team["id"]))
+    # 홈/어웨이 역참조 합계는 게임 수의 두 배여야 함 (인덱스와 컬럼이 같은 시점인지 확인)
+    if team_games != 2 * len(db.games):
+        problems.append(f"v{db.version}: 역참조 합계 {team_games} != 게임 수 x 2 ({2 * len(db.games)})")
+    return problems
+
+
+def reader(store, views, deadline, counts, problems):
+    while time.monotonic() < deadline:
+        db = store.snapshot
+        found = check(db)
+        for game_id in db.games.find_ids(status="SCHEDULED")[:50]:
+            view = views.get(game_id, db)
+            if view["home_team"] is None or view["away_team"] is None:
+                found.append(f"v{db.version}: 게임 {game_id} 뷰에 팀 정보 없음")
+        problems.extend(found)
+        counts['reads'] += 1
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    views = ViewCache(build_view)
+    store = make_store()
+    store.on_commit = lambda snapshot, changes: views.advance(snapshot.version, changes)
+    counts = {'creates': 0, 'deletes': 0, 'reads': 0}
+    problems = []
+    deadline = time.monotonic() + seconds
+    threads = [threading.Thread(target=writer, args=(store, i, deadline, counts)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(store, views, deadline, counts, problems)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db = store.snapshot
+    problems.extend(check(db))
+    print(f"{seconds:.0f}초, 쓰기 {writers} / 읽기 {readers} 스레드: 생성 {counts['creates']}, 삭제 {counts['deletes']}, "
+          f"스냅샷 검사 {counts['reads']}회, 최종 버전 {db.version} (팀 {len(db.teams)}, 게임 {len(db.games)}), "
+          f"뷰 캐시 적중 {views.hits} / 미스 {views.misses}")
+    for problem in problems[:20]:
+        print(problem)
+    if problems:
+        print(f"실패: 일관성 위반 {len(problems)}건")
+        sys.exit(1)
+    print("통과: 모든 스냅샷이 일관됨")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+from paged import PagedDict, ID_PAGE_BITS
+
+
+# 고유 인덱스 값이 이미 다른 레코드에서 사용 중일 때 발생
+class DuplicateKeyError(ValueError):
+    def __init__(self, collection, field, value):
+        super().__init__(f"{collection}.{field} 값 '{value}'이(가) 이미 존재합니다.")
+        self.collection = collection
+        self.field = field
+        self.value = value
+
+
+# id 기반 해시 인덱스를 가진 컬렉션
+# 레코드는 id 범위별 페이지로 나눈 id -> 레코드 dict(PagedDict)에 id 순서대로 보관되며 조회/추가/삭제가 모두 O(1)이다.
+# 다음 id는 단조 증가 카운터로 관리하며 삭제된 id를 재사용하지 않으므로 추가한 레코드는 항상 맨 뒤에 온다.
+# unique로 지정한 필드는 값 -> 레코드 보조 인덱스를 유지하며 중복을 허용하지 않는다 (None 값은 인덱싱하지 않음).
+# groups로 지정한 그룹 인덱스는 이름 -> 레코드의 키를 구하는 함수이며, 키 -> {id: 레코드}를 유지한다 (키가 None이면 인덱싱하지 않음).
+# 레코드 dict는 한 번 저장되면 수정하지 않는다 (update는 새 dict로 교체). clone()으로 만든 복사본은 원본과 페이지를 공유하고
+# 처음 수정하는 페이지만 복사하므로, 복사본을 수정해도 원본을 읽는 쪽에는 영향이 없고 복사 비용은 컬렉션 크기에 비례하지 않는다.
+class IndexedCollection:
+    def __init__(self, name, records=(), next_id=1, unique=(), groups=None):
+        self.name = name
+        self._log = None
+        self._by_id = PagedDict(by_id=True)
+        self._unique = {field: PagedDict() for field in unique}
+        self._group_keys = dict(groups or {})
+        self._groups = {group: PagedDict() for group in self._group_keys}
+        self._owned = None  # 복사본이 직접 소유한 (그룹, 키)의 레코드 dict. None이면 모두 소유
+        for record in sorted(records, key=lambda r: r["id"]):
+            self._by_id[record["id"]] = record
+            for field, index in self._unique.items():
+                # 불러온 데이터에 중복이 있으면 먼저 나온 레코드를 인덱스에 남김 (check_integrity로 확인)
+                if record.get(field) is not None:
+                    index.setdefault(record[field], record)
+            self._group_put(None, record)
+        # 저장된 카운터와 현재 최대 id 중 큰 값을 사용 (이전 버전의 db.json에는 카운터가 없음)
+        self.next_id = max(next_id or 1, max(self._by_id, default=0) + 1)
+
+    # 쓰기 트랜잭션용 복사본. 복사본의 변경은 log에 ('put', 이름, 레코드) / ('del', 이름, id)로 기록됨
+    def clone(self, log=None):
+        copy = IndexedCollection.__new__(IndexedCollection)
+        copy.name = self.name
+        copy._log = log
+        copy._by_id = self._by_id.copy()
+        copy._unique = {field: index.copy() for field, index in self._unique.items()}
+        # 그룹 인덱스의 키별 레코드 dict는 처음 바꿀 때 복사
+        copy._group_keys = self._group_keys
+        copy._groups = {group: index.copy() for group, index in self._groups.items()}
+        copy._owned = set()
+        copy.next_id = self.next_id
+        return copy
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, id):
+        return id in self._by_id
+
+    def get(self, id):
+        return self._by_id.get(id)
+
+    # 고유 인덱스로 레코드 조회
+    def get_by(self, field, value):
+        return self._unique[field].get(value)
+
+    # 그룹 인덱스에서 키가 key인 레코드 목록 (id 순)
+    def find_by(self, group, key):
+        records = self._groups[group].get(key)
+        return [records[id] for id in sorted(records)] if records else []
+
+    # 그룹 인덱스에 키가 있는 레코드가 하나라도 있는지
+    def has_group(self, group):
+        return len(self._groups[group]) > 0
+
+    def _group_records(self, group, key):
+        index = self._groups[group]
+        if self._owned is not None and (group, key) not in self._owned:
+            self._owned.add((group, key))
+            index[key] = dict(index.get(key, {}))
+        return index.setdefault(key, {})
+
+    # 레코드가 old에서 record로 바뀔 때 그룹 인덱스 갱신 (추가면 old가, 삭제면 record가 None)
+    def _group_put(self, old, record):
+        for group, key_of in self._group_keys.items():
+            old_key = key_of(old) if old is not None else None
+            key = key_of(record) if record is not None else None
+            if old_key is not None and old_key != key:
+                records = self._group_records(group, old_key)
+                del records[old["id"]]
+                if not records:
+                    del self._groups[group][old_key]
+            if key is not None:
+                self._group_records(group, key)[record["id"]] = record
+
+    def _check_unique(self, fields, id=None):
+        for field, index in self._unique.items():
+            value = fields.get(field)
+            if value is None:
+                continue
+            existing = index.get(value)
+            if existing is not None and existing["id"] != id:
+                raise DuplicateKeyError(self.name, field, value)
+
+    # 새 id를 부여한 레코드를 만들어 추가하고 반환
+    def insert(self, fields):
+        self._check_unique(fields)
+        record = {"id": self.next_id, **fields}
+        self.next_id += 1
+        self._by_id[record["id"]] = record
+        for field, index in self._unique.items():
+            if record.get(field) is not None:
+                index[record[field]] = record
+        self._group_put(None, record)
+        if self._log is not None:
+            self._log.append(('put', self.name, record))
+        return record
+
+    # 필드를 바꾼 새 레코드로 교체하고 보조 인덱스를 갱신. 중복이 있으면 아무것도 바꾸지 않고 DuplicateKeyError 발생
+    def update(self, id, changes):
+        old = self._by_id[id]
+        self._check_unique(changes, id)
+        record = {**old, **changes}
+        self._by_id[id] = record
+        for field, index in self._unique.items():
+            if index.get(old.get(field)) is old:
+                del index[old[field]]
+            if record.get(field) is not None:
+                index[record[field]] = record
+        self._group_put(old, record)
+        if self._log is not None:
+            self._log.append(('put', self.name, record))
+        return record
+
+    def remove(self, id):
+        record = self._by_id.pop(id, None)
+        if record is not None:
+            for field, index in self._unique.items():
+                if index.get(record.get(field)) is record:
+                    del index[record[field]]
+            self._group_put(record, None)
+            if self._log is not None:
+                self._log.append(('del', self.name, id))
+        return record
+
+    # old(이 컬렉션의 이전 버전) 이후 추가, 수정, 삭제된 레코드의 id 목록
+    # 복사본은 바꾸지 않은 페이지와 레코드 dict를 원본과 공유하므로 공유하지 않는 페이지의 레코드만 비교함
+    def changed_since(self, old):
+        pages, old_pages = dict(self._by_id.pages()), dict(old._by_id.pages())
+        changed = []
+        for number in pages.keys() | old_pages.keys():
+            page, old_page = pages.get(number, {}), old_pages.get(number, {})
+            if page is not old_page:
+                changed.extend(id for id in page.keys() | old_page.keys() if page.get(id) is not old_page.get(id))
+        return changed
+
+    # id가 after보다 큰 레코드를 id 오름차순으로 하나씩 반환 (커서 페이지네이션, 스트리밍용)
+    def iter_from(self, after=None):
+        first = after >> ID_PAGE_BITS if type(after) is int else None
+        for number, records in self._by_id.pages():
+            if first is not None and number < first:
+                continue
+            for id, record in records.items():
+                if after is None or id > after:
+                    yield record
+
+    # 고유 인덱스 중복 목록 반환: [(필드, 값, [id, ...]), ...]
+    def check_integrity(self):
+        problems = []
+        for field in self._unique:
+            groups = {}
+            for record in self._by_id.values():
+                if record.get(field) is not None:
+                    groups.setdefault(record[field], []).append(record["id"])
+            problems.extend((field, value, ids) for value, ids in groups.items() if len(ids) > 1)
+        return problems
+
+    def to_list(self):
+        return list(self._by_id.values())
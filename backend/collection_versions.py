@@ -0,0 +1,124 @@
+import datetime
+import mmap
+import os
+import secrets
+import struct
+import threading
+import time
+from functools import wraps
+
+from flask import Response, current_app, request
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+COLLECTIONS = ('users', 'courts', 'teams', 'games')
+
+
+# 컬렉션별 버전 번호 (프로세스 메모리)
+# 변경을 커밋할 때마다 바뀐 컬렉션의 버전을 올리고, 조회 응답의 ETag는 응답이 의존하는 컬렉션의 버전으로 만든다.
+# epoch는 프로세스마다 새로 정하므로 재시작 전에 받은 ETag는 일치하지 않음
+class CollectionVersions:
+    def __init__(self, names=COLLECTIONS):
+        self.epoch = secrets.token_hex(4)
+        now = time.time()
+        self._versions = {name: 0 for name in names}
+        self._modified = {name: now for name in names}
+        self._lock = threading.Lock()
+
+    # (버전 튜플, 마지막 변경 시각)
+    def get(self, names):
+        return tuple(self._versions[name] for name in names), max(self._modified[name] for name in names)
+
+    def bump(self, names):
+        now = time.time()
+        with self._lock:
+            for name in set(names):
+                self._versions[name] += 1
+                self._modified[name] = now
+
+
+# 같은 서버의 여러 워커 프로세스가 공유하는 버전 번호 (메모리 매핑한 파일)
+# 파일 형식: epoch(8바이트) + 컬렉션마다 (버전 uint64, 마지막 변경 시각 float64)
+# 읽기는 매핑된 메모리만 보고, 올릴 때만 파일 잠금(flock)을 건다. 다른 워커가 커밋해도 모든 워커의 ETag가 바뀜
+class SharedCollectionVersions:
+    ENTRY = struct.Struct('<Qd')
+    EPOCH_SIZE = 8
+
+    def __init__(self, path, names=COLLECTIONS):
+        self._offsets = {name: self.EPOCH_SIZE + i * self.ENTRY.size for i, name in enumerate(names)}
+        size = self.EPOCH_SIZE + len(names) * self.ENTRY.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size != size:
+                # 새 파일 (또는 컬렉션 목록이 바뀐 파일)은 새 epoch로 초기화
+                now = time.time()
+                os.ftruncate(fd, 0)
+                os.write(fd, secrets.token_bytes(self.EPOCH_SIZE) + b''.join(self.ENTRY.pack(0, now) for _ in names))
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self.epoch = self._map[:self.EPOCH_SIZE].hex()
+        self._lock = threading.Lock()
+
+    def get(self, names):
+        entries = [self.ENTRY.unpack_from(self._map, self._offsets[name]) for name in names]
+        return tuple(version for version, _ in entries), max(modified for _, modified in entries)
+
+    def bump(self, names):
+        now = time.time()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for name in set(names):
+                    offset = self._offsets[name]
+                    version, _ = self.ENTRY.unpack_from(self._map, offset)
+                    self.ENTRY.pack_into(self._map, offset, version + 1, now)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+# path가 있고 파일 잠금을 쓸 수 있으면 워커 간 공유, 아니면 프로세스 메모리
+def create(path=None, names=COLLECTIONS):
+    if path and fcntl is not None:
+        return SharedCollectionVersions(path, names)
+    return CollectionVersions(names)
+
+
+# (ETag, 마지막 변경 시각). ETag는 epoch와 names 컬렉션들의 버전으로 만듦
+def current_etag(versions, names):
+    numbers, modified = versions.get(names)
+    return f"{versions.epoch}-{'.'.join(map(str, numbers))}", modified
+
+
+def set_validators(response, etag, modified):
+    response.set_etag(etag, weak=True)
+    response.last_modified = datetime.datetime.fromtimestamp(modified, datetime.timezone.utc)
+    # 브라우저가 Last-Modified로 추정 캐시하지 않고 매번 ETag로 확인하도록 함
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# 조건부 GET: 응답이 의존하는 컬렉션들의 버전으로 ETag를 만들고,
+# If-None-Match가 일치하면 뷰 함수(쿼리, 직렬화)를 실행하지 않고 바로 304를 반환
+# 버전은 뷰 실행 전에 읽으므로 ETag가 응답 내용보다 새로울 수는 없음 (그 사이 커밋이 있으면 다음 요청에서 다시 받음)
+def conditional(*names):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, modified = current_etag(current_app.extensions['collection_versions'], names)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            return set_validators(response, etag, modified)
+        return wrapper
+    return decorator
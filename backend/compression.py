@@ -0,0 +1,151 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축하는 응답 종류
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+
+
+# 응답 본문 압축 (Accept-Encoding 협상). 게임 목록처럼 코트/팀/호스트 정보가 반복되는 JSON은 크기가 크게 줄어듦
+# min_size보다 작은 본문, 스트리밍 응답, 이미 인코딩된 응답은 그대로 보냄
+# 조건부 GET 응답(ETag 있음)은 같은 경로/쿼리/ETag의 본문이 같으므로 압축 결과만 memo_size개까지 보관해 다시 씀 (memo_key)
+class Compressor:
+    def __init__(self, encodings=('br', 'gzip'), min_size=1024, gzip_level=6, brotli_quality=4, memo_size=64):
+        self.encodings = list(encodings)
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.memo_size = memo_size
+        self._memo = OrderedDict()  # (인코딩, memo_key) -> 압축한 본문
+        self._lock = threading.Lock()
+        self._counts = {encoding: {"responses": 0, "bytes_in": 0, "bytes_out": 0} for encoding in self.encodings}
+        self._skipped_small = 0
+        self._skipped_larger = 0
+        self._memo_hits = 0
+
+    # 이 응답에 쓸 인코딩 (압축하지 않으면 None)
+    def negotiate(self, accept_encodings, response, streamed):
+        if response.status_code < 200 or response.status_code in (204, 304) or streamed:
+            return None
+        if 'Content-Encoding' in response.headers or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+            return None
+        # 압축 여부가 요청 헤더에 따라 달라지므로 중간 캐시가 구분하도록 함
+        response.vary.add('Accept-Encoding')
+        return accept_encodings.best_match(self.encodings)
+
+    # 압축한 본문 (작거나 줄지 않으면 None). key가 있으면 보관한 압축 결과를 찾고 새로 압축한 결과를 보관
+    def compress(self, body, encoding, key=None):
+        if len(body) < self.min_size:
+            with self._lock:
+                self._skipped_small += 1
+            return None
+        data = None
+        if key is not None:
+            key = (encoding, key)
+            with self._lock:
+                data = self._memo.get(key)
+                if data is not None:
+                    self._memo.move_to_end(key)
+                    self._memo_hits += 1
+        if data is None:
+            if encoding == 'br':
+                data = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                data = gzip.compress(body, self.gzip_level, mtime=0)
+        with self._lock:
+            if len(data) >= len(body):
+                self._skipped_larger += 1
+                return None
+            counts = self._counts[encoding]
+            counts["responses"] += 1
+            counts["bytes_in"] += len(body)
+            counts["bytes_out"] += len(data)
+            if key is not None:
+                self._memo[key] = data
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return data
+
+    # 압축 전후 크기와 절약한 바이트 수
+    def stats(self):
+        with self._lock:
+            by_encoding = {encoding: dict(counts, bytes_saved=counts["bytes_in"] - counts["bytes_out"])
+                           for encoding, counts in self._counts.items()}
+            bytes_in = sum(counts["bytes_in"] for counts in by_encoding.values())
+            bytes_out = sum(counts["bytes_out"] for counts in by_encoding.values())
+            return {
+                "encodings": self.encodings,
+                "min_size": self.min_size,
+                "responses": sum(counts["responses"] for counts in by_encoding.values()),
+                "bytes_in": bytes_in,
+                "bytes_out": bytes_out,
+                "bytes_saved": bytes_in - bytes_out,
+                "ratio": round(bytes_out / bytes_in, 3) if bytes_in else None,
+                "by_encoding": by_encoding,
+                "skipped_small": self._skipped_small,
+                "skipped_larger": self._skipped_larger,
+                "memo_hits": self._memo_hits
+            }
+
+
+# 설정으로 생성. app.config에 없으면 같은 이름의 환경 변수 사용
+#   COMPRESS: 'on' (기본), 'off'
+#   COMPRESS_ENCODINGS: 선호 순서 (기본 'br,gzip', br은 brotli 패키지가 있을 때만)
+#   COMPRESS_MIN_SIZE (바이트), COMPRESS_GZIP_LEVEL (1-9), COMPRESS_BROTLI_QUALITY (0-11)
+def from_config(config):
+    def get(key, default):
+        return config.get(key, os.environ.get(key, default))
+    kind = get('COMPRESS', 'on')
+    if kind == 'off':
+        return None
+    if kind != 'on':
+        raise ValueError(f"알 수 없는 COMPRESS입니다: {kind} (사용 가능: on, off)")
+    encodings = get('COMPRESS_ENCODINGS', None)
+    if encodings is None:
+        encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    else:
+        encodings = [encoding.strip() for encoding in encodings.split(',') if encoding.strip()]
+    for encoding in encodings:
+        if encoding not in ('br', 'gzip'):
+            raise ValueError(f"알 수 없는 압축 방식입니다: {encoding} (사용 가능: br, gzip)")
+        if encoding == 'br' and brotli is None:
+            raise RuntimeError("COMPRESS_ENCODINGS에 br을 쓰려면 brotli 패키지를 설치해야 합니다 (pip install brotli).")
+    return Compressor(
+        encodings,
+        min_size=int(get('COMPRESS_MIN_SIZE', 1024)),
+        gzip_level=int(get('COMPRESS_GZIP_LEVEL', 6)),
+        brotli_quality=int(get('COMPRESS_BROTLI_QUALITY', 4))
+    )
+
+
+# 압축 결과 보관 키: 경로 + 정렬한 쿼리 파라미터 + ETag (ETag가 없는 응답은 None)
+# ETag는 응답이 의존하는 컬렉션 버전이라 커밋 후에는 새 키가 됨. 버전을 읽은 뒤 커밋이 끝나 같은 ETag로 더 새로운 본문이 나갈 수 있지만
+# (collection_versions.conditional 참고) 보관한 결과도 그 ETag로 나간 본문 중 하나이므로 그대로 써도 됨
+def memo_key(request, response):
+    etag, _ = response.get_etag()
+    if etag is None:
+        return None
+    return f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}#{etag}"
+
+
+# after_request 훅 (app.after_request(compress_response)). app.extensions['compression']이 None이면 아무것도 하지 않음
+def compress_response(response):
+    compressor = current_app.extensions.get('compression')
+    if compressor is None:
+        return response
+    encoding = compressor.negotiate(request.accept_encodings, response, response.is_streamed)
+    if encoding is not None:
+        data = compressor.compress(response.get_data(), encoding, memo_key(request, response))
+        if data is not None:
+            response.set_data(data)
+            response.headers['Content-Encoding'] = encoding
+    return response
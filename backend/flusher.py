@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import threading
+import time
+
+DURABILITY_MODES = ('sync', 'group', 'async')
+# 기록에 실패하면 이 시간(초) 뒤에 같은 변경부터 다시 기록
+RETRY_SECONDS = 1.0
+
+log = logging.getLogger(__name__)
+
+
+# 기다리던 변경을 기록하지 못했을 때 발생 (변경은 메모리에는 게시되었지만 디스크에 있다는 보장이 없음)
+class FlushError(Exception):
+    def __init__(self):
+        super().__init__("변경 사항을 디스크에 기록하지 못했습니다.")
+
+
+# 백그라운드 저장 스레드 (group commit)
+# 요청 스레드는 submit()으로 변경을 대기열에 넣고, 저장 스레드가 쌓인 변경을 한 번의 쓰기로 모아 기록한다.
+#   sync : 변경이 fsync까지 끝난 뒤 submit()이 반환됨 (동시에 들어온 변경은 한 번의 fsync를 공유)
+#   group: 대기열에 넣고 바로 반환. interval초가 지나거나 max_batch개가 쌓이면 fsync와 함께 기록
+#   async: 대기열에 넣고 바로 반환. 저장 스레드가 즉시 기록하되 fsync는 하지 않음
+# write(batch, durable)는 실제 기록 함수로, batch는 submit()에 넘긴 항목들의 리스트다.
+# write가 예외를 내면 기록 완료 순번을 올리지 않고, 그 변경을 기다리던 쪽에 FlushError를 내며,
+# 실패한 항목은 대기열 맨 앞에 되돌려 RETRY_SECONDS 뒤에 다시 기록한다 (write는 실패하면 아무것도 남기지 않아야 함).
+class Flusher:
+    def __init__(self, write, mode='group', interval=0.05, max_batch=100):
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"알 수 없는 저장 모드입니다: {mode} (사용 가능: {', '.join(DURABILITY_MODES)})")
+        self.write = write
+        self.mode = mode
+        self.interval = interval
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending = []
+        self._submitted = 0  # 지금까지 대기열에 들어온 변경 수
+        self._flushed = 0    # 지금까지 기록이 끝난 변경 수
+        self._failed = 0     # 기록에 실패한 적이 있는 마지막 순번 (이 순번까지 기록되면 오류가 풀림)
+        self._error = None
+        self._force = False
+        self._stopping = False
+        self._callbacks = []  # (순번, 기록이 끝나면 호출할 함수)
+        self._thread = threading.Thread(target=self._run, name='db-flusher', daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        seq = self.enqueue(item)
+        if self.mode == 'sync':
+            self.wait(seq)
+
+    # 대기열에 넣기만 하고 순번을 반환 (기록 순서를 정하는 잠금 안에서 호출하고 wait()는 잠금 밖에서 호출할 때 사용)
+    def enqueue(self, item):
+        with self._cond:
+            self._pending.append(item)
+            self._submitted += 1
+            seq = self._submitted
+            if not self._thread.is_alive():
+                # 저장 스레드가 종료된 뒤(프로세스 종료 중)에는 바로 기록
+                batch, self._pending = self._pending, []
+                self._write_batch(batch, seq)
+                return seq
+            self._cond.notify_all()
+            return seq
+
+    # seq번째 변경까지 기록이 끝날 때까지 대기
+    def wait(self, seq):
+        with self._cond:
+            self._wait_for(seq)
+
+    # wait()와 같지만 기다리는 동안 이벤트 루프를 막지 않음 (비동기 서버용)
+    # 저장 스레드가 기록을 끝내면 콜백으로 이벤트 루프에 알림
+    async def wait_async(self, seq):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def done(error):
+            def resolve():
+                if future.done():
+                    return
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            loop.call_soon_threadsafe(resolve)
+
+        with self._cond:
+            if self._flushed >= seq:
+                return
+            self._check_failed(seq)
+            if not self._thread.is_alive():
+                return
+            self._callbacks.append((seq, done))
+        await future
+
+    # seq번째 변경의 기록 완료를 기다리는 객체 (호출하면 스레드를 막고, await하면 이벤트 루프를 막지 않고 기다림)
+    def waiter(self, seq):
+        return FlushWait(self, seq)
+
+    # 대기 중인 변경을 즉시 기록하고 끝날 때까지 대기
+    def flush(self):
+        with self._cond:
+            self._force = True
+            self._cond.notify_all()
+            self._wait_for(self._submitted)
+
+    # 저장 스레드를 멈추고 남은 변경을 모두 기록 (종료 시 호출)
+    def close(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join()
+        batch, self._pending = self._pending, []
+        if batch:
+            self._write_batch(batch, self._submitted)
+
+    def _wait_for(self, seq):
+        while self._flushed < seq:
+            self._check_failed(seq)
+            if not self._thread.is_alive():
+                return
+            self._cond.wait()
+
+    def _check_failed(self, seq):
+        if self._failed >= seq:
+            raise FlushError() from self._error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                if self.mode == 'group':
+                    # 시간 또는 개수 조건을 만족할 때까지 변경을 더 모음
+                    deadline = time.monotonic() + self.interval
+                    while len(self._pending) < self.max_batch and not self._force and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                seq = self._submitted
+                self._force = False
+            if not self._write_batch(batch, seq):
+                log.warning("%.1f초 뒤 기록을 다시 시도합니다.", RETRY_SECONDS)
+                with self._cond:
+                    deadline = time.monotonic() + RETRY_SECONDS
+                    while not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+
+    # batch(순번 seq까지의 변경)를 기록하고 성공 여부를 반환
+    def _write_batch(self, batch, seq):
+        error = None
+        try:
+            self.write(batch, self.mode != 'async')
+        except Exception as e:
+            error = e
+            log.exception("변경 사항 %d건을 기록하지 못했습니다.", len(batch))
+        with self._cond:
+            if error is None:
+                self._flushed = seq
+                if self._flushed >= self._failed:
+                    self._error = None
+            else:
+                self._pending = batch + self._pending
+                self._failed = max(self._failed, seq)
+                self._error = error
+            self._cond.notify_all()
+            done = [callback for waiting, callback in self._callbacks if waiting <= seq]
+            if done:
+                self._callbacks = [(waiting, callback) for waiting, callback in self._callbacks if waiting > seq]
+        failure = None
+        if error is not None:
+            failure = FlushError()
+            failure.__cause__ = error
+        for callback in done:
+            callback(failure)
+        return error is None
+
+
+class FlushWait:
+    def __init__(self, flusher, seq):
+        self.flusher = flusher
+        self.seq = seq
+
+    def __call__(self):
+        self.flusher.wait(self.seq)
+
+    def __await__(self):
+        return self.flusher.wait_async(self.seq).__await__()
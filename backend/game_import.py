@@ -0,0 +1,147 @@
+import csv
+import io
+
+import schedule
+import matchmaking
+from game_table import STATUSES
+
+# 한 번에 가져올 수 있는 최대 게임 수
+MAX_IMPORT_ROWS = 20000
+# CSV 열 / JSON 필드. 호스트는 요청한 사용자이므로 받지 않음
+FIELDS = ('date_time', 'court_id', 'home_team_id', 'away_team_id', 'status', 'duration_minutes', 'home_score', 'away_score')
+ID_FIELDS = ('court_id', 'home_team_id', 'away_team_id')
+# 참조 id 필드 -> 존재 확인할 컬렉션
+REFERENCES = {'court_id': 'courts', 'home_team_id': 'teams', 'away_team_id': 'teams'}
+
+
+# 요청 본문 -> 행 dict 목록
+#   JSON 배열 (또는 {"games": [...]}), 업로드한 CSV 파일(file 필드), text/csv 본문
+# 형식이 잘못되면 ValueError
+def parse_request(request):
+    if request.is_json:
+        return parse_body('json', request.get_json(silent=True))
+    if 'file' in request.files:
+        return parse_body('csv', request.files['file'].read())
+    if request.mimetype == 'text/csv':
+        return parse_body('csv', request.get_data())
+    return parse_body(None, None)
+
+
+# 이미 읽은 본문 -> 행 dict 목록. kind: 'json'(파싱한 값), 'csv'(바이트), None(지원하지 않는 형식)
+def parse_body(kind, data):
+    if kind == 'json':
+        if isinstance(data, dict):
+            data = data.get('games')
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ValueError("게임 객체의 JSON 배열을 보내주세요.")
+        rows = data
+    elif kind == 'csv':
+        rows = _read_csv(data)
+    else:
+        raise ValueError("JSON 배열 또는 CSV 파일을 보내주세요.")
+    if not rows:
+        raise ValueError("가져올 게임이 없습니다.")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ValueError(f"한 번에 최대 {MAX_IMPORT_ROWS}개까지 가져올 수 있습니다.")
+    return rows
+
+
+def _read_csv(data):
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("CSV 파일은 UTF-8이어야 합니다.")
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'date_time' not in reader.fieldnames:
+        raise ValueError(f"CSV 첫 줄에 열 이름이 필요합니다: {', '.join(FIELDS)}")
+    # 빈 칸은 값 없음
+    return [{field: value.strip() or None for field, value in row.items() if field in FIELDS and value is not None} for row in reader]
+
+
+def _to_id(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, str):
+        value = int(value)
+    if not isinstance(value, int) or value <= 0:
+        raise ValueError
+    return value
+
+
+# 행 검증. existing_ids(컬렉션 이름, id 집합)는 그중 존재하는 id 집합을 반환하며 컬렉션마다 한 번만 호출됨
+# 반환: (정리된 행 목록, [{"row": 번호(1부터), "errors": [...]}]) — 오류가 하나라도 있으면 행은 가져오지 않아야 함
+# 정리된 행의 date_time은 datetime (시간대가 있으면 UTC), duration_minutes는 분 (없으면 기본 길이), 점수는 정수 또는 None
+def validate_rows(rows, existing_ids):
+    cleaned, problems = [], {}
+    for number, row in enumerate(rows, 1):
+        errors = []
+        game = {}
+        try:
+            game['date_time'] = schedule.parse_datetime(row.get('date_time'))
+        except ValueError:
+            errors.append("date_time이 없거나 ISO 형식이 아닙니다.")
+        for field in ID_FIELDS:
+            try:
+                game[field] = _to_id(row.get(field))
+            except (TypeError, ValueError):
+                errors.append(f"{field}는 양의 정수여야 합니다.")
+                game[field] = None
+                continue
+            if field == 'court_id' and game[field] is None:
+                errors.append("court_id는 필수입니다.")
+        if game['home_team_id'] and game['home_team_id'] == game['away_team_id']:
+            errors.append("홈 팀과 어웨이 팀은 같을 수 없습니다.")
+        game['status'] = row.get('status') or STATUSES[0]
+        if game['status'] not in STATUSES:
+            errors.append(f"status는 {', '.join(STATUSES)} 중 하나여야 합니다.")
+        try:
+            game['duration_minutes'] = schedule.parse_duration(row.get('duration_minutes'))
+        except ValueError as e:
+            errors.append(str(e))
+        for field in ('home_score', 'away_score'):
+            try:
+                game[field] = matchmaking.parse_score(row.get(field))
+            except ValueError as e:
+                errors.append(f"{field}: {e}")
+                game[field] = None
+        if errors:
+            problems[number] = errors
+        cleaned.append(game)
+
+    # 참조 id는 컬렉션마다 한 번에 확인
+    wanted = {}
+    for game in cleaned:
+        for field, collection in REFERENCES.items():
+            if game[field]:
+                wanted.setdefault(collection, set()).add(game[field])
+    found = {collection: existing_ids(collection, ids) for collection, ids in wanted.items()}
+    for number, game in enumerate(cleaned, 1):
+        for field, collection in REFERENCES.items():
+            if game[field] and game[field] not in found[collection]:
+                problems.setdefault(number, []).append(f"{field} {game[field]}를 찾을 수 없습니다.")
+
+    return cleaned, [{"row": number, "errors": errors} for number, errors in sorted(problems.items())]
+
+
+# 추가한 게임들의 코트 예약 겹침 검사 (추가한 뒤 같은 트랜잭션 안에서 호출하고, 오류가 있으면 되돌려야 함)
+# new_ids: 정리된 행 순서대로 추가된 게임 id
+# busy(court_id, start, end): 그 코트에서 [start, end)와 겹치는 예약 (시작, 종료, 게임 id) 목록 (방금 추가한 게임 포함, 시작 시각 순)
+# 코트마다 이번에 추가한 게임들의 시간 범위를 한 번만 조회하며, 다른 게임과 겹치는 행마다 오류를 반환 (validate_rows와 같은 형식)
+def find_conflicts(games, new_ids, busy):
+    rows = {id: number for number, id in enumerate(new_ids, 1)}
+    courts = {}
+    for game in games:
+        if game['status'] not in schedule.FREE_STATUSES:
+            courts.setdefault(game['court_id'], []).append(game)
+    problems = {}
+    for court_id, court_games in courts.items():
+        start = min(game['date_time'] for game in court_games)
+        end = max(schedule.game_end(game['date_time'], game['duration_minutes']) for game in court_games)
+        for first, second in schedule.overlapping_pairs(busy(court_id, start, end)):
+            for id, other in ((first, second), (second, first)):
+                if id in rows:
+                    label = f"{rows[other]}번째 행" if other in rows else f"게임 {other}"
+                    problems.setdefault(rows[id], []).append(f"코트 {court_id}의 {label} 시간과 겹칩니다.")
+    return [{"row": number, "errors": errors} for number, errors in sorted(problems.items())]
@@ -0,0 +1,550 @@
+import bisect
+import datetime
+import itertools
+from array import array
+
+from schedule import DEFAULT_DURATION_MINUTES, MAX_DURATION_MINUTES, FREE_STATUSES
+from paged import PagedArray, PagedDict, CHUNK_BITS, CHUNK_MASK, CHUNK_SIZE
+
+try:
+    import numpy
+except ImportError:  # numpy가 없으면 순수 파이썬으로 필터링
+    numpy = None
+
+# 게임 상태 코드 (문자열 대신 1바이트 코드로 저장)
+STATUSES = ('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+UNKNOWN_STATUS = -1
+# 코트를 차지하지 않는 상태 코드
+FREE_CODES = frozenset(STATUS_CODES[status] for status in FREE_STATUSES)
+
+# 참조 id 컬럼 (None은 0으로 저장)
+REF_FIELDS = ('court_id', 'host_id', 'home_team_id', 'away_team_id')
+MAX_ID = 2 ** 63 - 1
+# 완료된 게임에만 있는 결과 필드. 값이 있을 때만 보조 dict에 보관하고, 없으면 None으로 보여줌
+RESULT_FIELDS = ('home_score', 'away_score', 'rating_change')
+
+# 날짜/시간은 1970-01-01 기준 마이크로초로 저장. 해석할 수 없는 값은 NO_TIME
+EPOCH = datetime.datetime(1970, 1, 1)
+NO_TIME = -2 ** 63
+MICROSECOND = datetime.timedelta(microseconds=1)
+MINUTE = 60 * 1000 * 1000
+
+# 역참조 인덱스 이름. team_id는 홈/어웨이 팀을 모두 포함
+REVERSE_INDEXES = ('court_id', 'host_id', 'team_id')
+
+# 삭제 표시된 행이 이 수를 넘고 전체의 절반 이상이면 배열을 다시 만듦
+COMPACT_MIN_DELETED = 1024
+
+
+def to_timestamp(value):
+    try:
+        dt = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return NO_TIME
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND
+
+
+def from_timestamp(ts):
+    return (EPOCH + ts * MICROSECOND).isoformat()
+
+
+def _ts(dt):
+    return (dt - EPOCH) // MICROSECOND
+
+
+def _dt(ts):
+    return EPOCH + ts * MICROSECOND
+
+
+# 게임 전용 컬럼형 테이블
+# 레코드를 dict로 보관하지 않고 컬럼별 배열(id, 참조 id, 시각, 상태 코드)에 저장하며,
+# 응답 직렬화 시점에만 dict로 만든다. IndexedCollection과 같은 인터페이스를 제공한다.
+# - id 컬럼은 항상 오름차순이므로 id 조회는 이진 탐색 (별도 dict 없음)
+# - 삭제는 행에 표시만 하고, 삭제된 행이 많아지면 배열을 다시 만듦
+# - 컬럼에 담을 수 없는 값(문자열 id, 알 수 없는 상태, 비표준 날짜 문자열, 추가 필드)은 행별 보조 dict에 원본 그대로 보관
+# - 역참조 인덱스: 코트/호스트/팀(홈, 어웨이 모두) id -> 해당 게임 id 정렬 배열
+#   연쇄 삭제와 "이 코트의 게임", "이 팀의 게임" 조회를 전체 스캔 없이 처리
+# - 코트 예약 구간 인덱스: 코트 id -> 시작 시각 순으로 정렬된 (시작, 종료, 게임 id) 배열 세 개
+#   취소되지 않은 게임만 들어가며, 예약 겹침 검사와 빈 시간 조회를 이진 탐색으로 처리
+# - 컬럼은 조각으로 나눈 배열(PagedArray), 보조 dict와 인덱스는 페이지로 나눈 dict(PagedDict)이며
+#   clone()으로 만든 복사본은 조각/페이지와 역참조/구간 배열을 공유하다가 처음 수정할 때 복사 (복사 비용이 게임 수에 비례하지 않음)
+class GameTable:
+    def __init__(self, name, records=(), next_id=1):
+        self.name = name
+        self._log = None
+        self._owned = None  # 복사본이 직접 소유한 역참조/구간 배열 키. None이면 모두 소유
+        self._ids = PagedArray('q')
+        self._refs = {field: PagedArray('q') for field in REF_FIELDS}
+        self._times = PagedArray('q')
+        self._status = PagedArray('b')
+        self._durations = PagedArray('i')  # 분, 0은 기본 길이
+        self._alive = PagedArray('B')
+        self._extra = PagedDict(by_id=True)
+        self._count = 0
+        self._reverse = {name: PagedDict() for name in REVERSE_INDEXES}
+        self._intervals = PagedDict()
+        for record in sorted(records, key=lambda r: r["id"]):
+            self._append(record)
+        self.next_id = max(next_id or 1, (self._ids[-1] + 1) if self._ids else 1)
+
+    # 쓰기 트랜잭션용 복사본. 복사본의 변경은 log에 ('put', 이름, 레코드) / ('del', 이름, id)로 기록됨
+    def clone(self, log=None):
+        copy = GameTable.__new__(GameTable)
+        copy.name = self.name
+        copy._log = log
+        copy._ids = self._ids.copy()
+        copy._refs = {field: column.copy() for field, column in self._refs.items()}
+        copy._times = self._times.copy()
+        copy._status = self._status.copy()
+        copy._durations = self._durations.copy()
+        copy._alive = self._alive.copy()
+        copy._extra = self._extra.copy()
+        copy._count = self._count
+        copy._reverse = {name: index.copy() for name, index in self._reverse.items()}
+        copy._intervals = self._intervals.copy()
+        copy._owned = set()
+        copy.next_id = self.next_id
+        return copy
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for row, alive in enumerate(self._alive):
+            if alive:
+                yield self._materialize(row)
+
+    def __contains__(self, id):
+        return self._row(id) is not None
+
+    def _row(self, id):
+        if not isinstance(id, int):
+            return None
+        row = self._ids.bisect_left(id)
+        if row < len(self._ids):
+            chunk, i = row >> CHUNK_BITS, row & CHUNK_MASK
+            if self._ids.chunks[chunk][i] == id and self._alive.chunks[chunk][i]:
+                return row
+        return None
+
+    def _append(self, record):
+        self._ids.append(record["id"])
+        for column in self._refs.values():
+            column.append(0)
+        self._times.append(NO_TIME)
+        self._status.append(UNKNOWN_STATUS)
+        self._durations.append(0)
+        self._alive.append(1)
+        self._count += 1
+        row = len(self._ids) - 1
+        self._store(row, record)
+        self._link(record["id"], self._ref_keys(row))
+        self._book(record["id"], self._interval(row))
+
+    # 행이 역참조 인덱스에 등록될 (인덱스 이름, 참조 id) 목록
+    def _ref_keys(self, row):
+        refs = self._refs
+        chunk, i = row >> CHUNK_BITS, row & CHUNK_MASK
+        keys = {
+            ('court_id', refs["court_id"].chunks[chunk][i]),
+            ('host_id', refs["host_id"].chunks[chunk][i]),
+            ('team_id', refs["home_team_id"].chunks[chunk][i]),
+            ('team_id', refs["away_team_id"].chunks[chunk][i])
+        }
+        return {(name, value) for name, value in keys if value}
+
+    # 수정할 역참조 배열. 복사본에서는 원본과 공유 중인 배열을 처음 수정할 때 복사
+    def _reverse_ids(self, name, value):
+        index = self._reverse[name]
+        ids = index.get(value)
+        if ids is None:
+            ids = index[value] = array('q')
+        elif self._owned is not None and (name, value) not in self._owned:
+            ids = index[value] = array('q', ids)
+        else:
+            return ids
+        if self._owned is not None:
+            self._owned.add((name, value))
+        return ids
+
+    def _link(self, id, keys):
+        for name, value in keys:
+            bisect.insort(self._reverse_ids(name, value), id)
+
+    def _unlink(self, id, keys):
+        for name, value in keys:
+            if value not in self._reverse[name]:
+                continue
+            ids = self._reverse_ids(name, value)
+            i = bisect.bisect_left(ids, id)
+            if i < len(ids) and ids[i] == id:
+                del ids[i]
+            if not ids:
+                del self._reverse[name][value]
+
+    # 행의 예약 구간 (코트 id, 시작, 종료). 취소된 게임, 코트나 시각이 없는 게임은 None
+    def _interval(self, row):
+        chunk, i = row >> CHUNK_BITS, row & CHUNK_MASK
+        court_id = self._refs["court_id"].chunks[chunk][i]
+        start = self._times.chunks[chunk][i]
+        if not court_id or start == NO_TIME or self._status.chunks[chunk][i] in FREE_CODES:
+            return None
+        return court_id, start, start + (self._durations.chunks[chunk][i] or DEFAULT_DURATION_MINUTES) * MINUTE
+
+    # 수정할 코트 구간 배열 (시작, 종료, 게임 id). 복사본에서는 처음 수정할 때 복사
+    def _court_intervals(self, court_id):
+        intervals = self._intervals.get(court_id)
+        if intervals is None:
+            intervals = self._intervals[court_id] = (array('q'), array('q'), array('q'))
+        elif self._owned is not None and ('intervals', court_id) not in self._owned:
+            intervals = self._intervals[court_id] = tuple(array('q', column) for column in intervals)
+        else:
+            return intervals
+        if self._owned is not None:
+            self._owned.add(('intervals', court_id))
+        return intervals
+
+    def _book(self, id, interval):
+        if interval is None:
+            return
+        court_id, start, end = interval
+        starts, ends, ids = self._court_intervals(court_id)
+        i = bisect.bisect_right(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+        ids.insert(i, id)
+
+    def _unbook(self, id, interval):
+        if interval is None or interval[0] not in self._intervals:
+            return
+        court_id, start, _ = interval
+        starts, ends, ids = self._court_intervals(court_id)
+        for i in range(bisect.bisect_left(starts, start), bisect.bisect_right(starts, start)):
+            if ids[i] == id:
+                del starts[i], ends[i], ids[i]
+                break
+        if not starts:
+            del self._intervals[court_id]
+
+    # court_id 코트에서 [start, end)와 겹치는 예약 (시작, 종료, 게임 id) 목록, 시작 시각 순 (start/end는 datetime)
+    # 게임은 MAX_DURATION_MINUTES보다 길 수 없으므로 start - 최대 길이 이후에 시작한 구간만 이진 탐색으로 찾아 검사
+    def busy(self, court_id, start, end):
+        intervals = self._intervals.get(court_id)
+        if intervals is None:
+            return []
+        starts, ends, ids = intervals
+        lo, hi = _ts(start), _ts(end)
+        first = bisect.bisect_right(starts, lo - MAX_DURATION_MINUTES * MINUTE)
+        last = bisect.bisect_left(starts, hi)
+        return [(_dt(starts[i]), _dt(ends[i]), ids[i]) for i in range(first, last) if ends[i] > lo]
+
+    # 특정 코트/호스트/팀을 참조하는 게임 id 목록 (오름차순)
+    # field: 'court_id', 'host_id', 'team_id' (team_id는 홈/어웨이 모두 포함)
+    def ids_referencing(self, field, value):
+        return list(self._reverse[field].get(value, ()))
+
+    # 레코드 값을 행에 기록. 컬럼에 담을 수 없는 값은 보조 dict에 보관
+    def _store(self, row, record):
+        extra = {}
+        for field, value in record.items():
+            if field == "id":
+                continue
+            if field in self._refs:
+                if value is None or (type(value) is int and 0 < value <= MAX_ID):
+                    self._refs[field][row] = value or 0
+                else:
+                    self._refs[field][row] = 0
+                    extra[field] = value
+            elif field == "date_time":
+                ts = to_timestamp(value)
+                self._times[row] = ts
+                # 다시 문자열로 만들었을 때 원본과 같지 않으면 원본 유지 (필터에는 변환된 시각 사용)
+                if ts == NO_TIME or from_timestamp(ts) != value:
+                    extra[field] = value
+            elif field == "status":
+                self._status[row] = STATUS_CODES.get(value, UNKNOWN_STATUS)
+                if self._status[row] == UNKNOWN_STATUS:
+                    extra[field] = value
+            elif field == "duration_minutes":
+                valid = type(value) is int and 0 < value <= MAX_DURATION_MINUTES
+                self._durations[row] = value if valid else 0
+                if not valid and value is not None:
+                    extra[field] = value
+            elif field in RESULT_FIELDS:
+                if value is not None:
+                    extra[field] = value
+            else:
+                extra[field] = value
+        id = self._ids[row]
+        if extra:
+            self._extra[id] = extra
+        else:
+            self._extra.pop(id, None)
+
+    def _materialize(self, row):
+        # 행마다 여러 컬럼을 읽으므로 조각 위치를 한 번만 계산
+        chunk, i = row >> CHUNK_BITS, row & CHUNK_MASK
+        refs = self._refs
+        id = self._ids.chunks[chunk][i]
+        ts = self._times.chunks[chunk][i]
+        status = self._status.chunks[chunk][i]
+        record = {
+            "id": id,
+            "date_time": from_timestamp(ts) if ts != NO_TIME else None,
+            "court_id": refs["court_id"].chunks[chunk][i] or None,
+            "host_id": refs["host_id"].chunks[chunk][i] or None,
+            "home_team_id": refs["home_team_id"].chunks[chunk][i] or None,
+            "away_team_id": refs["away_team_id"].chunks[chunk][i] or None,
+            "status": STATUSES[status] if status != UNKNOWN_STATUS else None,
+            "duration_minutes": self._durations.chunks[chunk][i] or DEFAULT_DURATION_MINUTES,
+            "home_score": None,
+            "away_score": None,
+            "rating_change": None
+        }
+        extra = self._extra.get(id)
+        if extra:
+            record.update(extra)
+        return record
+
+    # id가 after보다 큰 게임 id를 오름차순으로 하나씩 반환 (커서 페이지네이션, 스트리밍용)
+    def iter_ids(self, after=None):
+        ids, alive = self._ids, self._alive
+        start = ids.bisect_right(after) if after is not None else 0
+        for row in range(start, len(ids)):
+            if alive[row]:
+                yield ids[row]
+
+    # 레코드 조회. 반환값은 새로 만든 dict이므로 수정하려면 update()를 사용해야 함
+    def get(self, id):
+        row = self._row(id)
+        return self._materialize(row) if row is not None else None
+
+    # 새 id를 부여한 레코드를 만들어 추가하고 반환
+    def insert(self, fields):
+        record = {"id": self.next_id, **fields}
+        self.next_id += 1
+        self._append(record)
+        if self._log is not None:
+            self._log.append(('put', self.name, record))
+        return record
+
+    def update(self, id, changes):
+        row = self._row(id)
+        if row is None:
+            raise KeyError(id)
+        record = self._materialize(row)
+        record.update(changes)
+        old_keys = self._ref_keys(row)
+        old_interval = self._interval(row)
+        self._store(row, record)
+        new_keys = self._ref_keys(row)
+        self._unlink(id, old_keys - new_keys)
+        self._link(id, new_keys - old_keys)
+        new_interval = self._interval(row)
+        if new_interval != old_interval:
+            self._unbook(id, old_interval)
+            self._book(id, new_interval)
+        if self._log is not None:
+            self._log.append(('put', self.name, record))
+        return record
+
+    def remove(self, id):
+        row = self._row(id)
+        if row is None:
+            return None
+        record = self._materialize(row)
+        self._unlink(id, self._ref_keys(row))
+        self._unbook(id, self._interval(row))
+        self._alive[row] = 0
+        self._extra.pop(id, None)
+        self._count -= 1
+        deleted = len(self._ids) - self._count
+        if deleted > COMPACT_MIN_DELETED and deleted * 2 > len(self._ids):
+            self._compact()
+        if self._log is not None:
+            self._log.append(('del', self.name, id))
+        return record
+
+    # 삭제 표시된 행을 제거한 새 배열로 교체
+    def _compact(self):
+        def compacted(column):
+            return PagedArray.from_array(array(column.typecode, itertools.compress(column, self._alive)))
+        self._ids = compacted(self._ids)
+        self._refs = {field: compacted(column) for field, column in self._refs.items()}
+        self._times = compacted(self._times)
+        self._status = compacted(self._status)
+        self._durations = compacted(self._durations)
+        self._alive = PagedArray.from_array(array('B', b'\x01' * self._count))
+
+    # 컬럼 조건으로 게임 검색. team_id는 홈/어웨이 어느 쪽이든 일치하면 포함
+    # date_from/date_to는 ISO 문자열이며 date_from <= date_time < date_to 범위를 찾음 (형식이 잘못되면 ValueError)
+    def _find_rows(self, court_id=None, host_id=None, team_id=None, status=None, date_from=None, date_to=None):
+        conditions = []
+        if court_id is not None:
+            conditions.append((self._refs["court_id"], '==', court_id))
+        if host_id is not None:
+            conditions.append((self._refs["host_id"], '==', host_id))
+        if status is not None:
+            conditions.append((self._status, '==', STATUS_CODES.get(status, UNKNOWN_STATUS)))
+        for op, value in (('>=', date_from), ('<', date_to)):
+            if value is not None:
+                ts = to_timestamp(value)
+                if ts == NO_TIME:
+                    raise ValueError(f"잘못된 날짜/시간 형식입니다: {value}")
+                conditions.append((self._times, op, ts))
+        # 참조 조건이 있으면 역참조 인덱스에서 가장 적은 후보를 골라 그 행만 검사
+        candidates = [self._reverse[name].get(value, ()) for name, value in (('court_id', court_id), ('host_id', host_id), ('team_id', team_id)) if value is not None]
+        if candidates:
+            rows = [row for row in map(self._row, min(candidates, key=len)) if row is not None]
+            rows = self._filter_rows(conditions, team_id, rows)
+        else:
+            rows = self._filter_rows(conditions, team_id)
+        if status is not None and status not in STATUS_CODES:
+            # 코드가 없는 상태 값은 모두 UNKNOWN_STATUS이므로 원본 문자열로 한 번 더 거름
+            rows = [row for row in rows if self._extra.get(self._ids[row], {}).get("status") == status]
+        return rows
+
+    # 조건에 맞는 게임 레코드 목록 (조건은 find_ids와 같음)
+    def find(self, **conditions):
+        return [self._materialize(row) for row in self._find_rows(**conditions)]
+
+    # 조건에 맞는 게임 id 목록. 레코드를 dict로 만들지 않음
+    def find_ids(self, **conditions):
+        ids = self._ids
+        return [ids[row] for row in self._find_rows(**conditions)]
+
+    # rows가 주어지면 그 행들만, 아니면 전체 행을 검사
+    def _filter_rows(self, conditions, team_id, rows=None):
+        if rows is None and numpy is not None:
+            # 조각마다 마스크를 계산하고 조각 시작 행을 더함
+            found = []
+            for chunk, alive in enumerate(self._alive.chunks):
+                mask = numpy.frombuffer(alive, dtype=numpy.uint8).astype(bool)
+                for column, op, value in conditions:
+                    values = numpy.frombuffer(column.chunks[chunk], dtype=numpy.int64 if column.typecode == 'q' else numpy.int8)
+                    if op == '==':
+                        mask &= values == value
+                    elif op == '>=':
+                        mask &= values >= value
+                    else:
+                        mask &= (values < value) & (values != NO_TIME)
+                if team_id is not None:
+                    home = numpy.frombuffer(self._refs["home_team_id"].chunks[chunk], dtype=numpy.int64)
+                    away = numpy.frombuffer(self._refs["away_team_id"].chunks[chunk], dtype=numpy.int64)
+                    mask &= (home == team_id) | (away == team_id)
+                found.extend((numpy.flatnonzero(mask) + chunk * CHUNK_SIZE).tolist())
+            return found
+
+        if rows is None:
+            rows = list(itertools.compress(range(len(self._ids)), self._alive))
+        for column, op, value in conditions:
+            if op == '==':
+                rows = [row for row in rows if column[row] == value]
+            elif op == '>=':
+                rows = [row for row in rows if column[row] >= value]
+            else:
+                rows = [row for row in rows if NO_TIME < column[row] < value]
+        if team_id is not None:
+            home = self._refs["home_team_id"]
+            away = self._refs["away_team_id"]
+            rows = [row for row in rows if home[row] == team_id or away[row] == team_id]
+        return rows
+
+    # 바이너리 스냅샷용 컬럼 데이터: (행 수, {컬럼 이름: 배열}, 보조 dict 목록). 삭제된 행은 제외
+    def to_columns(self):
+        table = self
+        if self._count != len(self._ids):
+            table = self.clone()
+            table._compact()
+        columns = {"id": table._ids, **table._refs, "date_time": table._times, "status": table._status,
+                   "duration_minutes": table._durations}
+        extras = [{"id": id, **extra} for id, extra in table._extra.items()]
+        return table._count, columns, extras
+
+    # to_columns()로 만든 컬럼 데이터로 테이블 생성. columns는 {컬럼 이름: 바이트}
+    # statuses는 저장할 때의 상태 목록으로, 현재 STATUSES와 다르면 상태 코드를 다시 매김
+    # duration_minutes 컬럼이 없는 이전 스냅샷은 모두 기본 길이로 읽음
+    @classmethod
+    def from_columns(cls, name, count, columns, extras, next_id=1, statuses=STATUSES, swap=False):
+        table = cls(name)
+
+        def column(field, typecode):
+            values = array(typecode)
+            if field in columns:
+                values.frombytes(columns[field])
+                if swap:
+                    values.byteswap()
+            else:
+                # duration_minutes 컬럼이 없는 이전 스냅샷
+                values.frombytes(bytes(values.itemsize * count))
+            if len(values) != count:
+                raise ValueError(f"{name}.{field} 컬럼 길이가 맞지 않습니다.")
+            return values
+
+        ids = column("id", 'q')
+        refs = {field: column(field, 'q') for field in REF_FIELDS}
+        times = column("date_time", 'q')
+        status = column("status", 'b')
+        durations = column("duration_minutes", 'i')
+        extra = {extra.pop("id"): extra for extra in extras}
+        if tuple(statuses) != STATUSES:
+            codes = [STATUS_CODES.get(value, UNKNOWN_STATUS) for value in statuses]
+            for row, code in enumerate(status):
+                if code != UNKNOWN_STATUS:
+                    status[row] = codes[code]
+                    if codes[code] == UNKNOWN_STATUS:
+                        extra.setdefault(ids[row], {})["status"] = statuses[code]
+        table._ids = PagedArray.from_array(ids)
+        table._refs = {field: PagedArray.from_array(values) for field, values in refs.items()}
+        table._times = PagedArray.from_array(times)
+        table._status = PagedArray.from_array(status)
+        table._durations = PagedArray.from_array(durations)
+        table._alive = PagedArray.from_array(array('B', b'\x01' * count))
+        table._count = count
+        table._extra = PagedDict(True, extra.items())
+        table._rebuild_reverse()
+        table._rebuild_intervals()
+        table.next_id = max(next_id or 1, (table._ids[-1] + 1) if count else 1)
+        return table
+
+    # 컬럼에서 역참조 인덱스를 한 번에 다시 만듦 (행마다 insort하는 것보다 빠름)
+    def _rebuild_reverse(self):
+        ids, refs, alive = self._ids, self._refs, self._alive
+        for name, fields in (('court_id', ('court_id',)), ('host_id', ('host_id',)), ('team_id', ('home_team_id', 'away_team_id'))):
+            groups = {}
+            for field in fields:
+                for id, value, live in zip(ids, refs[field], alive):
+                    if value and live:
+                        group = groups.get(value)
+                        if group is None:
+                            groups[value] = [id]
+                        else:
+                            group.append(id)
+            if len(fields) == 1:
+                # id 오름차순으로 모았으므로 이미 정렬되어 있음
+                self._reverse[name] = PagedDict(items=((value, array('q', group)) for value, group in groups.items()))
+            else:
+                # 홈/어웨이 두 컬럼을 합쳤으므로 정렬하고, 홈과 어웨이가 같은 게임의 중복을 제거
+                self._reverse[name] = PagedDict(items=((value, array('q', sorted(set(group)))) for value, group in groups.items()))
+
+    # 컬럼에서 코트 구간 인덱스를 한 번에 다시 만듦
+    def _rebuild_intervals(self):
+        groups = {}
+        for row in range(len(self._ids)):
+            if self._alive[row]:
+                interval = self._interval(row)
+                if interval is not None:
+                    court_id, start, end = interval
+                    groups.setdefault(court_id, []).append((start, self._ids[row], end))
+        self._intervals = PagedDict()
+        for court_id, group in groups.items():
+            group.sort()
+            self._intervals[court_id] = (array('q', (start for start, _, _ in group)),
+                                         array('q', (end for _, _, end in group)),
+                                         array('q', (id for _, id, _ in group)))
+
+    def to_list(self):
+        return list(self)
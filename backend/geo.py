@@ -0,0 +1,148 @@
+import math
+
+# 코트 위치 검색 (좌표 격자 색인). app.py와 app_simple.py가 함께 사용
+# 위도/경도를 GRID_DEGREES 크기의 칸으로 나누고 칸 번호 = 행 * GRID_COLUMNS + 열 (행은 남쪽부터, 열은 경도 -180부터)
+# near 검색은 반경을 덮는 칸들만 (행마다 연속한 칸 번호 범위로) 찾은 뒤 실제 거리로 거름
+
+GRID_DEGREES = 0.05
+GRID_ROWS = round(180 / GRID_DEGREES)
+GRID_COLUMNS = round(360 / GRID_DEGREES)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# 칸 경계에 걸친 좌표를 빠뜨리지 않도록 범위를 조금 넓힘 (도)
+MARGIN_DEGREES = 1e-9
+
+DEFAULT_RADIUS_KM = 5
+MAX_RADIUS_KM = 50
+# 지역 코드 (예: 'gangnam'). 코트와 팀이 같은 형식을 씀
+MAX_REGION_LENGTH = 50
+
+# 테스트 데이터 코트의 위치 (이름 -> 위치 필드). 위치 필드가 생기기 전에 만든 같은 이름의 코트에도 채움
+# (app.py는 flask --app app seed, app_simple.py는 시작할 때)
+SEED_COURT_LOCATIONS = {
+    "플랩 스타디움": {"lat": 37.5009, "lng": 127.0364, "region": "gangnam"},
+    "점프 아레나": {"lat": 37.5040, "lng": 127.0050, "region": "seocho"},
+}
+# 위치가 등록된 코트가 하나도 없을 때의 near/region 검색 응답 (빈 목록 대신 404)
+NO_LOCATIONS = "좌표(lat, lng)가 등록된 코트가 없어 near 검색을 할 수 없습니다. 코트 정보에 위치를 입력해주세요."
+NO_REGIONS = "지역 코드(region)가 등록된 코트가 없어 region 검색을 할 수 없습니다. 코트 정보에 지역 코드를 입력해주세요."
+
+
+# 테스트 데이터 코트 중 좌표와 지역 코드가 모두 없는 코트에 채울 위치 필드 (없으면 None)
+def seed_location(name, lat, region):
+    return SEED_COURT_LOCATIONS.get(name) if lat is None and region is None else None
+
+
+# 지역 코드 (소문자). 없으면 None
+def parse_region(value):
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str) or not value.strip() or len(value.strip()) > MAX_REGION_LENGTH:
+        raise ValueError(f"region은 {MAX_REGION_LENGTH}자 이하의 문자열이어야 합니다.")
+    return value.strip().lower()
+
+
+def _coordinate(value, limit, message):
+    if type(value) not in (int, float) or not math.isfinite(value) or not -limit <= value <= limit:
+        raise ValueError(message)
+    return float(value)
+
+
+# 위도/경도. 둘 다 없으면 (None, None), 하나만 있거나 범위를 벗어나면 ValueError
+def parse_location(lat, lng):
+    if lat is None and lng is None:
+        return None, None
+    if lat is None or lng is None:
+        raise ValueError("lat과 lng는 함께 입력해야 합니다.")
+    return (_coordinate(lat, 90, "lat(위도)은 -90에서 90 사이의 숫자여야 합니다."),
+            _coordinate(lng, 180, "lng(경도)는 -180에서 180 사이의 숫자여야 합니다."))
+
+
+# 요청 본문의 코트 위치 -> (lat, lng, region). current는 수정할 때의 기존 값이며 본문에 없는 필드는 그대로 둠
+def parse_court_location(data, current=(None, None, None)):
+    lat = data['lat'] if 'lat' in data else current[0]
+    lng = data['lng'] if 'lng' in data else current[1]
+    region = parse_region(data['region']) if 'region' in data else current[2]
+    return (*parse_location(lat, lng), region)
+
+
+# near 검색 파라미터 near=위도,경도 / radius=km -> (위도, 경도, 반경). near가 없으면 None
+# 결과는 거리순이므로 id 커서(after)와 스트리밍은 함께 쓸 수 없음
+def parse_near(args):
+    near = args.get('near')
+    if near is None:
+        if args.get('radius') is not None:
+            raise ValueError("radius는 near와 함께 입력해야 합니다.")
+        return None
+    try:
+        lat, lng = (float(part) for part in near.split(','))
+    except ValueError:
+        raise ValueError("near는 '위도,경도' 형식이어야 합니다.")
+    lat, lng = parse_location(lat, lng)
+    radius = args.get('radius')
+    try:
+        radius = float(radius) if radius is not None else DEFAULT_RADIUS_KM
+    except ValueError:
+        radius = math.nan
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValueError(f"radius는 0보다 크고 {MAX_RADIUS_KM} 이하인 숫자(km)여야 합니다.")
+    if args.get('after') is not None or args.get('stream') is not None:
+        raise ValueError("near 검색 결과는 거리순이라 after와 stream을 쓸 수 없습니다.")
+    return lat, lng, radius
+
+
+def _row(lat):
+    return min(int((lat + 90) / GRID_DEGREES), GRID_ROWS - 1)
+
+
+# 좌표가 속한 칸 번호. 좌표가 없으면 None
+def cell(lat, lng):
+    if lat is None or lng is None:
+        return None
+    return _row(lat) * GRID_COLUMNS + int((lng + 180) / GRID_DEGREES) % GRID_COLUMNS
+
+
+# (lat, lng)에서 radius km 안의 좌표가 속할 수 있는 칸 번호 범위 [(첫 칸, 마지막 칸), ...] (양 끝 포함)
+# 반경을 덮는 위도/경도 범위의 행마다 연속한 열 범위 하나 (경도 ±180을 넘으면 둘), 모든 경도면 행 전체를 한 범위로 묶음
+def cell_ranges(lat, lng, radius):
+    angle = radius / EARTH_RADIUS_KM
+    dlat = math.degrees(angle) + MARGIN_DEGREES
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    first_row, last_row = _row(south), _row(north)
+    # 원이 극을 포함하지 않으면 경도 범위는 중심 위도에서 ±asin(sin(각 반경) / cos(위도))
+    if math.sin(angle) < math.cos(math.radians(lat)) and -90 < south and north < 90:
+        dlng = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat)))) + MARGIN_DEGREES
+        first = math.floor((lng - dlng + 180) / GRID_DEGREES)
+        last = math.floor((lng + dlng + 180) / GRID_DEGREES)
+        if last - first + 1 < GRID_COLUMNS:
+            first, last = first % GRID_COLUMNS, last % GRID_COLUMNS
+            columns = [(first, last)] if first <= last else [(first, GRID_COLUMNS - 1), (0, last)]
+            return [(row * GRID_COLUMNS + a, row * GRID_COLUMNS + b)
+                    for row in range(first_row, last_row + 1) for a, b in columns]
+    return [(first_row * GRID_COLUMNS, last_row * GRID_COLUMNS + GRID_COLUMNS - 1)]
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+# items 중 (lat, lng)에서 radius km 안에 있는 것 -> [(거리, item)], 가까운 순 (거리가 같으면 items 순서)
+# position(item)은 item의 (위도, 경도)
+def within(items, lat, lng, radius, position):
+    found = []
+    for item in items:
+        item_lat, item_lng = position(item)
+        if item_lat is None or item_lng is None:
+            continue
+        distance = distance_km(lat, lng, item_lat, item_lng)
+        if distance <= radius:
+            found.append((distance, item))
+    found.sort(key=lambda pair: pair[0])
+    return found
+
+
+# near 검색 결과 한 건의 응답 형식
+def near_dict(distance, court):
+    return {**court, "distance_km": round(distance, 3)}
@@ -0,0 +1,101 @@
+import json
+import os
+
+
+# 변경 로그(write-ahead log) 파일 관리
+# 요청 하나의 변경 사항은 압축된 JSON 한 줄로 추가되고, 시작 시 스냅샷 위에 순서대로 재생된다.
+# 한 줄 형식: [["put", "games", {...레코드...}], ["del", "games", 3], ...]
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.entries = 0  # 마지막 압축 이후 기록된 줄 수
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    # 변경 사항을 로그 한 줄로 직렬화 (요청 스레드에서 호출하여 이후의 변경과 섞이지 않도록 함)
+    @staticmethod
+    def encode(changes):
+        return json.dumps([list(change) for change in changes], ensure_ascii=False, separators=(',', ':')) + '\n'
+
+    # 직렬화된 줄들을 한 번에 추가. durable이면 fsync까지 수행
+    # 실패하면 기록 전 크기로 되돌림 (일부만 기록된 줄이 남으면 재생이 거기서 멈추므로, 같은 줄을 다시 기록할 수 있도록)
+    def write(self, lines, durable=False):
+        f = self._open()
+        size = f.tell()
+        try:
+            f.write(''.join(lines))
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+        except Exception:
+            self._truncate(size)
+            raise
+        self.entries += len(lines)
+
+    def _truncate(self, size):
+        f, self._file = self._file, None
+        try:
+            f.close()
+        except OSError:
+            pass
+        os.truncate(self.path, size)
+
+    def append(self, changes, durable=False):
+        self.write([self.encode(changes)], durable)
+
+    # data: {'users': [...], 'courts': [...], ...} 형태의 스냅샷에 로그를 재생하고 재생한 줄 수를 반환
+    # next_ids: 컬렉션별 다음 id 카운터. 로그에 기록된 id보다 작아지지 않도록 갱신됨
+    # load(이름): data에 없는 컬렉션을 로그가 처음 건드릴 때 원본 레코드 목록을 가져오는 함수 (지연 로드용)
+    #             재생 후 data에는 로그가 건드린 컬렉션이 추가됨
+    def replay(self, data, next_ids, load=None):
+        if not os.path.exists(self.path):
+            return 0
+
+        # id 기준으로 덮어쓰기/삭제하기 위해 순서가 유지되는 dict로 변환
+        tables = {name: {item["id"]: item for item in items} for name, items in data.items()}
+        replayed = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    changes = json.loads(line)
+                except ValueError:
+                    # 기록 도중 종료되어 잘린 마지막 줄은 적용하지 않음
+                    # 뒤에 다른 줄이 있으면 잘린 줄이 아니라 손상된 로그이므로 오류 (뒤의 변경을 버리지 않도록)
+                    if any(rest.strip() for rest in f):
+                        raise ValueError(f"변경 로그 {replayed + 1}번째 줄이 손상되었습니다: {line[:80]}")
+                    print(f"변경 로그의 손상된 줄을 건너뜁니다: {line[:80]}")
+                    break
+                for op, name, value in changes:
+                    table = tables.get(name)
+                    if table is None:
+                        table = tables[name] = {item["id"]: item for item in (load(name) if load is not None else [])}
+                    if op == 'put':
+                        table[value["id"]] = value
+                        next_ids[name] = max(next_ids.get(name, 1), value["id"] + 1)
+                    elif op == 'del':
+                        table.pop(value, None)
+                replayed += 1
+
+        for name, table in tables.items():
+            data[name] = list(table.values())
+        self.entries = replayed
+        return replayed
+
+    # 스냅샷 저장이 끝난 뒤 호출하여 로그를 비움
+    def reset(self):
+        self.close()
+        if os.path.exists(self.path):
+            open(self.path, 'w', encoding='utf-8').close()
+        self.entries = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,67 @@
+import datetime
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 응답 JSON 직렬화 (app.json). to_dict는 datetime을 그대로 넣고 여기서 ISO 8601 문자열로 바꾼다.
+# JSON_ENCODER: 'auto' (기본, orjson이 있으면 사용), 'orjson', 'json' (표준 json 모듈)
+# 두 방식 모두 키를 정렬하고 같은 값을 만든다. 단, orjson은 한글 등을 \uXXXX로 바꾸지 않고 UTF-8 그대로 씀
+ENCODERS = ('auto', 'orjson', 'json')
+
+
+# 날짜/시간은 ISO 8601 (Flask 기본 HTTP 날짜 형식 대신), 나머지는 Flask 기본 처리 (Decimal, UUID, dataclass 등)
+def _default(o):
+    if isinstance(o, (datetime.date, datetime.time)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+
+# orjson 사용. 문자열을 거치지 않고 바이트로 바로 응답을 만들며, datetime은 orjson이 직접 ISO 8601로 씀
+class OrjsonJSONProvider(StdlibJSONProvider):
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    # 추가 인자(indent 등)를 넘기면 표준 json 모듈로 처리
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# app.json 교체 (Flask, Quart 모두). app.config에 없으면 같은 이름의 환경 변수 사용
+def install(app):
+    kind = app.config.get('JSON_ENCODER', os.environ.get('JSON_ENCODER', 'auto'))
+    if kind not in ENCODERS:
+        raise ValueError(f"알 수 없는 JSON_ENCODER입니다: {kind} (사용 가능: {', '.join(ENCODERS)})")
+    if kind == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_ENCODER=orjson을 쓰려면 orjson 패키지를 설치해야 합니다 (pip install orjson).")
+    if kind == 'json' or orjson is None:
+        app.json = StdlibJSONProvider(app)
+    else:
+        app.json = OrjsonJSONProvider(app)
+    return app.json
@@ -0,0 +1,278 @@
+import re
+import threading
+from functools import lru_cache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from geo import MAX_REGION_LENGTH, parse_region
+
+# 팀 매칭 (실력/지역/시간 기반 상대 추천). app.py와 app_simple.py가 함께 사용
+# 실력은 완료된 게임 결과로 갱신하는 Elo 레이팅, 지역은 지역 코드(예: 'gangnam'), 시간은 요일별 가능 시간대
+# 추천 점수는 모든 팀에 대해 NumPy 배열 연산으로 한 번에 계산하고 상위 limit개만 정렬함
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32
+# 레이팅에 반영하는 게임 상태. 두 팀과 두 점수가 모두 있어야 반영
+RATED_STATUS = 'COMPLETED'
+MAX_SCORE = 999
+# 가능 시간대는 요일(0=월요일 ~ 6=일요일)별 "HH:MM" 구간, 매칭에서는 1시간 단위로 계산
+MAX_AVAILABILITY_SLOTS = 50
+HOURS_PER_WEEK = 7 * 24
+MASK_BYTES = HOURS_PER_WEEK // 8
+
+DEFAULT_MATCH_LIMIT = 10
+MAX_MATCH_LIMIT = 100
+# 추천 점수 = 가중치 * 항목별 점수 (각 0~1)
+#   skill : 1 - 2 * |예상 승률 - 0.5| (레이팅이 같으면 1)
+#   region: 같은 지역 1, 다른 지역 0
+#   time  : 겹치는 가능 시간 / 둘 중 짧은 쪽의 가능 시간
+# 지역이나 가능 시간대를 정하지 않은 팀이 있으면 그 항목은 NEUTRAL
+WEIGHTS = {"skill": 0.5, "region": 0.3, "time": 0.2}
+NEUTRAL = 0.5
+
+UNAVAILABLE = "팀 매칭을 쓰려면 numpy 패키지를 설치해야 합니다 (pip install numpy)."
+
+TIME_PATTERN = re.compile(r'^(\d{2}):(\d{2})$')
+# 바이트 값 -> 켜진 비트 수
+POPCOUNT = numpy.array([bin(value).count('1') for value in range(256)], dtype=numpy.uint8) if numpy is not None else None
+
+
+# rating 팀이 other 팀을 이길 예상 확률
+def expected_score(rating, other):
+    return 1 / (1 + 10 ** ((other - rating) / 400))
+
+
+# 게임 결과에 따른 홈 팀 레이팅 변화량 (어웨이 팀은 반대로 변함)
+def rating_change(home_rating, away_rating, home_score, away_score):
+    actual = 1.0 if home_score > away_score else 0.0 if home_score < away_score else 0.5
+    return round(K_FACTOR * (actual - expected_score(home_rating, away_rating)), 2)
+
+
+# 레이팅에 반영할 게임인지 (완료되었고 두 팀과 두 점수가 모두 있음)
+def rateable(status, home_team_id, away_team_id, home_score, away_score):
+    return (status == RATED_STATUS and bool(home_team_id) and bool(away_team_id)
+            and home_score is not None and away_score is not None)
+
+
+# 완료된 게임들의 결과를 차례로 레이팅에 반영 (일괄 등록). games는 반영할 순서(시각 순)로 정렬된 게임 dict,
+# ratings는 {팀 id: 레이팅}으로 반영한 값으로 바뀜. 게임별 홈 팀 변화량 목록을 반환 (반영하지 않은 게임은 None)
+def rate_games(games, ratings):
+    changes = []
+    for game in games:
+        change = None
+        if rateable(game['status'], game['home_team_id'], game['away_team_id'], game['home_score'], game['away_score']):
+            home, away = game['home_team_id'], game['away_team_id']
+            change = rating_change(ratings[home], ratings[away], game['home_score'], game['away_score'])
+            ratings[home] += change
+            ratings[away] -= change
+        changes.append(change)
+    return changes
+
+
+# 점수. 없으면 None, 0 ~ MAX_SCORE 정수가 아니면 ValueError (CSV의 숫자 문자열도 허용)
+def parse_score(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if type(value) is not int or not 0 <= value <= MAX_SCORE:
+        raise ValueError(f"점수는 0에서 {MAX_SCORE} 사이의 정수여야 합니다.")
+    return value
+
+
+def _minutes(value):
+    match = TIME_PATTERN.match(value) if isinstance(value, str) else None
+    if not match:
+        raise ValueError("가능 시간은 HH:MM 형식이어야 합니다.")
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if minute >= 60 or hour > 24 or (hour == 24 and minute):
+        raise ValueError("가능 시간은 00:00에서 24:00 사이여야 합니다.")
+    return hour * 60 + minute
+
+
+# 가능 시간대 [{"day": 0~6, "start": "HH:MM", "end": "HH:MM"}, ...] -> 요일, 시작 순으로 정렬한 목록. 없으면 빈 목록
+def parse_availability(value):
+    if value is None:
+        return []
+    if not isinstance(value, list) or len(value) > MAX_AVAILABILITY_SLOTS:
+        raise ValueError(f"availability는 최대 {MAX_AVAILABILITY_SLOTS}개 시간대의 배열이어야 합니다.")
+    slots = []
+    for slot in value:
+        if not isinstance(slot, dict) or type(slot.get('day')) is not int or not 0 <= slot['day'] <= 6:
+            raise ValueError("시간대의 day는 0(월요일)에서 6(일요일) 사이의 정수여야 합니다.")
+        start, end = _minutes(slot.get('start')), _minutes(slot.get('end'))
+        if end <= start:
+            raise ValueError("시간대의 end는 start보다 늦어야 합니다.")
+        slots.append({"day": slot['day'], "start": slot['start'], "end": slot['end']})
+    return sorted(slots, key=lambda slot: (slot['day'], slot['start']))
+
+
+# 시간대 하나 -> 일주일 168시간 비트마스크 정수 (비트 번호 = 요일 * 24 + 시). 조금이라도 걸친 시간은 가능한 것으로 봄
+# 팀마다 같은 시간대를 많이 쓰므로 결과를 재사용
+@lru_cache(maxsize=4096)
+def _slot_mask(day, start, end):
+    first, last = _minutes(start) // 60, -(-_minutes(end) // 60)
+    return ((1 << (last - first)) - 1) << (day * 24 + first)
+
+
+# 가능 시간대 -> 21바이트 비트마스크
+def availability_mask(availability):
+    mask = 0
+    for slot in availability or ():
+        mask |= _slot_mask(slot['day'], slot['start'], slot['end'])
+    return mask.to_bytes(MASK_BYTES, 'little')
+
+
+# 매칭 색인: 팀별 값을 id 순으로 담은 배열
+#   ids, ratings, regions(지역 코드 번호, 없으면 -1), masks(팀 수 x 21바이트 가능 시간 비트), hours(가능 시간 수)
+# teams: (id, 레이팅, 지역, 가능 시간대) 목록
+class MatchIndex:
+    def __init__(self, teams):
+        teams = sorted(teams, key=lambda team: team[0])
+        self.codes = {}  # 지역 코드 -> 번호
+        self.ids = numpy.array([team[0] for team in teams], dtype=numpy.int64)
+        self.ratings = numpy.array([team[1] if team[1] is not None else DEFAULT_RATING for team in teams], dtype=numpy.float64)
+        self.regions = numpy.array([self._code(team[2]) for team in teams], dtype=numpy.int32)
+        masks = b''.join(availability_mask(team[3]) for team in teams)
+        self.masks = numpy.frombuffer(masks, dtype=numpy.uint8).reshape(len(teams), MASK_BYTES)
+        self.hours = POPCOUNT[self.masks].sum(axis=1, dtype=numpy.int32)
+
+    def _code(self, region):
+        return self.codes.setdefault(region, len(self.codes)) if region else -1
+
+    # teams(같은 형식)의 값으로 바꾼 새 색인. 없는 팀이 있으면 None (팀이 추가되었으면 다시 만들어야 함)
+    # 이 색인은 다른 요청이 읽고 있을 수 있으므로 배열을 복사해 바뀐 행만 고침 (id 배열은 그대로 공유)
+    def updated(self, teams):
+        if not len(teams):
+            return self
+        ids = numpy.array([team[0] for team in teams], dtype=numpy.int64)
+        rows = numpy.minimum(numpy.searchsorted(self.ids, ids), max(len(self.ids) - 1, 0))
+        if not len(self.ids) or (self.ids[rows] != ids).any():
+            return None
+        index = MatchIndex.__new__(MatchIndex)
+        index.codes = dict(self.codes)
+        index.ids = self.ids
+        index.ratings = self.ratings.copy()
+        index.regions = self.regions.copy()
+        index.masks = self.masks.copy()
+        index.hours = self.hours.copy()
+        for row, team in zip(rows, teams):
+            index.ratings[row] = team[1] if team[1] is not None else DEFAULT_RATING
+            index.regions[row] = index._code(team[2])
+            index.masks[row] = numpy.frombuffer(availability_mask(team[3]), dtype=numpy.uint8)
+        index.hours[rows] = POPCOUNT[index.masks[rows]].sum(axis=1, dtype=numpy.int32)
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _row(self, team_id):
+        row = int(numpy.searchsorted(self.ids, team_id))
+        return row if row < len(self.ids) and self.ids[row] == team_id else None
+
+    # 모든 팀의 (추천 점수, 실력, 지역, 시간 점수) 배열. 팀 자신의 점수는 -inf
+    def scores(self, row):
+        expected = 1 / (1 + 10 ** ((self.ratings - self.ratings[row]) / 400))
+        skill = 1 - 2 * numpy.abs(expected - 0.5)
+        region = numpy.full(len(self.ids), NEUTRAL)
+        if self.regions[row] >= 0:
+            region[self.regions >= 0] = 0.0
+            region[self.regions == self.regions[row]] = 1.0
+        time = numpy.full(len(self.ids), NEUTRAL)
+        if self.hours[row]:
+            overlap = POPCOUNT[self.masks & self.masks[row]].sum(axis=1, dtype=numpy.int32)
+            known = self.hours > 0
+            time[known] = overlap[known] / numpy.minimum(self.hours[known], self.hours[row])
+        score = WEIGHTS["skill"] * skill + WEIGHTS["region"] * region + WEIGHTS["time"] * time
+        score[row] = -numpy.inf
+        return score, skill, region, time
+
+    # team_id 팀의 추천 상대 limit개 [(팀 id, 추천 점수, 실력, 지역, 시간 점수)], 점수가 같으면 id 순. 팀이 없으면 None
+    def matches(self, team_id, limit=DEFAULT_MATCH_LIMIT):
+        row = self._row(team_id)
+        if row is None:
+            return None
+        limit = min(limit, len(self.ids) - 1)
+        if limit <= 0:
+            return []
+        score, skill, region, time = self.scores(row)
+        # 상위 limit개의 경계 점수를 찾은 뒤 그 이상인 팀만 (점수 내림차순, id 오름차순)으로 정렬
+        threshold = numpy.partition(score, len(score) - limit)[len(score) - limit]
+        candidates = numpy.flatnonzero(score >= threshold)
+        order = candidates[numpy.lexsort((self.ids[candidates], -score[candidates]))][:limit]
+        return [(int(self.ids[i]), round(float(score[i]), 4), round(float(skill[i]), 4),
+                 round(float(region[i]), 4), round(float(time[i]), 4)) for i in order]
+
+
+# 매칭 색인 캐시. key(팀 컬렉션 버전 등)가 바뀌었을 때만 색인을 고침
+# load() -> (팀 목록, mark): 모든 팀을 읽음. mark는 읽은 시점 (다음 update에 넘김)
+# update(index, mark) -> (바뀐 팀 목록 또는 None, 새 mark): mark 이후 바뀐 팀만 읽음. 팀이 추가/삭제되었으면 None
+# update가 있으면 바뀐 팀의 값만 고친 새 색인을 쓰고, 팀이 추가/삭제되었을 때만 load()로 다시 만듦
+class MatchEngine:
+    def __init__(self):
+        self._current = (None, None, None)  # (key, 색인, mark). 한 번의 대입으로 바꿔 읽는 쪽이 짝이 맞지 않는 값을 보지 않음
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.updates = 0
+
+    # key 기준으로 최신인 색인 (없으면 None)
+    def get(self, key):
+        current_key, index, _ = self._current
+        return index if index is not None and current_key == key else None
+
+    def build(self, key, teams, mark=None):
+        index = MatchIndex(teams)
+        self._current = (key, index, mark)
+        self.builds += 1
+        return index
+
+    # key 기준으로 최신인 색인. 없으면 바뀐 팀만 고치거나 (update) 팀 목록을 읽어 다시 만듦 (load)
+    # lock: 스레드 서버는 동시에 여러 요청이 같은 색인을 고치지 않도록 읽고 고치는 동안 잠금을 잡음
+    # (비동기 서버는 읽는 동안 이벤트 루프로 돌아가 같은 스레드의 다른 요청이 잠금을 기다리게 되므로 lock=False)
+    def index(self, key, load, lock=True, update=None):
+        if not lock:
+            return self._refresh(key, load, update)
+        with self._lock:
+            return self._refresh(key, load, update)
+
+    def _refresh(self, key, load, update):
+        current_key, index, mark = self._current
+        if index is not None and current_key == key:
+            return index
+        if index is not None and update is not None:
+            teams, mark = update(index, mark)
+            index = index.updated(teams) if teams is not None else None
+            if index is not None:
+                self._current = (key, index, mark)
+                self.updates += 1
+                return index
+        teams, mark = load()
+        return self.build(key, teams, mark)
+
+
+# numpy가 없으면 None (매칭 조회는 503)
+def create():
+    return MatchEngine() if numpy is not None else None
+
+
+# 추천 결과 한 건의 응답 형식
+def match_dict(match, team):
+    _, score, skill, region, time = match
+    return {"team": team, "score": score, "scores": {"skill": skill, "region": region, "time": time}}
+
+
+# 조회할 추천 수. 없으면 기본값, 1 ~ MAX_MATCH_LIMIT 정수가 아니면 ValueError
+def parse_limit(args):
+    limit = args.get('limit')
+    if limit is None:
+        return DEFAULT_MATCH_LIMIT
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("limit은 정수여야 합니다.")
+    if not 0 < limit <= MAX_MATCH_LIMIT:
+        raise ValueError(f"limit은 1에서 {MAX_MATCH_LIMIT} 사이여야 합니다.")
+    return limit
@@ -0,0 +1,223 @@
+import bisect
+import itertools
+from array import array
+
+# 구조를 공유하는 dict/배열 (IndexedCollection, GameTable의 쓰기 트랜잭션 복사본용)
+# 데이터를 페이지로 나누어 담고, copy()는 페이지 목록만 복사한다. 페이지는 복사본이 처음 수정할 때 복사하므로
+# 복사 + 수정 한 번의 비용은 전체 크기가 아니라 페이지 수 + 페이지 크기에 비례한다.
+# copy() 뒤에는 원본과 복사본이 모든 페이지를 공유하므로 원본도 페이지를 수정할 때 먼저 복사한다.
+
+# 정수 키(id) 페이지 하나의 키 범위 (1024개)
+ID_PAGE_BITS = 10
+# 해시 키 페이지 수 (2의 거듭제곱)
+HASH_PAGES = 1024
+HASH_MASK = HASH_PAGES - 1
+# 배열 조각 하나의 원소 수 (16384개). 크면 조각 하나를 복사하는 비용이, 작으면 조각별로 나누어 하는 numpy 필터 비용이 커짐
+CHUNK_BITS = 14
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+
+
+# 페이지 번호 (자주 호출되므로 메서드마다 같은 식을 씀)
+#   by_id=True : id 범위 (key >> ID_PAGE_BITS). 추가되는 id가 항상 가장 크면 페이지와 페이지 안의 키가 모두 id 순서 (정수가 아니면 None 페이지)
+#   by_id=False: 키 해시의 하위 비트
+class PagedDict:
+    __slots__ = ('_by_id', '_pages', '_owned', '_len')
+
+    def __init__(self, by_id=False, items=()):
+        self._by_id = by_id
+        self._pages = {}
+        self._owned = None  # 이 객체가 직접 소유한 페이지 번호. None이면 모두 소유
+        self._len = 0
+        for key, value in items:
+            self[key] = value
+
+    def copy(self):
+        copy = PagedDict.__new__(PagedDict)
+        copy._by_id = self._by_id
+        copy._pages = dict(self._pages)
+        copy._owned = set()
+        copy._len = self._len
+        self._owned = set()
+        return copy
+
+    def _writable(self, number):
+        page = self._pages.get(number)
+        if page is None:
+            page = self._pages[number] = {}
+            if self._owned is not None:
+                self._owned.add(number)
+        elif self._owned is not None and number not in self._owned:
+            page = self._pages[number] = dict(page)
+            self._owned.add(number)
+        return page
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        page = self._pages.get((key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK)
+        return page is not None and key in page
+
+    def get(self, key, default=None):
+        page = self._pages.get((key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK)
+        return page.get(key, default) if page is not None else default
+
+    def __getitem__(self, key):
+        page = self._pages.get((key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK)
+        if page is None:
+            raise KeyError(key)
+        return page[key]
+
+    def __setitem__(self, key, value):
+        number = (key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK
+        if self._owned is None or number in self._owned:
+            page = self._pages.get(number)
+            if page is None:
+                page = self._pages[number] = {}
+        else:
+            page = self._writable(number)
+        if key not in page:
+            self._len += 1
+        page[key] = value
+
+    def setdefault(self, key, default=None):
+        page = self._pages.get((key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK)
+        if page is not None and key in page:
+            return page[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        number = (key >> ID_PAGE_BITS if type(key) is int else None) if self._by_id else hash(key) & HASH_MASK
+        page = self._pages.get(number)
+        if page is None or key not in page:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        page = self._writable(number)
+        value = page.pop(key)
+        self._len -= 1
+        if not page:
+            del self._pages[number]
+        return value
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    # (페이지 번호, 페이지 dict) 목록. 페이지 dict는 읽기만 해야 함
+    def pages(self):
+        return self._pages.items()
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._pages.values())
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return itertools.chain.from_iterable(page.values() for page in self._pages.values())
+
+    def items(self):
+        return itertools.chain.from_iterable(page.items() for page in self._pages.values())
+
+
+# CHUNK_SIZE개씩 나눈 array 목록. 행 번호 i는 chunks[i >> CHUNK_BITS][i & CHUNK_MASK]
+# chunks는 읽기 전용으로 직접 써도 되고 (마지막 조각 외에는 모두 CHUNK_SIZE개), 수정은 메서드로만 한다.
+class PagedArray:
+    __slots__ = ('typecode', 'chunks', '_owned', '_len')
+
+    def __init__(self, typecode, values=()):
+        self.typecode = typecode
+        self.chunks = []
+        self._owned = None  # 이 객체가 직접 소유한 조각 번호. None이면 모두 소유
+        self._len = 0
+        self.extend(values)
+
+    # 이미 만든 array를 조각으로 나눔
+    @classmethod
+    def from_array(cls, values):
+        paged = cls(values.typecode)
+        paged.chunks = [values[i:i + CHUNK_SIZE] for i in range(0, len(values), CHUNK_SIZE)]
+        paged._len = len(values)
+        return paged
+
+    def copy(self):
+        copy = PagedArray.__new__(PagedArray)
+        copy.typecode = self.typecode
+        copy.chunks = self.chunks[:]
+        copy._owned = set()
+        copy._len = self._len
+        self._owned = set()
+        return copy
+
+    def _writable(self, number):
+        if self._owned is not None and number not in self._owned:
+            self.chunks[number] = self.chunks[number][:]
+            self._owned.add(number)
+        return self.chunks[number]
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        return self.chunks[i >> CHUNK_BITS][i & CHUNK_MASK]
+
+    def __setitem__(self, i, value):
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        number = i >> CHUNK_BITS
+        if self._owned is None or number in self._owned:
+            self.chunks[number][i & CHUNK_MASK] = value
+        else:
+            self._writable(number)[i & CHUNK_MASK] = value
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.chunks)
+
+    def append(self, value):
+        if self._len & CHUNK_MASK == 0:
+            self.chunks.append(array(self.typecode))
+            if self._owned is not None:
+                self._owned.add(len(self.chunks) - 1)
+        last = len(self.chunks) - 1
+        if self._owned is None or last in self._owned:
+            self.chunks[last].append(value)
+        else:
+            self._writable(last).append(value)
+        self._len += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    # 정렬된 배열에서 value를 넣을 위치 (bisect.bisect_left/bisect_right와 같음)
+    def bisect_left(self, value):
+        return self._bisect(value, False)
+
+    def bisect_right(self, value):
+        return self._bisect(value, True)
+
+    def _bisect(self, value, right):
+        chunks = self.chunks
+        lo, hi = 0, len(chunks)
+        # 마지막 원소가 value보다 작은 (right면 작거나 같은) 조각을 건너뜀
+        while lo < hi:
+            mid = (lo + hi) // 2
+            last = chunks[mid][-1]
+            if last < value or (right and last == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(chunks):
+            return self._len
+        chunk = chunks[lo]
+        find = bisect.bisect_right if right else bisect.bisect_left
+        return (lo << CHUNK_BITS) + find(chunk, value)
+
+    def tobytes(self):
+        return b''.join(chunk.tobytes() for chunk in self.chunks)
@@ -0,0 +1,55 @@
+from flask import Response, current_app, jsonify, stream_with_context
+
+# 한 번에 돌려줄 수 있는 최대 항목 수
+MAX_PAGE_SIZE = 1000
+STREAM_FORMATS = ('json', 'ndjson')
+
+
+# 목록 조회 공통 파라미터 해석
+#   limit : 페이지 크기 (없으면 전체)
+#   after : 커서. 이 id보다 큰 항목부터 id 오름차순으로 반환 (이전 페이지 마지막 항목의 id)
+#   stream: 'json'이면 JSON 배열을, 'ndjson'이면 한 줄에 하나씩 항목을 생성하는 대로 전송
+# 잘못된 값이면 ValueError 발생
+def parse_page_args(args):
+    limit = args.get('limit')
+    after = args.get('after')
+    stream = args.get('stream')
+    try:
+        limit = int(limit) if limit is not None else None
+        after = int(after) if after is not None else None
+    except ValueError:
+        raise ValueError("limit과 after는 정수여야 합니다.")
+    if limit is not None:
+        if limit <= 0:
+            raise ValueError("limit은 1 이상이어야 합니다.")
+        limit = min(limit, MAX_PAGE_SIZE)
+    if stream is not None and stream not in STREAM_FORMATS:
+        raise ValueError(f"stream은 {', '.join(STREAM_FORMATS)} 중 하나여야 합니다.")
+    return limit, after, stream
+
+
+# items: 직렬화할 dict를 차례로 내놓는 이터레이터 (이미 limit만큼 잘려 있어야 함)
+# 스트리밍이 아니면 전체를 모아 JSON 배열로 반환하고, 페이지가 가득 찼으면 X-Next-Cursor 헤더에 다음 커서를 담음
+def list_response(items, limit=None, stream=None):
+    if stream is None:
+        result = list(items)
+        response = jsonify(result)
+        if limit is not None and len(result) == limit:
+            response.headers['X-Next-Cursor'] = str(result[-1]["id"])
+        return response
+
+    dumps = current_app.json.dumps
+
+    def generate_json():
+        yield '['
+        for i, item in enumerate(items):
+            yield (',' if i else '') + dumps(item)
+        yield ']\n'
+
+    def generate_ndjson():
+        for item in items:
+            yield dumps(item) + '\n'
+
+    if stream == 'ndjson':
+        return Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+    return Response(stream_with_context(generate_json()), mimetype='application/json')
@@ -0,0 +1,211 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# 새 해시에 쓰는 werkzeug 방식. 매개변수까지 적어야 저장된 해시와 비교할 수 있음 (werkzeug 3 기본값 'scrypt'와 같음)
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+# 대기 중인 작업이 가득 찼거나 제한 시간 안에 끝나지 않을 때 발생 (503으로 응답)
+class PoolBusy(Exception):
+    pass
+
+
+# 저장된 해시가 현재 방식/매개변수와 다르면 True
+def needs_rehash(stored, method):
+    return not stored.startswith(method + '$')
+
+
+# 아래 두 함수는 작업 프로세스에서 실행됨. (결과, 해시 계산 시간(초))를 반환
+def _hash(password, method):
+    start = time.perf_counter()
+    result = generate_password_hash(password, method)
+    return result, time.perf_counter() - start
+
+
+# 비밀번호가 맞고 해시가 오래된 방식이면 새 해시도 함께 계산
+def _verify(stored, password, method):
+    start = time.perf_counter()
+    ok = check_password_hash(stored, password)
+    new_hash = generate_password_hash(password, method) if ok and needs_rehash(stored, method) else None
+    return (ok, new_hash), time.perf_counter() - start
+
+
+# 비밀번호 해시 계산/검증 전용 프로세스 풀
+# 해시 계산은 CPU만 쓰는 수십 ms 작업이라 요청 스레드에서 하면 GIL을 잡고 다른 요청을 막는다.
+# 대기 중인 작업이 max_pending개를 넘으면 기다리지 않고 PoolBusy를 발생시킴.
+# 작업 슬롯은 future가 끝날 때(완료, 예외, 취소) 콜백으로 반환하므로, 시간 초과로 먼저 응답한 작업도
+# 작업 프로세스에서 실제로 끝나기 전까지는 슬롯을 차지한다.
+# 프로세스는 처음 사용할 때 만들고, workers=0이면 요청 스레드에서 바로 계산(개발용)
+class PasswordPool:
+    def __init__(self, workers=2, max_pending=16, method=DEFAULT_METHOD, timeout=10.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.method = method
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._max_pending_seen = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._rehashed = 0
+        self._ops = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 스레드가 도는 서버 프로세스를 fork하면 잠금 상태까지 복사되므로 spawn 사용
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _record(self, op, hash_seconds, total_seconds):
+        stats = self._ops.setdefault(op, {"count": 0, "hash_ms_total": 0.0, "hash_ms_max": 0.0, "wait_ms_total": 0.0, "wait_ms_max": 0.0})
+        hash_ms, wait_ms = hash_seconds * 1000, max(0.0, total_seconds - hash_seconds) * 1000
+        stats["count"] += 1
+        stats["hash_ms_total"] += hash_ms
+        stats["hash_ms_max"] = max(stats["hash_ms_max"], hash_ms)
+        stats["wait_ms_total"] += wait_ms
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], wait_ms)
+
+    # 작업을 제출하고 future를 반환. 대기열이 가득 찼으면 PoolBusy
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PoolBusy()
+            self._pending += 1
+            self._max_pending_seen = max(self._max_pending_seen, self._pending)
+        future = None
+        try:
+            executor = self._get_executor()
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._failed(executor, None, e)
+        finally:
+            # 제출하지 못했으면 슬롯을 바로 반환
+            if future is None:
+                self._release()
+        future.add_done_callback(self._release)
+        return executor, future
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    # 시간 초과나 작업 프로세스 비정상 종료를 PoolBusy로 바꿈
+    # 아직 시작하지 않은 작업은 취소하고, 이미 실행 중이면 끝날 때 슬롯이 반환됨
+    def _failed(self, executor, future, error):
+        if future is not None:
+            future.cancel()
+        with self._lock:
+            if isinstance(error, BrokenProcessPool):
+                # 작업 프로세스가 비정상 종료되면 다음 요청에서 풀을 새로 만듦
+                if self._executor is executor:
+                    self._executor = None
+            else:
+                self._timeouts += 1
+        raise PoolBusy()
+
+    def _finish(self, op, hash_seconds, start):
+        with self._lock:
+            self._record(op, hash_seconds, time.perf_counter() - start)
+
+    def _run(self, op, fn, *args):
+        start = time.perf_counter()
+        if not self.workers:
+            result, hash_seconds = fn(*args)
+            with self._lock:
+                self._record(op, hash_seconds, time.perf_counter() - start)
+            return result
+
+        executor, future = self._submit(fn, *args)
+        try:
+            result, hash_seconds = future.result(self.timeout)
+        except (TimeoutError, BrokenProcessPool) as e:
+            self._failed(executor, future, e)
+        self._finish(op, hash_seconds, start)
+        return result
+
+    # _run과 같지만 결과를 기다리는 동안 이벤트 루프를 막지 않음 (비동기 서버용)
+    async def _run_async(self, op, fn, *args):
+        if not self.workers:
+            return self._run(op, fn, *args)
+
+        start = time.perf_counter()
+        executor, future = self._submit(fn, *args)
+        try:
+            result, hash_seconds = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except (TimeoutError, BrokenProcessPool) as e:
+            self._failed(executor, future, e)
+        self._finish(op, hash_seconds, start)
+        return result
+
+    def _count_rehash(self, new_hash):
+        if new_hash is not None:
+            with self._lock:
+                self._rehashed += 1
+
+    def hash(self, password):
+        return self._run('hash', _hash, password, self.method)
+
+    async def hash_async(self, password):
+        return await self._run_async('hash', _hash, password, self.method)
+
+    # (비밀번호 일치 여부, 다시 저장할 새 해시 또는 None)
+    def verify(self, stored, password):
+        ok, new_hash = self._run('verify', _verify, stored, password, self.method)
+        self._count_rehash(new_hash)
+        return ok, new_hash
+
+    async def verify_async(self, stored, password):
+        ok, new_hash = await self._run_async('verify', _verify, stored, password, self.method)
+        self._count_rehash(new_hash)
+        return ok, new_hash
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "method": self.method,
+                "in_flight": self._pending,
+                "queue_depth": max(0, self._pending - self.workers),
+                "max_in_flight": self._max_pending_seen,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "rehashed": self._rehashed,
+                "operations": {
+                    op: {
+                        "count": s["count"],
+                        "hash_ms_avg": round(s["hash_ms_total"] / s["count"], 2),
+                        "hash_ms_max": round(s["hash_ms_max"], 2),
+                        "wait_ms_avg": round(s["wait_ms_total"] / s["count"], 2),
+                        "wait_ms_max": round(s["wait_ms_max"], 2)
+                    } for op, s in self._ops.items()
+                }
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+# 설정으로 풀 생성. app.config에 없으면 같은 이름의 환경 변수 사용
+#   PASSWORD_POOL_WORKERS, PASSWORD_POOL_MAX_PENDING, PASSWORD_POOL_TIMEOUT (초), PASSWORD_HASH_METHOD
+def from_config(config):
+    def get(key, default):
+        return config.get(key, os.environ.get(key, default))
+    workers = int(get('PASSWORD_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+    return PasswordPool(
+        workers=workers,
+        max_pending=int(get('PASSWORD_POOL_MAX_PENDING', max(1, workers) * 8)),
+        method=get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+        timeout=float(get('PASSWORD_POOL_TIMEOUT', 10))
+    )
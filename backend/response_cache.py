@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request
+
+# 캐시한 응답에 함께 저장하는 헤더
+CACHED_HEADERS = ('Content-Type', 'X-Next-Cursor')
+
+
+# 프로세스 메모리 LRU + TTL
+class LocalBackend:
+    def __init__(self, maxsize=512, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # 키 -> (만료 시각, 의존 컬렉션, 값)
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expired = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, collections):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(collections), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    # 바뀐 컬렉션에 의존하는 항목만 제거
+    def invalidate(self, collections):
+        collections = set(collections)
+        with self._lock:
+            stale = [key for key, (_, deps, _) in self._entries.items() if deps & collections]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": 'local',
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "evictions": self._evictions,
+                "expired": self._expired,
+                "invalidations": self._invalidations
+            }
+
+
+# 여러 워커가 함께 쓰는 Redis (redis 패키지가 있어야 함)
+# 키에 컬렉션 버전이 들어 있으므로 커밋 후에는 옛 항목을 다시 읽지 않으며, 옛 항목은 TTL이 지나면 사라짐
+class RedisBackend:
+    def __init__(self, url, ttl=60, prefix='flap:response:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE=redis를 쓰려면 redis 패키지를 설치해야 합니다 (pip install redis).")
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        data = self._client.get(self.prefix + key)
+        if data is None:
+            return None
+        meta, _, body = data.partition(b'\n')
+        status, headers = json.loads(meta)
+        return status, headers, body
+
+    def set(self, key, value, collections):
+        status, headers, body = value
+        self._client.set(self.prefix + key, json.dumps([status, headers]).encode('utf-8') + b'\n' + body, ex=self.ttl)
+
+    def invalidate(self, collections):
+        pass
+
+    def stats(self):
+        return {"backend": 'redis', "ttl": self.ttl}
+
+
+# 조회 응답 캐시. 적중/실패 수는 저장소와 관계없이 여기서 셈
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key, value, collections):
+        self.backend.set(key, value, collections)
+
+    def invalidate(self, collections):
+        self.backend.invalidate(collections)
+
+    def stats(self):
+        with self._lock:
+            stats = {"hits": self._hits, "misses": self._misses}
+        stats.update(self.backend.stats())
+        return stats
+
+
+# 설정으로 생성. app.config에 없으면 같은 이름의 환경 변수 사용
+#   RESPONSE_CACHE: 'local' (기본), 'redis', 'off'
+#   RESPONSE_CACHE_SIZE (local 최대 항목 수), RESPONSE_CACHE_TTL (초), RESPONSE_CACHE_REDIS_URL
+def from_config(config):
+    def get(key, default):
+        return config.get(key, os.environ.get(key, default))
+    kind = get('RESPONSE_CACHE', 'local')
+    ttl = int(get('RESPONSE_CACHE_TTL', 60))
+    if kind == 'off':
+        return None
+    if kind == 'redis':
+        return ResponseCache(RedisBackend(get('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0'), ttl))
+    if kind == 'local':
+        return ResponseCache(LocalBackend(int(get('RESPONSE_CACHE_SIZE', 512)), ttl))
+    raise ValueError(f"알 수 없는 RESPONSE_CACHE입니다: {kind} (사용 가능: local, redis, off)")
+
+
+# 캐시 키: 경로 + 정렬한 쿼리 파라미터 + 의존 컬렉션 버전 (커밋 후에는 새 키가 됨)
+def cache_key(request, versions, collections):
+    numbers, _ = versions.get(collections)
+    return f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}#{versions.epoch}-{'.'.join(map(str, numbers))}"
+
+
+# 캐시할 수 있는 응답이면 True (스트리밍 응답과 200이 아닌 응답은 캐시하지 않음)
+def cacheable(response):
+    return response.status_code == 200 and not response.is_streamed
+
+
+def cached_headers(response):
+    return [(name, value) for name, value in response.headers.items() if name in CACHED_HEADERS]
+
+
+# 조회 응답 캐시. conditional과 함께 쓸 때는 그 아래에 둠
+def cached(*collections):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None or 'stream' in request.args:
+                return view(*args, **kwargs)
+            key = cache_key(request, current_app.extensions['collection_versions'], collections)
+            value = cache.get(key)
+            if value is not None:
+                status, headers, body = value
+                return Response(body, status, headers)
+            response = current_app.make_response(view(*args, **kwargs))
+            if cacheable(response):
+                cache.set(key, (200, cached_headers(response), response.get_data()), collections)
+            return response
+        return wrapper
+    return decorator
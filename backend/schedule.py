@@ -0,0 +1,115 @@
+import datetime
+
+# 코트 예약 (게임 시간 겹침 검사, 빈 시간 계산). app.py와 app_simple.py가 함께 사용
+# 예약 구간은 [date_time, date_time + duration_minutes) 이며 취소된 게임은 코트를 차지하지 않음
+
+# 게임 길이 (분). 값이 없던 기존 게임은 기본값으로 봄
+DEFAULT_DURATION_MINUTES = 120
+MAX_DURATION_MINUTES = 24 * 60
+MAX_DURATION = datetime.timedelta(minutes=MAX_DURATION_MINUTES)
+# 빈 시간 조회 최대 기간
+MAX_AVAILABILITY_RANGE = datetime.timedelta(days=31)
+# 코트를 차지하지 않는 상태
+FREE_STATUSES = ('CANCELLED',)
+# 수정할 때 이 필드가 바뀌면 예약 겹침을 다시 검사
+SCHEDULE_FIELDS = ('date_time', 'court_id', 'duration_minutes', 'status')
+
+
+# 일괄 추가한 게임이 다른 예약과 겹칠 때 발생 (트랜잭션을 되돌리기 위해). errors는 행별 오류 목록
+class ScheduleConflict(ValueError):
+    def __init__(self, errors):
+        super().__init__("다른 게임과 시간이 겹치는 행이 있어 게임을 추가하지 않았습니다.")
+        self.errors = errors
+
+
+# ISO 문자열 -> datetime. 시간대가 있으면 UTC로 바꾼 뒤 시간대 없이 (game_table의 시각과 같은 기준). 잘못되면 ValueError
+def parse_datetime(value):
+    if not isinstance(value, str):
+        raise ValueError("잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요.")
+    try:
+        dt = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("잘못된 날짜/시간 형식입니다. ISO 형식을 사용해주세요.")
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+# 게임 길이(분). 없으면 기본값, 1 ~ MAX_DURATION_MINUTES 정수가 아니면 ValueError (CSV의 숫자 문자열도 허용)
+def parse_duration(value):
+    if value is None or value == '':
+        return DEFAULT_DURATION_MINUTES
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if type(value) is not int or not 0 < value <= MAX_DURATION_MINUTES:
+        raise ValueError(f"duration_minutes는 1에서 {MAX_DURATION_MINUTES} 사이의 정수(분)여야 합니다.")
+    return value
+
+
+def game_end(start, duration_minutes):
+    return start + datetime.timedelta(minutes=duration_minutes or DEFAULT_DURATION_MINUTES)
+
+
+# 빈 시간 조회 파라미터 from/to -> (시작, 끝). 잘못되면 ValueError
+def parse_range(args):
+    if not args.get('from') or not args.get('to'):
+        raise ValueError("from과 to를 모두 입력해주세요.")
+    start, end = parse_datetime(args['from']), parse_datetime(args['to'])
+    if end <= start:
+        raise ValueError("to는 from보다 늦어야 합니다.")
+    if end - start > MAX_AVAILABILITY_RANGE:
+        raise ValueError(f"한 번에 최대 {MAX_AVAILABILITY_RANGE.days}일까지 조회할 수 있습니다.")
+    return start, end
+
+
+# (시작 시각, 길이(분), 게임 id) 행 중 start 이후에 끝나는 것 -> (시작, 종료, 게임 id) 목록
+# 코트의 (court_id, date_time) 인덱스를 start - MAX_DURATION부터 범위 검색한 결과에 사용
+def overlapping(rows, start):
+    busy = []
+    for begin, duration, id in rows:
+        end = game_end(begin, duration)
+        if end > start:
+            busy.append((begin, end, id))
+    return busy
+
+
+# 시작 시각 순으로 정렬된 예약 목록에서 서로 겹치는 (앞 게임 id, 뒤 게임 id) 쌍
+def overlapping_pairs(busy):
+    active = []
+    for start, end, id in busy:
+        active = [(other_end, other) for other_end, other in active if other_end > start]
+        for _, other in active:
+            yield other, id
+        active.append((end, id))
+
+
+# [start, end) 안의 빈 시간 목록 (예약 목록은 시작 시각 순)
+def free_slots(busy, start, end):
+    slots, cursor = [], start
+    for begin, finish, _ in busy:
+        if begin > cursor:
+            slots.append({"start": cursor, "end": min(begin, end)})
+        cursor = max(cursor, finish)
+        if cursor >= end:
+            break
+    if cursor < end:
+        slots.append({"start": cursor, "end": end})
+    return slots
+
+
+def availability(court_id, start, end, busy):
+    return {
+        "court_id": court_id,
+        "from": start,
+        "to": end,
+        "busy": [{"game_id": id, "start": begin, "end": finish} for begin, finish, id in busy],
+        "free": free_slots(busy, start, end)
+    }
+
+
+def conflict_error(conflicts):
+    return {
+        "error": "해당 시간에 코트가 이미 예약되어 있습니다.",
+        "conflicts": [{"game_id": id, "start": begin, "end": finish} for begin, finish, id in conflicts]
+    }
+
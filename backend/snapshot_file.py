@@ -0,0 +1,220 @@
+import json
+import os
+import struct
+import sys
+import zlib
+
+from collection import IndexedCollection
+from game_table import GameTable, STATUSES
+from store import Lazy
+
+# 바이너리 스냅샷 파일 형식
+#   헤더   : 매직(8바이트) + 형식 버전(uint16) + 목차 길이(uint32) + 목차 CRC32(uint32)
+#   목차   : 컬렉션별 {name, kind, next_id, count, offset, length, crc32, ...}를 담은 JSON
+#   데이터 : 8바이트 단위로 정렬된 컬렉션별 구역. offset은 데이터 시작 위치 기준
+#     records: 레코드마다 길이(uint32) + 압축된 JSON
+#     columns: 게임 컬럼 배열을 그대로 이어 붙인 구역(메모리 매핑 가능한 고정 폭 배열) + 보조 dict 레코드
+# 구역별 CRC32는 그 구역을 처음 풀 때 검사하므로 지연 로드 시 쓰지 않는 컬렉션은 읽기만 하고 풀지 않는다.
+MAGIC = b'FLAPSNAP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHII')
+RECORD_LENGTH = struct.Struct('<I')
+ALIGN = 8
+
+
+# 파일이 손상되었거나 지원하지 않는 형식일 때 발생
+class SnapshotFormatError(ValueError):
+    pass
+
+
+def _padding(size):
+    return b'\0' * (-size % ALIGN)
+
+
+def _encode_records(records):
+    dumps = json.dumps
+    parts = []
+    for record in records:
+        data = dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        parts.append(RECORD_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _decode_records(buffer):
+    loads = json.loads
+    unpack = RECORD_LENGTH.unpack_from
+    records = []
+    pos, end = 0, len(buffer)
+    while pos < end:
+        (size,) = unpack(buffer, pos)
+        pos += RECORD_LENGTH.size
+        records.append(loads(bytes(buffer[pos:pos + size])))
+        pos += size
+    return records
+
+
+# 컬렉션 하나를 (목차 항목, 구역 바이트)로 변환
+def _encode_collection(collection):
+    if isinstance(collection, GameTable):
+        count, columns, extras = collection.to_columns()
+        parts, layout, offset = [], [], 0
+        for field, column in columns.items():
+            data = column.tobytes()
+            layout.append([field, column.typecode, offset, len(data)])
+            parts += [data, _padding(len(data))]
+            offset += len(data) + len(parts[-1])
+        entry = {
+            "kind": 'columns',
+            "count": count,
+            "columns": layout,
+            "extras": offset,
+            "statuses": list(STATUSES),
+            "byteorder": sys.byteorder
+        }
+        parts.append(_encode_records(extras))
+        return entry, b''.join(parts)
+    return {"kind": 'records', "count": len(collection)}, _encode_records(collection.to_list())
+
+
+# 컬렉션 목록을 바이너리 스냅샷 파일로 저장 (임시 파일에 쓰고 교체)
+# 아직 풀지 않은 지연 로드 컬렉션(LazySection)은 읽은 구역을 그대로 다시 씀
+def write_snapshot(path, collections, durable=True):
+    toc, sections, offset = [], [], 0
+    for collection in collections:
+        if isinstance(collection, LazySection) and not collection.loaded:
+            entry, payload = dict(collection.entry), collection.payload
+        else:
+            entry, payload = _encode_collection(collection)
+            entry["name"] = collection.name
+            entry["next_id"] = collection.next_id
+        entry.update(offset=offset, length=len(payload), crc32=zlib.crc32(payload))
+        toc.append(entry)
+        sections += [payload, _padding(len(payload))]
+        offset += len(payload) + len(sections[-1])
+
+    toc_data = json.dumps({"collections": toc}, ensure_ascii=False).encode('utf-8')
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(toc_data), zlib.crc32(toc_data))
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(header)
+        f.write(toc_data)
+        f.write(_padding(HEADER.size + len(toc_data)))
+        for section in sections:
+            f.write(section)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+# 바이너리 스냅샷 읽기. 파일 전체를 한 번에 읽고 목차만 해석하며, 각 구역은 요청할 때 검사하고 푼다
+class SnapshotReader:
+    def __init__(self, data):
+        if len(data) < HEADER.size:
+            raise SnapshotFormatError("스냅샷 파일이 너무 짧습니다.")
+        magic, version, toc_length, toc_crc = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise SnapshotFormatError("바이너리 스냅샷 파일이 아닙니다.")
+        if version != FORMAT_VERSION:
+            raise SnapshotFormatError(f"지원하지 않는 스냅샷 형식 버전입니다: {version}")
+        toc_data = data[HEADER.size:HEADER.size + toc_length]
+        if zlib.crc32(toc_data) != toc_crc:
+            raise SnapshotFormatError("스냅샷 목차의 체크섬이 일치하지 않습니다.")
+        self._data = memoryview(data)
+        self._start = HEADER.size + toc_length + len(_padding(HEADER.size + toc_length))
+        self.entries = {entry["name"]: entry for entry in json.loads(toc_data)["collections"]}
+        self.next_ids = {name: entry["next_id"] for name, entry in self.entries.items()}
+
+    # 구역 바이트 (검사하지 않음)
+    def payload(self, name):
+        entry = self.entries[name]
+        start = self._start + entry["offset"]
+        return self._data[start:start + entry["length"]]
+
+    def _checked_payload(self, name):
+        payload = self.payload(name)
+        if len(payload) != self.entries[name]["length"] or zlib.crc32(payload) != self.entries[name]["crc32"]:
+            raise SnapshotFormatError(f"스냅샷의 {name} 구역 체크섬이 일치하지 않습니다.")
+        return payload
+
+    # 컬렉션을 풀어서 생성. unique, groups는 IndexedCollection의 고유 인덱스 필드와 그룹 인덱스
+    def collection(self, name, unique=(), groups=None):
+        entry = self.entries[name]
+        payload = self._checked_payload(name)
+        if entry["kind"] == 'records':
+            return IndexedCollection(name, _decode_records(payload), entry["next_id"], unique=unique, groups=groups)
+        columns = {field: payload[offset:offset + length] for field, typecode, offset, length in entry["columns"]}
+        return GameTable.from_columns(
+            name, entry["count"], columns, _decode_records(payload[entry["extras"]:]),
+            entry["next_id"], entry["statuses"], entry["byteorder"] != sys.byteorder
+        )
+
+    # 레코드 dict 목록 (변경 로그 재생, JSON 변환용)
+    def records(self, name):
+        if name not in self.entries:
+            return []
+        if self.entries[name]["kind"] == 'records':
+            return _decode_records(self._checked_payload(name))
+        return self.collection(name).to_list()
+
+    # 처음 접근할 때 푸는 컬렉션. on_load(컬렉션)은 푼 직후 호출됨
+    def lazy(self, name, unique=(), on_load=None, groups=None):
+        return LazySection(self, name, unique, on_load, groups)
+
+
+# 아직 풀지 않은 스냅샷 구역. 풀기 전에는 개수만 알 수 있고, 저장할 때는 구역을 그대로 복사
+class LazySection(Lazy):
+    def __init__(self, reader, name, unique=(), on_load=None, groups=None):
+        def load():
+            collection = reader.collection(name, unique, groups)
+            if on_load is not None:
+                on_load(collection)
+            return collection
+        super().__init__(load)
+        self.name = name
+        self.entry = reader.entries[name]
+        self.payload = reader.payload(name)
+
+    def __len__(self):
+        return len(self.value) if self.loaded else self.entry["count"]
+
+
+def read_snapshot(path):
+    with open(path, 'rb') as f:
+        return SnapshotReader(f.read())
+
+
+# db.json 형식 dict -> 컬렉션 목록 (games는 컬럼형 테이블)
+def collections_from_json(data):
+    next_ids = data.get('next_ids', {})
+    return [
+        GameTable(name, records, next_ids.get(name)) if name == 'games' else IndexedCollection(name, records, next_ids.get(name))
+        for name, records in data.items() if name != 'next_ids'
+    ]
+
+
+# 변환 도구
+#   python backend/snapshot_file.py to-binary db.json db.snap
+#   python backend/snapshot_file.py to-json db.snap db.json
+def main(argv):
+    if len(argv) != 3 or argv[0] not in ('to-binary', 'to-json'):
+        print("사용법: snapshot_file.py to-binary <db.json> <db.snap> | to-json <db.snap> <db.json>")
+        return 2
+    command, source, target = argv
+    if command == 'to-binary':
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        write_snapshot(target, collections_from_json(data))
+    else:
+        reader = read_snapshot(source)
+        data = {name: reader.records(name) for name in reader.entries}
+        data['next_ids'] = reader.next_ids
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"변환 완료: {source} -> {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
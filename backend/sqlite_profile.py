@@ -0,0 +1,136 @@
+import os
+from functools import partial
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, orm
+from sqlalchemy.sql import Select
+
+# 읽기 전용 연결 풀의 bind 이름
+READER = 'reader'
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# SQLite 엔진 설정 기본값. app.config에 값이 없으면 같은 이름의 환경 변수, 그것도 없으면 기본값을 사용
+DEFAULTS = {
+    'SQLITE_JOURNAL_MODE': 'WAL',        # WAL이면 읽기와 쓰기가 서로를 기다리지 않음
+    'SQLITE_SYNCHRONOUS': 'NORMAL',      # WAL에서 NORMAL은 커밋마다 fsync하지 않음 (체크포인트 때 fsync)
+    'SQLITE_BUSY_TIMEOUT': 5000,         # 잠금 대기 시간 (ms). 넘으면 'database is locked'
+    'SQLITE_MMAP_SIZE': 256 * 2 ** 20,   # 메모리 매핑으로 읽을 최대 크기 (바이트, 0이면 사용 안 함)
+    'SQLITE_CACHE_SIZE': 20000,          # 연결당 페이지 캐시 크기 (KiB)
+    'DB_POOL_SIZE': 5,                   # 쓰기(기본) 연결 풀 크기와 추가 허용 수
+    'DB_MAX_OVERFLOW': 10,
+    'DB_POOL_TIMEOUT': 30,               # 풀에서 연결을 기다리는 최대 시간 (초)
+    'DB_READ_ROUTING': True,             # 읽기 쿼리를 별도의 읽기 전용 풀로 보낼지 여부
+    'DB_READ_POOL_SIZE': 10,             # 읽기 연결 풀 크기와 추가 허용 수
+    'DB_READ_MAX_OVERFLOW': 20,
+}
+
+
+def _convert(value, default):
+    if isinstance(default, bool):
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(value)
+    return value.upper()
+
+
+# 설정 채우기 (잘못된 값이면 ValueError)
+def load_config(config):
+    for key, default in DEFAULTS.items():
+        value = os.environ.get(key)
+        config.setdefault(key, _convert(value, default) if value is not None else default)
+    if config['SQLITE_JOURNAL_MODE'] not in JOURNAL_MODES:
+        raise ValueError(f"알 수 없는 SQLITE_JOURNAL_MODE입니다: {config['SQLITE_JOURNAL_MODE']} (사용 가능: {', '.join(JOURNAL_MODES)})")
+    if config['SQLITE_SYNCHRONOUS'] not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"알 수 없는 SQLITE_SYNCHRONOUS입니다: {config['SQLITE_SYNCHRONOUS']} (사용 가능: {', '.join(SYNCHRONOUS_LEVELS)})")
+
+
+# SQLAlchemy(app) 생성 전에 호출: 풀 설정과 읽기 전용 bind를 app.config에 추가
+def configure(app):
+    config = app.config
+    load_config(config)
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    if not uri.startswith('sqlite'):
+        return
+    options = config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    if ':memory:' in uri or uri == 'sqlite://':
+        # 메모리 DB는 연결마다 다른 DB이므로 풀 설정과 읽기 분리를 쓰지 않음
+        return
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    if config['DB_READ_ROUTING']:
+        config.setdefault('SQLALCHEMY_BINDS', {})[READER] = {
+            'url': uri,
+            'pool_size': config['DB_READ_POOL_SIZE'],
+            'max_overflow': config['DB_READ_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+        }
+
+
+def _apply_pragmas(config, reader, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}")
+    if reader:
+        # 읽기 연결은 실수로라도 쓰지 못하게 막음
+        cursor.execute("PRAGMA query_only = ON")
+    else:
+        cursor.execute(f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+        cursor.execute(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    cursor.execute(f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}")
+    cursor.execute(f"PRAGMA cache_size = -{int(config['SQLITE_CACHE_SIZE'])}")
+    cursor.close()
+
+
+# 엔진의 연결마다 PRAGMA 적용 (비동기 엔진은 engine.sync_engine을 넘김)
+def install_engine(config, engine, reader=False):
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', partial(_apply_pragmas, config, reader))
+
+
+# SQLAlchemy(app) 생성 후 호출: 연결마다 PRAGMA 적용
+def install(app, db):
+    with app.app_context():
+        for name, engine in db.engines.items():
+            install_engine(app.config, engine, name == READER)
+
+
+def _use_reader(session, clause, bind):
+    return bind is None and not session._flushing and not session.info.get('wrote') and isinstance(clause, Select)
+
+
+# 읽기/쓰기 연결 분리 세션
+# 세션이 아직 아무것도 쓰지 않았다면 SELECT는 읽기 전용 풀로 보내고, flush나 그 밖의 문은 쓰기 풀로 보낸다.
+# 한 트랜잭션에서 한 번 쓰면 커밋/롤백 전까지는 자신이 쓴 내용을 볼 수 있도록 모든 문을 쓰기 풀로 보냄
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if _use_reader(self, clause, bind):
+            reader = self._db.engines.get(READER)
+            if reader is not None:
+                return reader
+        if bind is None:
+            self.info['wrote'] = True
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Flask-SQLAlchemy 없이 엔진을 직접 받는 읽기/쓰기 연결 분리 세션 (app_async의 AsyncSession이 내부에서 사용)
+# reader가 None이면 모든 문을 bind(쓰기 엔진)로 보냄
+class EngineRoutingSession(orm.Session):
+    def __init__(self, reader=None, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if self.reader is not None and _use_reader(self, clause, bind):
+            return self.reader
+        if bind is None:
+            self.info['wrote'] = True
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+@event.listens_for(EngineRoutingSession, 'after_transaction_end')
+def _reset_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('wrote', None)
@@ -0,0 +1,117 @@
+import threading
+from contextlib import contextmanager
+
+COLLECTION_NAMES = ('users', 'courts', 'teams', 'games')
+
+
+# 처음 사용할 때 한 번만 만들어지는 값 (지연 로드용). 여러 스냅샷이 공유해도 한 번만 만든다.
+class Lazy:
+    def __init__(self, load):
+        self._load = load
+        self.value = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._load is None
+
+    def get(self):
+        if self._load is not None:
+            with self._lock:
+                if self._load is not None:
+                    self.value = self._load()
+                    self._load = None
+        return self.value
+
+
+# 특정 시점의 전체 데이터 (버전별 불변 스냅샷)
+# 게시된 스냅샷의 컬렉션은 수정하지 않으므로 읽는 쪽은 잠금 없이 사용할 수 있다.
+# 컬렉션 대신 Lazy를 넘기면 처음 접근할 때 만든다 (지연 로드).
+class Snapshot:
+    def __init__(self, version, **collections):
+        self.version = version
+        self._lazy = {}
+        for name, collection in collections.items():
+            if isinstance(collection, Lazy):
+                self._lazy[name] = collection
+            else:
+                setattr(self, name, collection)
+
+    def __getattr__(self, name):
+        lazy = self.__dict__.get('_lazy', {}).get(name)
+        if lazy is None:
+            raise AttributeError(name)
+        collection = lazy.get()
+        setattr(self, name, collection)
+        return collection
+
+    # 아직 만들지 않은 컬렉션은 Lazy 그대로 반환 (만들지 않고 다음 스냅샷에 넘기거나 저장할 때 사용)
+    def collection(self, name):
+        if name in self.__dict__:
+            return self.__dict__[name]
+        lazy = self._lazy[name]
+        return lazy.value if lazy.loaded else lazy
+
+
+# 쓰기 트랜잭션
+# 컬렉션에 처음 접근할 때 기준 스냅샷의 컬렉션으로 복사본을 만들고(clone), 복사본의 변경은 changes에
+# ('put', 컬렉션 이름, 레코드) / ('del', 컬렉션 이름, id) 형태로 순서대로 쌓인다.
+# 복사본은 기준 컬렉션과 페이지를 공유하고 수정하는 페이지만 복사하므로 (paged.py) 비용이 컬렉션 크기에 비례하지 않는다.
+# 수정하지 않고 읽기만 할 컬렉션은 snapshot에서 직접 읽는 편이 복사본을 만들지 않는다.
+class Transaction:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.changes = []
+        self.result = snapshot  # 블록이 끝난 뒤 게시된 스냅샷 (변경이 없으면 기준 스냅샷)
+        self.after = None       # write(wait=False)일 때 호출하지 않은 on_commit의 반환값
+        self._copies = {}
+
+    def __getattr__(self, name):
+        if name not in COLLECTION_NAMES:
+            raise AttributeError(name)
+        copy = self._copies.get(name)
+        if copy is None:
+            copy = self._copies[name] = getattr(self.snapshot, name).clone(self.changes)
+        return copy
+
+    def _result(self):
+        snapshot = self.snapshot
+        collections = {name: self._copies[name] if name in self._copies else snapshot.collection(name) for name in COLLECTION_NAMES}
+        return Snapshot(snapshot.version + 1, **collections)
+
+
+# 스냅샷 저장소
+# 읽기: store.snapshot으로 현재 스냅샷을 받아 그 스냅샷 안에서만 읽는다 (잠금 없음, 일관된 시점).
+# 쓰기: with store.write() as tx: 블록 안에서 tx.<컬렉션>을 수정한다. 쓰기는 하나의 잠금으로 직렬화되고,
+#      블록이 정상 종료되면 새 스냅샷을 한 번의 대입으로 게시한다. 예외가 나면 아무것도 게시하지 않는다.
+# on_commit(snapshot, changes)는 게시 직후 쓰기 잠금 안에서 호출되며 (변경 로그 기록 요청, 캐시 무효화 등),
+# 반환값이 호출 가능하면 잠금을 푼 뒤 호출한다 (fsync 대기 등 다른 쓰기를 막을 필요가 없는 작업).
+# write(wait=False)면 호출하지 않고 tx.after에 남긴다 (비동기 서버가 이벤트 루프를 막지 않고 기다릴 때).
+class Store:
+    def __init__(self, snapshot, on_commit=None):
+        self.snapshot = snapshot
+        self.on_commit = on_commit
+        self._write_lock = threading.Lock()
+
+    # 전체 스냅샷 교체 (불러오기, 초기화 시)
+    def replace(self, snapshot):
+        with self._write_lock:
+            self.snapshot = snapshot
+
+    @contextmanager
+    def write(self, wait=True):
+        after = None
+        with self._write_lock:
+            tx = Transaction(self.snapshot)
+            yield tx
+            if tx.changes:
+                snapshot = tx.result = tx._result()
+                self.snapshot = snapshot
+                if self.on_commit is not None:
+                    after = self.on_commit(snapshot, tx.changes)
+        if not callable(after):
+            return
+        if wait:
+            after()
+        else:
+            tx.after = after
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+
+# 조인 결과(뷰) 캐시
+# build(key, snapshot)는 스냅샷 안에서 (뷰, 의존 레코드 목록)을 만들어 반환하며, 의존 레코드는 (컬렉션 이름, id) 튜플이다.
+# 새 스냅샷이 게시되면 advance(버전, 변경 목록)을 호출해 바뀐 레코드를 참조하는 뷰만 지운다.
+# 캐시된 뷰는 만들어진 버전부터 캐시가 알고 있는 최신 버전까지 유효하므로, 그 범위 밖의 스냅샷은 캐시를 거치지 않는다.
+# maxsize를 넘으면 가장 오래 사용되지 않은 뷰부터 제거한다.
+class ViewCache:
+    def __init__(self, build, maxsize=100000, version=0):
+        self._build = build
+        self.maxsize = maxsize
+        self.version = version
+        self._views = OrderedDict()  # key -> (뷰, 의존 레코드 목록, 만든 버전)
+        self._dependents = {}        # (컬렉션 이름, id) -> 이를 참조하는 key 집합
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, snapshot):
+        with self._lock:
+            entry = self._views.get(key)
+            if entry is not None and entry[2] <= snapshot.version <= self.version:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        view, deps = self._build(key, snapshot)
+        with self._lock:
+            # 최신 스냅샷으로 만든 뷰만 저장 (만드는 동안 새 버전이 게시됐다면 저장하지 않음)
+            if view is not None and snapshot.version == self.version and key not in self._views:
+                self._views[key] = (view, deps, snapshot.version)
+                for dep in deps:
+                    self._dependents.setdefault(dep, set()).add(key)
+                while len(self._views) > self.maxsize:
+                    self._discard(next(iter(self._views)))
+        return view
+
+    # 새 버전 게시 후 호출. changes는 ('put', 컬렉션 이름, 레코드) / ('del', 컬렉션 이름, id) 목록
+    def advance(self, version, changes):
+        with self._lock:
+            for op, collection, value in changes:
+                id = value["id"] if op == 'put' else value
+                for key in self._dependents.pop((collection, id), ()):
+                    self._discard(key)
+            self.version = version
+
+    # 모든 뷰를 지우고 버전을 다시 설정 (데이터 전체를 다시 불러왔을 때)
+    def reset(self, version):
+        with self._lock:
+            self.version = version
+            self._views.clear()
+            self._dependents.clear()
+
+    def _discard(self, key):
+        entry = self._views.pop(key, None)
+        if entry is None:
+            return
+        for dep in entry[1]:
+            keys = self._dependents.get(dep)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dep]
+
+    def __len__(self):
+        return len(self._views)